@@ -0,0 +1,32 @@
+from typing import Optional
+
+import mongoengine
+
+_connected: Optional[str] = None
+
+
+def connect_mongo(uri: Optional[str] = None, db: str = "benchmark") -> None:
+    """Register the default mongoengine alias on a real server or on mongomock.
+
+    Repeated calls with the same target keep the existing client, so data written
+    through `setup_mongodb_connection` stays visible across pipeline calls.
+    """
+    global _connected
+    target = f"{uri or 'mongomock'}/{db}"
+    if _connected == target:
+        return
+
+    mongoengine.disconnect(alias="default")
+    _connected = target
+    if uri:
+        mongoengine.connect(db=db, host=uri, alias="default")
+        return
+
+    import mongomock
+
+    mongoengine.connect(
+        db=db,
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        alias="default",
+    )
@@ -0,0 +1,61 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from usecases.bm25_index import BM25Index, Segment
+
+
+def synthetic_segment(
+    path: Path, docs: int, vocab: int, doc_len: int, seed: int = 0
+) -> None:
+    """Write a Zipf-distributed corpus straight into segment arrays."""
+    rng = np.random.default_rng(seed)
+    tokens = np.minimum(rng.zipf(1.2, size=docs * doc_len), vocab) - 1
+    doc_of_token = np.repeat(np.arange(docs, dtype=np.int64), doc_len)
+    keys, tfs = np.unique(doc_of_token * vocab + tokens, return_counts=True)
+    Segment.write(
+        path,
+        [f"t{i}" for i in range(vocab)],
+        keys % vocab,
+        keys // vocab,
+        np.minimum(tfs, np.iinfo(np.uint16).max).astype(np.uint16),
+        np.full(docs, doc_len, dtype=np.uint32),
+        np.arange(1, docs + 1, dtype=np.int64),
+        ({"title": f"doc {i}", "author": None, "text": ""} for i in range(docs)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BM25 index query latency")
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-len", type=int, default=120)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        start = time.perf_counter()
+        synthetic_segment(directory / "seg_000001", args.docs, args.vocab, args.doc_len)
+        (directory / "manifest.json").write_text('["seg_000001"]')
+        print(f"build: {time.perf_counter() - start:.1f}s for {args.docs} docs")
+
+        index = BM25Index(directory)
+        for label, low, high in (("rare", 1000, args.vocab), ("common", 5, 200)):
+            timings = []
+            for _ in range(args.queries):
+                terms = rng.integers(low, high, size=3)
+                query = " ".join(f"t{t}" for t in terms)
+                start = time.perf_counter()
+                index.search(query, limit=10)
+                timings.append((time.perf_counter() - start) * 1000)
+            p50, p95 = np.percentile(timings, [50, 95])
+            print(f"{label:<7} terms: p50 {p50:6.2f} ms  p95 {p95:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
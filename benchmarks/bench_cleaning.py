@@ -0,0 +1,81 @@
+import argparse
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+from benchmarks.generators import synthetic_users
+from src.cleaning_pipeline import users_pipeline
+
+
+def write_users_csv(path: Path, rows: int, seed: int = 0) -> None:
+    synthetic_users(rows, seed=seed).to_csv(path, index=False)
+
+
+# The row-wise, copy-per-step version this pipeline replaced.
+def legacy_fill_missing_email(email: Optional[str]) -> str:
+    if pd.isna(email):
+        return "default_placeholder@company.com"
+    return str(email)
+
+
+def legacy_convert_age_to_float(data_frame: pd.DataFrame) -> pd.DataFrame:
+    df_copy = data_frame.copy()
+    df_copy["age"] = df_copy["age"].astype(float)
+    return df_copy
+
+
+def legacy_flag_records_by_threshold(
+    data_frame: pd.DataFrame, column: str, threshold: int
+) -> pd.DataFrame:
+    df_copy = data_frame.copy()
+    df_copy[f"{column}_IS_HIGH_RISK"] = df_copy[column] >= threshold
+    return df_copy
+
+
+def legacy_clean(df: pd.DataFrame) -> pd.DataFrame:
+    df_clean = df.drop_duplicates(keep="first")
+    df_clean["user_id"] = pd.to_numeric(df_clean["user_id"], errors="coerce")
+    df_clean["birthdate"] = pd.to_datetime(df_clean["birthdate"], errors="coerce")
+    df_clean["email"] = df_clean["email"].apply(legacy_fill_missing_email)
+    flag_high_age = partial(
+        legacy_flag_records_by_threshold, column="age", threshold=60
+    )
+    return df_clean.copy().pipe(legacy_convert_age_to_float).pipe(flag_high_age)
+
+
+def measure(
+    clean: Callable[[pd.DataFrame], pd.DataFrame], df: pd.DataFrame
+) -> Tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    clean(df)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Users cleaning: legacy vs pipeline")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+    pd.set_option("mode.copy_on_write", True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "users.csv"
+        write_users_csv(path, args.rows)
+        df = pd.read_csv(path)
+
+    pipeline = users_pipeline()
+    for label, clean in (("legacy", legacy_clean), ("pipeline", pipeline.run)):
+        seconds, peak_mb = measure(clean, df)
+        print(f"{label:<9} {seconds:6.2f} s   peak {peak_mb:8.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
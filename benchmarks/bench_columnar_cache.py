@@ -0,0 +1,88 @@
+import argparse
+import json
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import pandas as pd
+import yaml
+
+from benchmarks.generators import synthetic_users
+from storage.columnar_cache import ColumnarCache
+
+
+def write_sources(
+    directory: Path,
+    rows: int,
+    formats: Sequence[str] = ("json", "yaml", "xml", "csv"),
+) -> Dict[str, Path]:
+    df = synthetic_users(rows)
+    df["birthdate"] = df["birthdate"].astype(str)
+    records: List[Dict[str, Any]] = (
+        df.astype(object).where(df.notna(), None).to_dict("records")
+    )
+    paths = {ext: directory / f"users.{ext}" for ext in formats}
+    if "json" in paths:
+        paths["json"].write_text(json.dumps(records), encoding="utf-8")
+    if "yaml" in paths:
+        with open(paths["yaml"], "w", encoding="utf-8") as f:
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            yaml.dump(records, f, Dumper=dumper)
+    if "xml" in paths:
+        root = ET.Element("users")
+        for record in records:
+            user = ET.SubElement(root, "user")
+            for key, value in record.items():
+                if value is not None:
+                    ET.SubElement(user, key).text = str(value)
+        ET.ElementTree(root).write(paths["xml"], encoding="utf-8")
+    if "csv" in paths:
+        df.to_csv(paths["csv"], index=False)
+    return paths
+
+
+# What user_structures.main did before the cache: parse the source every run.
+def legacy_parse(path: Path) -> Any:
+    if path.suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    if path.suffix == ".yaml":
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    if path.suffix == ".xml":
+        return ET.parse(path).getroot().findall("user")
+    return pd.read_csv(path)
+
+
+def timed(load: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    load()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Source parsing vs columnar cache")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_sources(Path(tmp), args.rows)
+        cache = ColumnarCache(Path(tmp) / "cache")
+        print(f"{args.rows} users")
+        for ext, path in paths.items():
+            parse = timed(lambda: legacy_parse(path))
+            convert = timed(lambda: cache.load_frame(path))
+            reload = min(
+                timed(lambda: cache.load_frame(path)) for _ in range(args.repeats)
+            )
+            print(
+                f"  {ext:<5} parse {parse:8.3f} s   first load {convert:8.3f} s   "
+                f"cached reload {1000 * reload:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
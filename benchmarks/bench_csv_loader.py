@@ -0,0 +1,102 @@
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from benchmarks.generators import synthetic_articles, synthetic_users
+from storage.csv_loader import iter_csv, load_csv
+
+
+def write_csv(
+    path: Path, target_mb: int, make_chunk: Callable[[int], pd.DataFrame]
+) -> int:
+    """Append generated chunks to `path` until it reaches `target_mb`."""
+    rows, chunk_no = 0, 0
+    while not path.exists() or path.stat().st_size < target_mb * 2**20:
+        chunk = make_chunk(chunk_no)
+        chunk.to_csv(path, mode="a", header=chunk_no == 0, index=False)
+        rows += len(chunk)
+        chunk_no += 1
+    return rows
+
+
+def legacy_load(path: Path) -> int:
+    # The loader this replaces: read once for the header, again as strings.
+    header = pd.read_csv(path, nrows=1)
+    df = pd.read_csv(path, dtype={column: "string" for column in header.columns})
+    return len(df)
+
+
+def variants(columns: List[str]) -> Dict[str, Callable[[Path], int]]:
+    return {
+        "legacy (2 reads, strings)": legacy_load,
+        "load_csv c": lambda p: len(load_csv(p)),
+        "load_csv pyarrow": lambda p: len(load_csv(p, engine="pyarrow")),
+        f"load_csv pyarrow {columns}": lambda p: len(
+            load_csv(p, columns=columns, engine="pyarrow")
+        ),
+        "iter_csv c 200k rows": lambda p: sum(len(c) for c in iter_csv(p, 200_000)),
+        "iter_csv pyarrow 64MiB": lambda p: sum(
+            len(c) for c in iter_csv(p, 64 * 2**20, engine="pyarrow")
+        ),
+    }
+
+
+def peak_rss_mb() -> float:
+    # VmHWM resets on exec, unlike ru_maxrss, which a spawned child inherits.
+    with open("/proc/self/status", encoding="ascii") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _run(args: Tuple[str, List[str], str]) -> Tuple[float, float]:
+    path, columns, name = args
+    load = variants(columns)[name]
+    start = time.perf_counter()
+    load(Path(path))
+    seconds = time.perf_counter() - start
+    return seconds, peak_rss_mb()
+
+
+def bench_file(path: Path, columns: List[str]) -> None:
+    size_mb = path.stat().st_size / 2**20
+    print(f"\n{path.name}: {size_mb:.0f} MiB")
+    load_csv(path)  # warm the schema cache and the page cache
+    # A fresh process per variant so the peak RSS belongs to that variant alone.
+    context = multiprocessing.get_context("spawn")
+    for name in variants(columns):
+        with context.Pool(1) as pool:
+            seconds, peak_mb = pool.apply(_run, ((str(path), columns, name),))
+        print(f"  {name:<45} {seconds:7.2f} s   peak RSS {peak_mb:7.0f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CSV loader speed and memory")
+    parser.add_argument("--mb", type=int, default=2048, help="size of each file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        users = Path(tmp) / "users.csv"
+        write_csv(
+            users,
+            args.mb,
+            lambda n: synthetic_users(1_000_000, start_id=n * 1_000_000 + 1, seed=n),
+        )
+        articles = Path(tmp) / "articles.csv"
+        base = synthetic_articles(20_000, html_paragraphs=0).drop(
+            columns=["html_content"]
+        )
+        write_csv(articles, args.mb, lambda n: base)
+
+        bench_file(users, ["user_id", "age"])
+        bench_file(articles, ["arxiv_id", "author_full_name"])
+
+
+if __name__ == "__main__":
+    main()
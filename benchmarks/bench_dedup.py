@@ -0,0 +1,69 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from models.article_models import Author, ScientificArticle, SQLBase
+from usecases.dedup import DedupReport, MinHashDeduplicator
+
+
+def random_texts(count: int, words: int, rng: np.random.Generator) -> List[str]:
+    vocab = np.array([f"w{i}" for i in range(20_000)])
+    return [
+        " ".join(vocab[rng.integers(0, len(vocab), size=words)]) for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MinHash/LSH lookup cost vs corpus")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 40_000])
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--words", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dedup = MinHashDeduplicator()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'dedup.db'}")
+        SQLBase.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.execute(insert(Author.__table__), [{"full_name": "a"}])
+            next_id, loaded = 1, 0
+            for size in args.sizes:
+                while loaded < size:
+                    texts = random_texts(args.batch, args.words, rng)
+                    ids = list(range(next_id, next_id + len(texts)))
+                    session.execute(
+                        insert(ScientificArticle.__table__),
+                        [
+                            {
+                                "id": i,
+                                "title": "",
+                                "summary": "",
+                                "file_path": "",
+                                "author_id": 1,
+                            }
+                            for i in ids
+                        ],
+                    )
+                    batch = pd.DataFrame({"sql_article_id": ids, "text": texts})
+                    report = DedupReport()
+                    start = time.perf_counter()
+                    dedup.mark_duplicates(session, batch, report)
+                    per_article = (time.perf_counter() - start) * 1000 / len(ids)
+                    next_id += len(ids)
+                    loaded += len(ids)
+                print(
+                    f"{loaded:>7} articles: {per_article:.2f} ms per article "
+                    f"({report.duplicates} duplicates in last batch)"
+                )
+
+
+if __name__ == "__main__":
+    main()
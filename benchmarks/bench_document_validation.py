@@ -0,0 +1,72 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.generators import synthetic_documents
+from src.document_processor import (
+    Document,
+    ValidationReport,
+    records_frame,
+    validate_documents,
+)
+
+
+# What load_documents did before bulk validation.
+def legacy_validate(items: List[Dict[str, Any]]) -> List[Document]:
+    documents: List[Document] = []
+    for item in items:
+        try:
+            documents.append(Document(**item))
+        except Exception as e:
+            print(f"Skipping invalid document: {item} -> {e}")
+    return documents
+
+
+def variants(batch_size: int, workers: int) -> Dict[str, Callable[[List[Any]], Any]]:
+    def bulk(items: List[Any]) -> Any:
+        return list(validate_documents(items, ValidationReport(), batch_size))
+
+    def frame(items: List[Any]) -> Any:
+        records = validate_documents(
+            items, ValidationReport(), batch_size, as_records=True
+        )
+        return records_frame(list(records))
+
+    def parallel(items: List[Any]) -> Any:
+        return list(
+            validate_documents(items, ValidationReport(), batch_size, workers=workers)
+        )
+
+    return {
+        "legacy per-item": legacy_validate,
+        "bulk models": bulk,
+        "bulk DataFrame": frame,
+        f"bulk models x{workers} procs": parallel,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Document validation records/s")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    for label, invalid_ratio in (("valid-heavy", 0.01), ("invalid-heavy", 0.5)):
+        items = synthetic_documents(args.rows, invalid_ratio=invalid_ratio)
+        print(f"{label} ({invalid_ratio:.0%} invalid, {args.rows} records)")
+        for name, validate in variants(args.batch_size, args.workers).items():
+            # The legacy path prints every invalid item; time the formatting,
+            # not the terminal.
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                validate(items)
+                seconds = time.perf_counter() - start
+            print(f"  {name:<24} {args.rows / seconds:10.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
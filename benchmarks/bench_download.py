@@ -0,0 +1,55 @@
+import argparse
+import time
+
+import pandas as pd
+import requests
+
+from benchmarks.stub_server import stub_server
+from usecases.downloader import HtmlDownloader, download_html_contents
+
+
+def sequential_download(df: pd.DataFrame, url_template: str, delay: float) -> None:
+    """The original per-row loop: one fresh connection and a fixed sleep per page."""
+    for arxiv_id in df["arxiv_id"]:
+        time.sleep(delay)
+        response = requests.get(url_template.format(arxiv_id=arxiv_id), timeout=10)
+        response.raise_for_status()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML download throughput")
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=50.0)
+    args = parser.parse_args()
+
+    df = pd.DataFrame({"arxiv_id": [f"2512.{i:05d}v1" for i in range(args.rows)]})
+
+    with stub_server(args.latency) as base_url:
+        url_template = base_url + "/abs/{arxiv_id}"
+
+        start = time.perf_counter()
+        sequential_download(df, url_template, args.delay)
+        sequential = time.perf_counter() - start
+
+        downloader = HtmlDownloader(
+            max_workers=args.workers,
+            rate_per_second=args.rate,
+            per_host_limit=args.workers,
+            url_template=url_template,
+        )
+        with downloader:
+            start = time.perf_counter()
+            download_html_contents(df, downloader)
+            concurrent = time.perf_counter() - start
+
+    print(f"rows: {args.rows}, server latency: {args.latency * 1000:.0f} ms")
+    print(f"sequential: {sequential:.2f}s ({args.rows / sequential:.1f} pages/s)")
+    print(f"concurrent: {concurrent:.2f}s ({args.rows / concurrent:.1f} pages/s)")
+    print(f"speedup:    {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import random
+import time
+from typing import Callable, List
+
+from usecases.data_pipeline import extract_text_from_html
+from usecases.extraction import TextExtractor
+
+
+def synthetic_pages(count: int, paragraphs: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    words = "quantum circuit learning volatility model forecast market data".split()
+    pages = []
+    for i in range(count):
+        body = "".join(
+            "<p>"
+            + " ".join(rng.choice(words) for _ in range(40))
+            + ' <a href="/abs/x">link</a> <b>bold</b></p>'
+            for _ in range(paragraphs)
+        )
+        pages.append(
+            f"<html><head><title>{i}</title><script>var x = {i};</script></head>"
+            f"<body><h1>Article {i}</h1><ul><li>a</li><li>b</li></ul>{body}"
+            "</body></html>"
+        )
+    return pages
+
+
+def report(label: str, pages: int, seconds: float, cores: int) -> None:
+    rate = pages / seconds
+    print(f"{label:<24} {seconds:7.2f}s {rate:9.1f} pages/s {rate / cores:9.1f} /core")
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML-to-text extraction throughput")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--paragraphs", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.pages, args.paragraphs)
+
+    seconds = timed(lambda: [extract_text_from_html(page) for page in pages])
+    report("serial html2text", args.pages, seconds, 1)
+
+    for engine in ("html2text", "lxml"):
+        with TextExtractor(engine=engine, max_workers=args.workers) as extractor:
+            seconds = timed(lambda: extractor.extract_many(pages))
+            report(f"pool {engine} x{args.workers}", args.pages, seconds, args.workers)
+            seconds = timed(lambda: extractor.extract_many(pages))
+            report(f"memoized {engine}", args.pages, seconds, 1)
+
+
+if __name__ == "__main__":
+    main()
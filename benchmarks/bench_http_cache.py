@@ -0,0 +1,43 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.stub_server import stub_server
+from usecases.downloader import HtmlDownloader, download_html_contents
+from usecases.http_cache import HttpCache
+
+
+def timed_download(df: pd.DataFrame, downloader: HtmlDownloader) -> float:
+    start = time.perf_counter()
+    download_html_contents(df, downloader)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP cache cold vs warm ingest")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    df = pd.DataFrame({"arxiv_id": [f"2512.{i:05d}v1" for i in range(args.rows)]})
+
+    with stub_server(args.latency) as base_url, tempfile.TemporaryDirectory() as tmp:
+        url_template = base_url + "/abs/{arxiv_id}"
+        for label, max_age in (("fresh", 3600.0), ("revalidate", 0.0)):
+            cache = HttpCache(Path(tmp) / label, max_age=max_age)
+            downloader = HtmlDownloader(
+                rate_per_second=1000.0, url_template=url_template, cache=cache
+            )
+            with downloader:
+                cold = timed_download(df, downloader)
+                warm = timed_download(df, downloader)
+            print(f"[{label}] cold: {cold:.2f}s, warm: {warm:.2f}s, {cache.stats}")
+            print(f"[{label}] hit ratio: {cache.stats.hit_ratio:.2f}")
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.engine import Engine
+
+from db_project.orm_models import Base, User
+from usecases.indexes import USER_HOT_QUERIES, check_sql_plans
+
+
+def users_db(path: Path, rows: int, indexed: bool) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if not indexed:
+            conn.execute(text("DROP INDEX ix_users_name"))
+        conn.execute(
+            insert(User.__table__),
+            [
+                {"name": f"user{i}", "email": f"user{i}@example.com", "age": 30}
+                for i in range(rows)
+            ],
+        )
+    return engine
+
+
+def lookup_ms(engine: Engine, rows: int, lookups: int) -> List[float]:
+    rng = np.random.default_rng(0)
+    timings = []
+    with engine.connect() as conn:
+        for i in rng.integers(0, rows, size=lookups):
+            start = time.perf_counter()
+            conn.execute(User.__table__.select().where(User.name == f"user{i}")).all()
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="User lookup by name vs table size")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            line = f"{rows:>9} users"
+            for indexed in (False, True):
+                engine = users_db(Path(tmp) / f"{rows}_{indexed}.db", rows, indexed)
+                scans = check_sql_plans(engine, USER_HOT_QUERIES)
+                p50 = np.percentile(lookup_ms(engine, rows, args.lookups), 50)
+                label = "scan" if scans else "index"
+                line += f"   {label}: p50 {p50:7.3f} ms"
+                engine.dispose()
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+import pandas as pd
+
+from benchmarks.backends import connect_mongo
+from benchmarks.generators import synthetic_articles
+from models.article_models import MongoAuthor, MongoScientificArticle
+from usecases.extraction import extract_texts
+from usecases.mongo_loader import bulk_write_articles
+
+
+ROUND_TRIP_METHODS = ("find", "insert_one", "update_one", "replace_one", "bulk_write")
+
+
+def save_row(row: pd.Series) -> None:
+    """The find-then-save that bulk_write_articles replaced, kept as the baseline."""
+    article = MongoScientificArticle(
+        sql_id=int(row["sql_article_id"]),
+        title=row["title"],
+        summary=row["summary"],
+        arxiv_id=row["arxiv_id"],
+        text=row["text"],
+        author=MongoAuthor(
+            full_name=row["author_full_name"], title=row["author_title"]
+        ),
+    )
+    if not MongoScientificArticle.objects(sql_id=article.sql_id).first():
+        article.save()
+
+
+def count_round_trips(collection_class: Any, counter: Dict[str, int]) -> None:
+    """Count calls that each cost one network round-trip against a real server."""
+
+    def wrap(method: Callable[..., Any]) -> Callable[..., Any]:
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            counter["round_trips"] += 1
+            return method(*args, **kwargs)
+
+        return counted
+
+    for name in ROUND_TRIP_METHODS:
+        setattr(collection_class, name, wrap(getattr(collection_class, name)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mongo article load docs/s")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--mongo-uri", default=None, help="default: mongomock")
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    df = synthetic_articles(args.rows, html_paragraphs=2)
+    df["sql_article_id"] = range(1, args.rows + 1)
+    df = extract_texts(df)
+
+    connect_mongo(args.mongo_uri)
+    counter = {"round_trips": 0}
+    if args.mongo_uri is None:
+        import mongomock
+
+        count_round_trips(mongomock.Collection, counter)
+    MongoScientificArticle.objects.delete()
+
+    def run(label: str, load: Callable[[], object]) -> None:
+        counter["round_trips"] = 0
+        start = time.perf_counter()
+        load()
+        seconds = time.perf_counter() - start
+        MongoScientificArticle.objects.delete()
+        line = f"{label}: {args.rows / seconds:9.0f} docs/s"
+        if args.mongo_uri is None:
+            # mongomock has no network; project the cost of its round-trips.
+            projected = seconds + counter["round_trips"] * args.rtt_ms / 1000
+            line += (
+                f"  {counter['round_trips']:6d} round-trips"
+                f"  ~{args.rows / projected:6.0f} docs/s at {args.rtt_ms} ms RTT"
+            )
+        print(line)
+
+    run("per-row find+save", lambda: df.apply(save_row, axis=1))
+    run("bulk_write upsert", lambda: bulk_write_articles(df, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.bench_columnar_cache import write_sources
+from benchmarks.generators import synthetic_documents
+from src.shard_loader import (
+    find_shards,
+    load_document_shards,
+    load_user_shards,
+    read_user_shard,
+)
+
+FORMATS = ("csv", "json", "xml", "yaml")
+
+
+def shard_sizes(rows: int, shards: int, skew: float) -> List[int]:
+    """The first shard holds `skew` of the rows, the rest share the remainder."""
+    big = int(rows * skew)
+    rest = (rows - big) // max(shards - 1, 1)
+    return [big] + [rest] * (shards - 1)
+
+
+def write_user_shards(directory: Path, sizes: List[int]) -> None:
+    for number, rows in enumerate(sizes):
+        # YAML parses an order of magnitude slower; keep those shards small.
+        fmt = FORMATS[number % len(FORMATS)] if number else "csv"
+        if fmt == "yaml":
+            rows = max(rows // 10, 1)
+        scratch = directory / f"tmp-{number}"
+        scratch.mkdir()
+        path = write_sources(scratch, rows, formats=(fmt,))[fmt]
+        path.rename(directory / f"users-{number:03d}.{fmt}")
+        scratch.rmdir()
+
+
+def write_document_shards(directory: Path, sizes: List[int]) -> None:
+    for number, rows in enumerate(sizes):
+        documents = synthetic_documents(rows, seed=number)
+        path = directory / f"documents-{number:03d}.json"
+        path.write_text(json.dumps(documents), encoding="utf-8")
+
+
+# Submitting in name order, as a plain pool.map would.
+def name_ordered(directory: Path, workers: int) -> pd.DataFrame:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tables = list(pool.map(read_user_shard, find_shards(directory)))
+    return pa.concat_tables(tables).to_pandas()
+
+
+def timed(load: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    load()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded directory loading")
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--skew", type=float, default=0.25)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    sizes = shard_sizes(args.rows, args.shards, args.skew)
+    with tempfile.TemporaryDirectory() as tmp:
+        users, documents = Path(tmp) / "users", Path(tmp) / "documents"
+        users.mkdir()
+        documents.mkdir()
+        write_user_shards(users, sizes)
+        write_document_shards(documents, [max(size // 5, 1) for size in sizes])
+
+        print(f"{args.shards} user shards, largest {sizes[0]} rows")
+        rows = len(load_user_shards(users, workers=1))
+        for label, load in (
+            ("sequential", lambda: load_user_shards(users, workers=1)),
+            (
+                f"x{args.workers} name order",
+                lambda: name_ordered(users, args.workers),
+            ),
+            (
+                f"x{args.workers} largest first",
+                lambda: load_user_shards(users, workers=args.workers),
+            ),
+        ):
+            seconds = timed(load)
+            print(f"  {label:<22} {seconds:8.3f} s {rows / seconds:12.0f} rows/s")
+
+        print(f"{args.shards} document shards")
+        rows = len(load_document_shards(documents, workers=1))
+        for workers in sorted({1, args.workers}):
+            seconds = timed(lambda: load_document_shards(documents, workers=workers))
+            print(f"  x{workers:<21} {seconds:8.3f} s {rows / seconds:12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
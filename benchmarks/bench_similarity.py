@@ -0,0 +1,58 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from usecases.similarity import TfidfIndex
+
+
+def zipf_corpus(docs: int, vocab: int, doc_len: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{i}" for i in range(vocab)])
+    tokens = words[np.minimum(rng.zipf(1.2, size=(docs, doc_len)), vocab) - 1]
+    return pd.DataFrame(
+        {
+            "sql_article_id": np.arange(1, docs + 1),
+            "title": "",
+            "summary": "",
+            "text": [" ".join(row) for row in tokens],
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TF-IDF more-like-this latency")
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-len", type=int, default=120)
+    parser.add_argument("--append-size", type=int, default=25_000)
+    parser.add_argument("--queries", type=int, default=256)
+    args = parser.parse_args()
+
+    corpus = zipf_corpus(args.docs, args.vocab, args.doc_len)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = TfidfIndex(Path(tmp))
+        start = time.perf_counter()
+        for offset in range(0, args.docs, args.append_size):
+            index.add_articles(corpus.iloc[offset : offset + args.append_size])
+        build = time.perf_counter() - start
+        print(f"build: {build:.1f}s, {len(index.segments)} segments, {args.docs} docs")
+
+        start = time.perf_counter()
+        index.idf()
+        print(f"idf + norms: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        ids = np.random.default_rng(1).integers(1, args.docs + 1, size=args.queries)
+        for batch_size in (1, 4, 16):
+            index.batch_size = batch_size
+            start = time.perf_counter()
+            index.similar_to_many(ids.tolist(), k=10)
+            per_query = (time.perf_counter() - start) * 1000 / args.queries
+            print(f"batch {batch_size:>3}: {per_query:6.2f} ms per article")
+
+
+if __name__ == "__main__":
+    main()
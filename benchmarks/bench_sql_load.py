@@ -0,0 +1,93 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from benchmarks.generators import synthetic_articles
+from models.article_models import Author, ScientificArticle, SQLBase
+from usecases.sql_loader import bulk_load_articles
+
+
+def save_row(row: pd.Series, session: Session) -> pd.Series:
+    """The per-row load that bulk_load_articles replaced, kept as the baseline."""
+    try:
+        author = (
+            session.query(Author).filter_by(full_name=row["author_full_name"]).first()
+        )
+        if not author:
+            author = Author(
+                full_name=row["author_full_name"], title=row["author_title"]
+            )
+            session.add(author)
+            session.flush()
+
+        article = (
+            session.query(ScientificArticle).filter_by(arxiv_id=row["arxiv_id"]).first()
+        )
+        if not article:
+            article = ScientificArticle(
+                title=row["title"],
+                summary=row["summary"],
+                file_path=row["file_path"],
+                arxiv_id=row["arxiv_id"],
+                author_id=author.id,
+            )
+            session.add(article)
+            session.flush()
+        row["sql_article_id"] = article.id
+        row["sql_author_id"] = article.author_id
+    except SQLAlchemyError:
+        session.rollback()
+        row["sql_article_id"] = -1
+        row["sql_author_id"] = -1
+    return row
+
+
+def per_row(df: pd.DataFrame, session: Session) -> pd.DataFrame:
+    return df.apply(lambda row: save_row(row, session), axis=1)
+
+
+def timed_load(
+    db_path: Path, df: pd.DataFrame, load: Callable[[pd.DataFrame, Session], object]
+) -> float:
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLBase.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        start = time.perf_counter()
+        load(df, session)
+        session.commit()
+        seconds = time.perf_counter() - start
+    engine.dispose()
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MariaDB load path rows/s (SQLite)")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    df = synthetic_articles(args.rows, html_paragraphs=0)
+
+    def bulk(frame: pd.DataFrame, session: Session) -> pd.DataFrame:
+        return bulk_load_articles(frame, session, args.batch_size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, load in (("per-row", per_row), ("bulk", bulk)):
+            db_path = Path(tmp) / f"{label}.db"
+            cold = timed_load(db_path, df, load)
+            warm = timed_load(db_path, df, load)
+            print(
+                f"{label:<8} new: {args.rows / cold:9.0f} rows/s"
+                f"   existing: {args.rows / warm:9.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
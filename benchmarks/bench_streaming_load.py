@@ -0,0 +1,84 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pandas as pd
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+import usecases.data_pipeline as data_pipeline
+from benchmarks.generators import synthetic_articles
+from models.article_models import MongoScientificArticle
+
+
+class SimulatedCollection:
+    """Stands in for a remote Mongo collection: each bulk_write costs `latency`."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def bulk_write(self, operations: List[Any], ordered: bool = True) -> Any:
+        time.sleep(self.latency)
+
+        class Result:
+            upserted_count = len(operations)
+            matched_count = 0
+
+        return Result()
+
+
+def remote_engine(path: Path, latency: float) -> Engine:
+    """SQLite engine whose commits cost `latency`, like a round-trip to MariaDB."""
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "commit", lambda conn: time.sleep(latency))
+    return engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sequential vs overlapped DB load")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--sql-latency", type=float, default=0.5)
+    parser.add_argument("--mongo-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    df = synthetic_articles(args.rows, html_paragraphs=1)
+    df["text"] = df["summary"]
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        for start in range(0, len(df), args.chunk_size):
+            yield df.iloc[start : start + args.chunk_size]
+
+    collection = SimulatedCollection(args.mongo_latency)
+    MongoScientificArticle._get_collection = classmethod(  # type: ignore[method-assign]
+        lambda cls: collection
+    )
+    data_pipeline.setup_mongodb_connection = lambda: None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = remote_engine(Path(tmp) / "sequential.db", args.sql_latency)
+        start = time.perf_counter()
+        for chunk in chunks():
+            data_pipeline.load_data_into_dbs(chunk, engine, args.chunk_size)
+        sequential = time.perf_counter() - start
+
+        engine = remote_engine(Path(tmp) / "streaming.db", args.sql_latency)
+        start = time.perf_counter()
+        ids, report = data_pipeline.load_data_into_dbs_streaming(
+            chunks(), engine, batch_size=args.chunk_size
+        )
+        streaming = time.perf_counter() - start
+
+    print(f"chunks: {-(-args.rows // args.chunk_size)} x {args.chunk_size} rows")
+    print(
+        f"simulated latency: {args.sql_latency}s per SQL commit, "
+        f"{args.mongo_latency}s per Mongo bulk_write"
+    )
+    print(f"sequential: {sequential:.2f}s")
+    print(f"streaming:  {streaming:.2f}s  ({report.written} docs, {len(ids)} ids)")
+
+
+if __name__ == "__main__":
+    main()
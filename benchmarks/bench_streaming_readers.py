@@ -0,0 +1,62 @@
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Callable, Iterable, Tuple
+
+from benchmarks.bench_columnar_cache import write_sources
+from storage.streaming_readers import iter_json_array, iter_xml_records
+
+
+def load_json(path: Path) -> Iterable[Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        records: Iterable[Any] = json.load(f)
+    return records
+
+
+def load_xml(path: Path) -> Iterable[Any]:
+    return ET.parse(path).getroot()
+
+
+def measure(read: Callable[[], Iterable[Any]]) -> Tuple[float, float, float]:
+    """Seconds to the first record, seconds in total and peak traced MiB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = 0.0
+    for count, _ in enumerate(read()):
+        if count == 0:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Whole-file vs streaming readers")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        paths = write_sources(directory, args.rows, formats=("json", "xml"))
+        variants = [
+            ("json.load", lambda: load_json(paths["json"])),
+            ("iter_json_array", lambda: iter_json_array(paths["json"])),
+            ("ET.parse", lambda: load_xml(paths["xml"])),
+            ("iter_xml_records", lambda: iter_xml_records(paths["xml"])),
+        ]
+        print(f"{args.rows} users")
+        for label, read in variants:
+            first, total, peak_mb = measure(read)
+            print(
+                f"  {label:<17} first record {1000 * first:9.2f} ms   "
+                f"total {total:7.2f} s   peak {peak_mb:8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
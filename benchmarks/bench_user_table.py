@@ -0,0 +1,141 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.user_structures import UserDataclass, UserNamedTuple, UserPydantic
+from src.user_table import UserTable
+
+Columns = Tuple[List[str], List[int], List[str]]
+
+NAMES = ["Pasindu", "Divya", "Lakshmi", "Amitha", "Devi", "Sunil", "Lahiru", "Nimal"]
+DOMAINS = ["example.com", "example.org", "gmail.com", "company.lk"]
+AGE_RANGE = (30, 40)
+DOMAIN = "example.org"
+
+
+def make_columns(rows: int, seed: int = 0) -> Columns:
+    rng = np.random.default_rng(seed)
+    names = [NAMES[i] for i in rng.integers(0, len(NAMES), size=rows)]
+    ages = rng.integers(18, 90, size=rows).tolist()
+    domains = rng.integers(0, len(DOMAINS), size=rows)
+    emails = [f"user{i}@{DOMAINS[d]}" for i, d in enumerate(domains)]
+    return names, ages, emails
+
+
+def build_typed_dicts(names: List[str], ages: List[int], emails: List[str]) -> Any:
+    return [{"name": n, "age": a, "email": e} for n, a, e in zip(names, ages, emails)]
+
+
+def build_named_tuples(names: List[str], ages: List[int], emails: List[str]) -> Any:
+    return [UserNamedTuple(n, a, e) for n, a, e in zip(names, ages, emails)]
+
+
+def build_dataclasses(names: List[str], ages: List[int], emails: List[str]) -> Any:
+    return [UserDataclass(n, a, e) for n, a, e in zip(names, ages, emails)]
+
+
+def build_pydantic(names: List[str], ages: List[int], emails: List[str]) -> Any:
+    return [
+        UserPydantic(name=n, age=a, email=e) for n, a, e in zip(names, ages, emails)
+    ]
+
+
+def build_dataframe(names: List[str], ages: List[int], emails: List[str]) -> Any:
+    return pd.DataFrame(
+        {
+            "name": pd.Categorical(names),
+            "age": np.asarray(ages, dtype=np.int32),
+            "email": pd.array(emails, dtype="string[pyarrow]"),
+        }
+    )
+
+
+def _matches(age: int, email: str) -> bool:
+    low, high = AGE_RANGE
+    return low <= age <= high and email.lower().endswith("@" + DOMAIN)
+
+
+def filter_typed_dicts(users: Any) -> int:
+    return sum(1 for u in users if _matches(u["age"], u["email"]))
+
+
+def filter_objects(users: Any) -> int:
+    return sum(1 for u in users if _matches(u.age, u.email))
+
+
+def filter_dataframe(df: pd.DataFrame) -> int:
+    mask = df["age"].between(*AGE_RANGE) & df["email"].str.lower().str.endswith(
+        "@" + DOMAIN
+    )
+    return int(mask.sum())
+
+
+def filter_table(table: UserTable) -> int:
+    return int((table.age_between(*AGE_RANGE) & table.email_domain(DOMAIN)).sum())
+
+
+REPRESENTATIONS: Dict[str, Tuple[Callable[..., Any], Callable[[Any], int]]] = {
+    "TypedDict": (build_typed_dicts, filter_typed_dicts),
+    "NamedTuple": (build_named_tuples, filter_objects),
+    "Dataclass": (build_dataclasses, filter_objects),
+    "Pydantic": (build_pydantic, filter_objects),
+    "DataFrame": (build_dataframe, filter_dataframe),
+    "UserTable": (UserTable.from_columns, filter_table),
+}
+
+
+def measure(
+    build: Callable[..., Any], count: Callable[[Any], int], rows: int
+) -> Tuple[float, float, float, int]:
+    """Construction seconds, retained bytes per record, filter seconds, matches.
+
+    The input strings are created inside the traced region and dropped after
+    construction, so the retained size includes the strings a representation
+    keeps alive, not just its containers.
+    """
+    gc.collect()
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    columns = make_columns(rows)
+    start = time.perf_counter()
+    users = build(*columns)
+    build_seconds = time.perf_counter() - start
+    del columns
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Arrow buffers come from Arrow's own allocator, which tracemalloc misses.
+    retained += pa.total_allocated_bytes() - arrow_before
+
+    start = time.perf_counter()
+    matches = count(users)
+    filter_seconds = time.perf_counter() - start
+    return build_seconds, retained / rows, filter_seconds, matches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="User representations at scale")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.rows} users, filter: age in {AGE_RANGE} and @{DOMAIN}")
+    for label, (build, count) in REPRESENTATIONS.items():
+        build_seconds, per_record, filter_seconds, matches = measure(
+            build, count, args.rows
+        )
+        print(
+            f"  {label:<10} {per_record:7.1f} B/record   "
+            f"build {args.rows / build_seconds / 1e6:7.2f} M rows/s   "
+            f"filter {args.rows / filter_seconds / 1e6:8.2f} M rows/s   "
+            f"({matches} matches)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import random
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+WORDS = (
+    "quantum circuit learning volatility model forecast market data neural "
+    "network transformer attention residual queue priority distribution"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def synthetic_articles(
+    count: int, authors: int = 100, html_paragraphs: int = 5, seed: int = 0
+) -> pd.DataFrame:
+    """Deterministic frame shaped like `fetch_arxiv_data` output after download."""
+    rng = random.Random(seed)
+    rows: List[dict] = []
+    for i in range(count):
+        arxiv_id = f"{2500 + i // 100_000}.{i % 100_000:05d}v1"
+        body = "".join(f"<p>{_sentence(rng, 30)}</p>" for _ in range(html_paragraphs))
+        rows.append(
+            {
+                "title": _sentence(rng, 8).title(),
+                "summary": _sentence(rng, 40),
+                "file_path": f"arxiv_pdf/{arxiv_id}.pdf",
+                "arxiv_id": arxiv_id,
+                "author_full_name": f"Author {rng.randrange(authors)}",
+                "author_title": "ArXiv Contributor",
+                "html_content": f"<html><body><h1>{i}</h1>{body}</body></html>",
+                "published": f"2025-01-01T00:00:{i % 60:02d}Z",
+            }
+        )
+    return pd.DataFrame(rows).astype("string")
+
+
+def synthetic_users(count: int, start_id: int = 1, seed: int = 0) -> pd.DataFrame:
+    """Users shaped like data/users_assignment4.csv, 5% of emails missing."""
+    rng = np.random.default_rng(seed)
+    names = np.array(["Pasindu", "Divya", "Lakshmi", "Amitha", "Devi", "Sunil"])
+    ids = np.arange(start_id, start_id + count)
+    emails = pd.Series([f"user{i}@example.com" for i in ids])
+    emails[rng.random(count) < 0.05] = None
+    birthdates = pd.to_datetime("1940-01-01") + pd.to_timedelta(
+        rng.integers(0, 60 * 365, size=count), unit="D"
+    )
+    return pd.DataFrame(
+        {
+            "user_id": ids,
+            "name": names[rng.integers(0, len(names), size=count)],
+            "age": rng.integers(18, 90, size=count),
+            "email": emails,
+            "birthdate": birthdates.strftime("%Y-%m-%d"),
+        }
+    )
+
+
+def synthetic_documents(
+    count: int, invalid_ratio: float = 0.01, seed: int = 0
+) -> List[dict]:
+    """Records shaped like data/documents.json; `invalid_ratio` lack an email."""
+    rng = random.Random(seed)
+    cities = ["Colombo", "Kandy", "Galle", "Jaffna"]
+    documents: List[dict] = []
+    for i in range(count):
+        city = rng.choice(cities)
+        document = {
+            "id": i + 1,
+            "name": f"User {i}",
+            "age": rng.randrange(18, 90),
+            "city": city,
+            "email": f"user{i}@example.com",
+            "skills": rng.sample(WORDS, 3),
+            "hobbies": rng.sample(WORDS, 2),
+            "active": rng.random() < 0.8,
+            "address": {"city": city, "country": "Sri Lanka"},
+            "metadata": {
+                "likes_trading": rng.random() < 0.5,
+                "experience_years": rng.randrange(0, 30),
+                "prefers_remote_work": rng.random() < 0.5,
+                "gym_member": rng.random() < 0.3,
+            },
+        }
+        if rng.random() < invalid_ratio:
+            del document["email"]
+        documents.append(document)
+    return documents
@@ -0,0 +1,321 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.backends import connect_mongo
+from benchmarks.bench_columnar_cache import write_sources
+from benchmarks.bench_extraction import synthetic_pages
+from benchmarks.generators import (
+    synthetic_articles,
+    synthetic_documents,
+    synthetic_users,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "baseline.json"
+
+
+@dataclass
+class Scale:
+    users: int = 100_000
+    yaml_users: int = 5_000
+    documents: int = 20_000
+    articles: int = 1_000
+    pages: int = 100
+
+    def scaled(self, factor: float) -> "Scale":
+        return Scale(
+            **{name: max(1, int(value * factor)) for name, value in vars(self).items()}
+        )
+
+
+@dataclass
+class BenchCase:
+    """`setup` builds inputs once; `run` is timed, `reset` runs untimed before it."""
+
+    name: str
+    setup: Callable[[Scale, Path], Any]
+    run: Callable[[Any], object]
+    reset: Optional[Callable[[Any], None]] = None
+
+
+def _sources(scale: Scale, directory: Path) -> Dict[str, Path]:
+    paths = write_sources(directory, scale.users, formats=("json", "xml", "csv"))
+    yaml_dir = directory / "yaml"
+    yaml_dir.mkdir()
+    paths.update(write_sources(yaml_dir, scale.yaml_users, formats=("yaml",)))
+    return paths
+
+
+def loader_cases() -> List[BenchCase]:
+    from src.user_structures import iter_users_json, iter_users_xml
+    from storage.columnar_cache import READERS, ColumnarCache
+    from storage.csv_loader import infer_schema, load_csv
+
+    def warm_cache(scale: Scale, directory: Path) -> Any:
+        paths = _sources(scale, directory)
+        cache = ColumnarCache(directory / "columnar")
+        cache.load_frame(paths["csv"])
+        return cache, paths["csv"]
+
+    def csv_with_schema(scale: Scale, directory: Path) -> Any:
+        # Inferred up front so runs do not fill the on-disk schema cache.
+        path = _sources(scale, directory)["csv"]
+        return path, infer_schema(path)
+
+    def reader(ext: str) -> BenchCase:
+        return BenchCase(
+            f"loaders.{ext}",
+            lambda scale, directory: _sources(scale, directory)[ext],
+            lambda path: READERS[f".{ext}"](path),
+        )
+
+    return [
+        BenchCase(
+            "loaders.csv",
+            csv_with_schema,
+            lambda state: load_csv(state[0], schema=state[1]),
+        ),
+        BenchCase(
+            "loaders.csv_pyarrow",
+            csv_with_schema,
+            lambda state: load_csv(state[0], schema=state[1], engine="pyarrow"),
+        ),
+        reader("json"),
+        reader("yaml"),
+        reader("xml"),
+        BenchCase(
+            "loaders.json_stream",
+            lambda scale, directory: _sources(scale, directory)["json"],
+            lambda path: sum(1 for _ in iter_users_json(str(path))),
+        ),
+        BenchCase(
+            "loaders.xml_stream",
+            lambda scale, directory: _sources(scale, directory)["xml"],
+            lambda path: sum(1 for _ in iter_users_xml(str(path))),
+        ),
+        BenchCase(
+            "loaders.columnar_reload",
+            warm_cache,
+            lambda state: state[0].load_frame(state[1]),
+        ),
+    ]
+
+
+def document_cases() -> List[BenchCase]:
+    from src.document_processor import load_documents
+
+    def write_documents(scale: Scale, directory: Path) -> str:
+        path = directory / "documents.json"
+        path.write_text(json.dumps(synthetic_documents(scale.documents)))
+        return str(path)
+
+    return [BenchCase("documents.load", write_documents, load_documents)]
+
+
+def cleaning_cases() -> List[BenchCase]:
+    from src.cleaning_pipeline import users_pipeline
+
+    pipeline = users_pipeline()
+    return [
+        BenchCase(
+            "cleaning.users_pipeline",
+            lambda scale, directory: synthetic_users(scale.users),
+            pipeline.run,
+        )
+    ]
+
+
+def extraction_cases() -> List[BenchCase]:
+    from usecases.data_pipeline import extract_text_from_html
+
+    return [
+        BenchCase(
+            "extraction.html",
+            lambda scale, directory: synthetic_pages(scale.pages, paragraphs=20),
+            lambda pages: [extract_text_from_html(page) for page in pages],
+        )
+    ]
+
+
+def load_cases() -> List[BenchCase]:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from models.article_models import MongoScientificArticle, SQLBase
+    from usecases.extraction import extract_texts
+    from usecases.mongo_loader import bulk_write_articles
+    from usecases.sql_loader import bulk_load_articles
+
+    def sql_load(df: Any) -> object:
+        engine = create_engine("sqlite://")
+        SQLBase.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            loaded = bulk_load_articles(df, session)
+        engine.dispose()
+        return loaded
+
+    def mongo_articles(scale: Scale, directory: Path) -> Any:
+        connect_mongo()
+        df = synthetic_articles(scale.articles, html_paragraphs=2)
+        df["sql_article_id"] = range(1, scale.articles + 1)
+        return extract_texts(df)
+
+    return [
+        BenchCase(
+            "load.sql_sqlite",
+            lambda scale, directory: synthetic_articles(
+                scale.articles, html_paragraphs=0
+            ),
+            sql_load,
+        ),
+        BenchCase(
+            "load.mongo_mongomock",
+            mongo_articles,
+            bulk_write_articles,
+            reset=lambda df: MongoScientificArticle.objects.delete(),
+        ),
+    ]
+
+
+def all_cases() -> List[BenchCase]:
+    return (
+        loader_cases()
+        + document_cases()
+        + cleaning_cases()
+        + extraction_cases()
+        + load_cases()
+    )
+
+
+def run_case(case: BenchCase, scale: Scale, repeats: int) -> Dict[str, Any]:
+    """Median and min of `repeats` timed runs after one untimed warm-up."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = case.setup(scale, Path(tmp))
+        samples: List[float] = []
+        for attempt in range(repeats + 1):
+            if case.reset is not None:
+                case.reset(state)
+            # Pipeline code prints per-row diagnostics; keep the report readable.
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                case.run(state)
+                seconds = time.perf_counter() - start
+            if attempt:
+                samples.append(seconds)
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "repeats": repeats,
+    }
+
+
+def run_suite(
+    scale_factor: float = 1.0, repeats: int = 5, only: Optional[str] = None
+) -> Dict[str, Any]:
+    scale = Scale().scaled(scale_factor)
+    results: Dict[str, Any] = {}
+    for case in all_cases():
+        if only and only not in case.name:
+            continue
+        results[case.name] = run_case(case, scale, repeats)
+        print(
+            f"  {case.name:<26} median {1000 * results[case.name]['median_s']:10.2f} ms"
+            f"   min {1000 * results[case.name]['min_s']:10.2f} ms"
+        )
+    return {
+        "scale": vars(scale),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": results,
+    }
+
+
+def environment_mismatch(baseline: Dict[str, Any], scale_factor: float) -> List[str]:
+    """Why `baseline` cannot be compared with a run here; empty when it can.
+
+    Timings are absolute, so a baseline only means something for the same
+    scale on the same interpreter and architecture.
+    """
+    current = {
+        "scale": vars(Scale().scaled(scale_factor)),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    return [
+        f"{key}: baseline {baseline.get(key)}, here {value}"
+        for key, value in current.items()
+        if baseline.get(key) != value
+    ]
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Cases whose median grew by more than `threshold` (0.25 = 25%).
+
+    Cases missing from the baseline are skipped, so new benchmarks do not fail
+    the gate until a baseline including them is saved.
+    """
+    regressions: List[str] = []
+    for name, result in current["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {1000 * before['median_s']:.2f} ms -> "
+                f"{1000 * result['median_s']:.2f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark suite with baselines")
+    parser.add_argument("mode", choices=["run", "compare"])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", default=None, help="run cases containing this")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument(
+        "--save", action="store_true", help="run: write results as the baseline"
+    )
+    args = parser.parse_args()
+
+    if args.mode == "run":
+        results = run_suite(args.scale, args.repeats, args.only)
+        if args.save:
+            args.baseline.parent.mkdir(parents=True, exist_ok=True)
+            args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+            print(f"Saved baseline to {args.baseline}")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    mismatches = environment_mismatch(baseline, args.scale)
+    if mismatches:
+        print(f"{args.baseline} was recorded elsewhere; run with --save here first:")
+        for line in mismatches:
+            print(f"  {line}")
+        sys.exit(2)
+    results = run_suite(args.scale, args.repeats, args.only)
+    regressions = compare(baseline, results, args.threshold)
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No case regressed beyond {args.threshold:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
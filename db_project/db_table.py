@@ -6,7 +6,7 @@ users_table = Table(
     "users",
     metadata,
     Column("id", Integer, primary_key=True, autoincrement=True),
-    Column("name", String(50), nullable=False),
+    Column("name", String(50), nullable=False, index=True),
     Column("email", String(100), nullable=False, unique=True),
     Column("age", Integer),
     Column("created_at", DateTime, server_default=func.now()),
@@ -10,7 +10,7 @@ class User(Base):
     __tablename__ = "users"
 
     id: int = Column(Integer, primary_key=True, autoincrement=True)
-    name: str = Column(String(50), nullable=False)
+    name: str = Column(String(50), nullable=False, index=True)
     email: str = Column(String(100), nullable=False, unique=True)
     age: int = Column(Integer, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
@@ -1,15 +1,26 @@
 import os
+import sys
 from pathlib import Path
+from typing import Sequence, Union
 import pandas as pd
 from storage.db_setup import sql_engine
 from usecases.data_pipeline import (
     fetch_arxiv_data,
-    download_html_content,
     load_data_into_dbs,
     search_mongodb_articles,
-    clear_mongo_collection, 
+    clear_mongo_collection,
 )
-from models.article_models import MongoScientificArticle 
+from usecases.bm25_index import BM25Hit, BM25Index, search_local_articles
+from usecases.checkpoint import ingest_incremental
+from usecases.dedup import MinHashDeduplicator
+from usecases.downloader import HtmlDownloader, download_html_contents
+from usecases.extraction import extract_texts
+from usecases.http_cache import HttpCache
+from usecases.instrumentation import get_instrumentation
+from usecases.mongo_search import SearchHit
+from usecases.search_cache import get_search_cache
+from usecases.similarity import TfidfIndex
+from models.article_models import MongoScientificArticle
 
 PROJECT_ROOT = Path(__file__).parent
 DATA_DIR = PROJECT_ROOT / "data"
@@ -17,40 +28,83 @@ DATA_DIR = PROJECT_ROOT / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
 
-def run_api_pipeline() -> None:
+def run_api_pipeline(incremental: bool = False, use_bm25: bool = False) -> None:
     print("=" * 50)
-    
+
     ARXIV_QUERY = "quantum circuit learning"
     MAX_RESULTS = 3
-    
-    clear_mongo_collection(MongoScientificArticle) 
 
-    print(f"1. Fetching {MAX_RESULTS} articles from ArXiv for query: '{ARXIV_QUERY}'...")
-    df_arxiv = fetch_arxiv_data(ARXIV_QUERY, MAX_RESULTS)
-    
-    df_arxiv = df_arxiv.apply(download_html_content, axis=1)
+    http_cache = HttpCache()
+    similarity_index = TfidfIndex()
+    search_index = BM25Index() if use_bm25 else None
+    deduplicator = MinHashDeduplicator()
+
+    if incremental:
+        print(f"1-2. Incrementally ingesting '{ARXIV_QUERY}' (up to {MAX_RESULTS})...")
+        df_final = ingest_incremental(
+            ARXIV_QUERY,
+            sql_engine,
+            MAX_RESULTS,
+            cache=http_cache,
+            deduplicator=deduplicator,
+            search_index=search_index,
+            similarity_index=similarity_index,
+        )
+        print(f"   {len(df_final)} new articles ingested.")
+    else:
+        clear_mongo_collection(MongoScientificArticle)
+
+        print(f"1. Fetching {MAX_RESULTS} articles from ArXiv for query: '{ARXIV_QUERY}'...")
+        df_arxiv = fetch_arxiv_data(ARXIV_QUERY, MAX_RESULTS, cache=http_cache)
+
+        with HtmlDownloader(cache=http_cache) as downloader:
+            df_arxiv = download_html_contents(df_arxiv, downloader)
+        df_arxiv = extract_texts(df_arxiv)
+
+        print("2. Loading DataFrame into MariaDB and MongoDB...")
+        df_final = load_data_into_dbs(
+            df_arxiv,
+            sql_engine,
+            search_index=search_index,
+            similarity_index=similarity_index,
+            deduplicator=deduplicator,
+        )
+    print(f"   HTTP cache: {http_cache.stats}")
 
-    print("2. Loading DataFrame into MariaDB and MongoDB...")
-    df_final = load_data_into_dbs(df_arxiv, sql_engine)
-    
     print("-" * 50)
-    
+
     SEARCH_TERM = "Open-vocabulary"
-    search_results = search_mongodb_articles(SEARCH_TERM)
-    
+    search_results: Sequence[Union[BM25Hit, SearchHit]]
+    if use_bm25:
+        search_results = search_local_articles(SEARCH_TERM)
+    else:
+        search_results = search_mongodb_articles(SEARCH_TERM).hits
+
     print(f"3. Search Results for '{SEARCH_TERM}': {len(search_results)} documents found.")
-    
+
     if search_results:
         for i, doc in enumerate(search_results):
             score = getattr(doc, 'score', 'N/A')
 
             print(f"Result {i+1} (Score: {score}):")
             print(f"Title: {doc.title}")
-            print(f"Author: {doc.author.full_name}")
-            print(f"Text snippet: {doc.text[:80]}...")
-            
+            print(f"Author: {doc.author.full_name if doc.author else ''}")
+            print(f"Text snippet: {(doc.text or '')[:80]}...")
+            related = similarity_index.similar_to(doc.sql_id, k=3)
+            print(f"Related: {[(r.sql_id, round(r.score, 3)) for r in related]}")
+
+    stats = get_search_cache().stats
+    print(f"   Search cache: hit ratio {stats.hit_ratio:.0%}, "
+          f"hit {stats.mean_hit_ms:.2f} ms, miss {stats.mean_miss_ms:.2f} ms")
+
+    print("-" * 50)
+    print("Stage latency:")
+    print(get_instrumentation().report())
+
     print("=" * 50)
 
 
 if __name__ == "__main__":
-    run_api_pipeline()
\ No newline at end of file
+    run_api_pipeline(
+        incremental="--incremental" in sys.argv, use_bm25="--bm25" in sys.argv
+    )
\ No newline at end of file
@@ -1,5 +1,17 @@
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    ForeignKey,
+    DateTime,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.orm import DeclarativeBase, relationship
 from mongoengine import Document, EmbeddedDocument, fields
 
@@ -27,15 +39,86 @@ class ScientificArticle(SQLBase):
     summary: str = Column(Text, nullable=False)
     file_path: str = Column(String(255), nullable=False)
     arxiv_id: Optional[str] = Column(String(50), unique=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
 
-    author_id: int = Column(Integer, ForeignKey("authors.id"), nullable=False)
+    author_id: int = Column(
+        Integer, ForeignKey("authors.id"), nullable=False, index=True
+    )
     author = relationship("Author", back_populates="articles")
 
     def __repr__(self) -> str:
         return f"<ScientificArticle {self.title}>"
 
 
+class ArticleOutbox(SQLBase):
+    __tablename__ = "article_outbox"
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    article_id: int = Column(
+        Integer, ForeignKey("scientific_articles.id"), nullable=False
+    )
+    payload: str = Column(
+        Text().with_variant(LONGTEXT(), "mysql", "mariadb"), nullable=False
+    )
+    attempts: int = Column(Integer, nullable=False, default=0)
+    last_error: Optional[str] = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    delivered_at = Column(DateTime, index=True)
+
+    def __repr__(self) -> str:
+        return f"<ArticleOutbox {self.article_id}, delivered={self.delivered_at}>"
+
+
+class ArticleSignature(SQLBase):
+    __tablename__ = "article_signatures"
+    article_id: int = Column(
+        Integer, ForeignKey("scientific_articles.id"), primary_key=True
+    )
+    signature: bytes = Column(LargeBinary, nullable=False)
+    duplicate_of: Optional[int] = Column(
+        Integer, ForeignKey("scientific_articles.id"), index=True
+    )
+    created_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<ArticleSignature {self.article_id}, duplicate_of={self.duplicate_of}>"
+
+
+class ArticleLSHBucket(SQLBase):
+    __tablename__ = "article_lsh_buckets"
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    bucket: int = Column(BigInteger, nullable=False, index=True)
+    article_id: int = Column(
+        Integer, ForeignKey("scientific_articles.id"), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<ArticleLSHBucket {self.bucket}, {self.article_id}>"
+
+
+class IngestCheckpoint(SQLBase):
+    __tablename__ = "ingest_checkpoints"
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    query: str = Column(String(255), nullable=False, unique=True)
+    latest_submitted = Column(DateTime)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<IngestCheckpoint {self.query}, {self.latest_submitted}>"
+
+
+class IngestedArticle(SQLBase):
+    __tablename__ = "ingested_articles"
+    __table_args__ = (UniqueConstraint("query", "arxiv_id"),)
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    query: str = Column(String(255), nullable=False)
+    arxiv_id: str = Column(String(50), nullable=False)
+    submitted = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<IngestedArticle {self.query}, {self.arxiv_id}>"
+
+
 class MongoAuthor(EmbeddedDocument):
     full_name = fields.StringField(required=True)
     title = fields.StringField()
@@ -57,4 +140,4 @@ class MongoScientificArticle(Document):
     summary = fields.StringField(required=True)
     arxiv_id = fields.StringField()
     text = fields.StringField(required=True)
-    author = fields.EmbeddedDocumentField(MongoAuthor)
\ No newline at end of file
+    author = fields.EmbeddedDocumentField(MongoAuthor)
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+import pandas as pd
+
+DEFAULT_EMAIL = "default_placeholder@company.com"
+
+Stage = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+@dataclass
+class DropDuplicates:
+    subset: Optional[Sequence[str]] = None
+    keep: str = "first"
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.drop_duplicates(subset=self.subset, keep=self.keep)
+
+
+@dataclass
+class ToNumeric:
+    column: str
+    downcast: Optional[str] = None
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        values = pd.to_numeric(df[self.column], errors="coerce", downcast=self.downcast)
+        return df.assign(**{self.column: values})
+
+
+@dataclass
+class ToDatetime:
+    """Parse `column` as dates; the format is inferred unless one is given."""
+
+    column: str
+    format: Optional[str] = None
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        values = pd.to_datetime(df[self.column], errors="coerce", format=self.format)
+        return df.assign(**{self.column: values})
+
+
+@dataclass
+class FillMissing:
+    column: str
+    default: object
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(**{self.column: df[self.column].fillna(self.default)})
+
+
+@dataclass
+class Cast:
+    column: str
+    dtype: str
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(**{self.column: df[self.column].astype(self.dtype)})
+
+
+@dataclass
+class FlagThreshold:
+    column: str
+    threshold: float
+    suffix: str = "_IS_HIGH_RISK"
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        flag = df[self.column] >= self.threshold
+        return df.assign(**{f"{self.column}{self.suffix}": flag})
+
+
+@dataclass
+class Pipeline:
+    """Ordered cleaning stages; the input frame is never modified.
+
+    Stages return new frames built with `assign`. With pandas copy-on-write
+    enabled, which applications set once at startup, that only copies the
+    columns a stage replaces.
+    """
+
+    stages: List[Stage] = field(default_factory=list)
+
+    def then(self, stage: Stage) -> "Pipeline":
+        return Pipeline(self.stages + [stage])
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        for stage in self.stages:
+            df = stage(df)
+        return df
+
+
+def users_pipeline(age_threshold: int = 60) -> Pipeline:
+    """The cleaning steps of the users assignment as one pipeline."""
+    return Pipeline(
+        [
+            DropDuplicates(),
+            ToNumeric("user_id"),
+            ToDatetime("birthdate"),
+            FillMissing("email", DEFAULT_EMAIL),
+            Cast("age", "float64"),
+            FlagThreshold("age", age_threshold),
+        ]
+    )
+
+
+def convert_age_to_float(data_frame: pd.DataFrame) -> pd.DataFrame:
+    """Cleaning function to convert the 'age' column to float type."""
+    return Pipeline([Cast("age", "float64")]).run(data_frame)
+
+
+def flag_records_by_threshold(
+    data_frame: pd.DataFrame, column: str, threshold: int
+) -> pd.DataFrame:
+    """Flags records where a column value is above the given threshold."""
+    return Pipeline([FlagThreshold(column, threshold)]).run(data_frame)
+
+
+def fill_missing_email(emails: pd.Series) -> pd.Series:
+    """Sets a default placeholder where the email is missing."""
+    return emails.fillna(DEFAULT_EMAIL)
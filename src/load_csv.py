@@ -1,16 +1,11 @@
 import pandas as pd
-from pathlibPath import Path
+
+from storage import csv_loader
 
 
 def load_csv(file_path: str) -> pd.DataFrame:
     """Load a CSV file into a Pandas DataFrame."""
-    csv_path = Path("data/users.csv")
-
-    if not csv_path.exists():
-        raise FileNotFoundError(f"The file at {file_path} does not exist.")
-
-    df = pd.read_csv(csv_path)
-    return df
+    return csv_loader.load_csv(file_path)
 
 
 if __name__ == "__main__":
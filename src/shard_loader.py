@@ -0,0 +1,192 @@
+import csv
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from src.document_processor import ValidationReport, records_frame, validate_documents
+from src.user_fields import coerce_ages
+from storage.columnar_cache import READERS
+from storage.streaming_readers import iter_json_array, iter_xml_records, load_yaml
+
+T = TypeVar("T")
+
+# The UserDataclass fields as Arrow columns.
+USER_SCHEMA = pa.schema(
+    [("name", pa.string()), ("age", pa.int64()), ("email", pa.string())]
+)
+
+
+# Format detection
+
+
+def detect_format(path: Union[str, Path]) -> Optional[str]:
+    """The shard's format from its suffix, or from its first byte if unknown.
+
+    Lets extension-less exports such as `users.part-0003` be loaded too.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in READERS:
+        return ".yaml" if suffix == ".yml" else suffix
+    with open(path, "rb") as f:
+        head = f.read(512).lstrip()
+    if not head:
+        return None
+    if head[:1] in (b"[", b"{"):
+        return ".json"
+    if head[:1] == b"<":
+        return ".xml"
+    if head[:1] == b"-" or b": " in head.split(b"\n", 1)[0]:
+        return ".yaml"
+    return ".csv"
+
+
+def find_shards(directory: Union[str, Path], pattern: str = "*") -> List[Path]:
+    """Non-empty files under `directory` matching `pattern`, in name order."""
+    return sorted(
+        path
+        for path in Path(directory).glob(pattern)
+        if path.is_file() and path.stat().st_size > 0
+    )
+
+
+# Per-shard parsing; these run inside the worker processes
+
+
+def _text_column(table: pa.Table, name: str) -> pa.Array:
+    if name not in table.column_names:
+        return pa.array([""] * table.num_rows, pa.string())
+    return table[name].cast(pa.string()).combine_chunks().fill_null("")
+
+
+def _age_column(table: pa.Table) -> pa.Array:
+    if "age" not in table.column_names:
+        return pa.array([0] * table.num_rows, pa.int64())
+    return pa.array(coerce_ages(table["age"].to_pandas()))
+
+
+def read_user_shard(path: Union[str, Path]) -> pa.Table:
+    """One shard as an Arrow table with the UserDataclass columns."""
+    path = Path(path)
+    table = READERS[detect_format(path) or ".csv"](path)
+    columns = {
+        "name": _text_column(table, "name"),
+        "age": _age_column(table),
+        "email": _text_column(table, "email"),
+    }
+    return pa.table(columns, schema=USER_SCHEMA)
+
+
+def _nested(row: Dict[str, str]) -> Dict[str, Any]:
+    # Flattened CSV exports name nested fields `address.city`; empty cells
+    # are missing values.
+    record: Dict[str, Any] = {}
+    for key, value in row.items():
+        target = record
+        *parents, leaf = key.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value if value != "" else None
+    return record
+
+
+def _iter_document_records(path: Path) -> Iterator[Any]:
+    fmt = detect_format(path)
+    if fmt == ".json":
+        yield from iter_json_array(path)
+    elif fmt == ".xml":
+        yield from iter_xml_records(path)
+    elif fmt == ".yaml":
+        data = load_yaml(path)
+        yield from data if isinstance(data, list) else [data]
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            yield from (_nested(row) for row in csv.DictReader(f))
+
+
+def read_document_shard(
+    path: Union[str, Path],
+) -> Tuple[pd.DataFrame, ValidationReport]:
+    """One shard's valid documents as a flattened frame, plus its errors."""
+    path = Path(path)
+    report = ValidationReport()
+    records = validate_documents(_iter_document_records(path), report, as_records=True)
+    frame = records_frame(list(records))
+    for error in report.errors:
+        error.source = str(path)
+    return frame, report
+
+
+# Parallel loading
+
+
+def map_shards(
+    read: Callable[[Path], T], paths: List[Path], workers: Optional[int] = None
+) -> List[Optional[T]]:
+    """`read` every shard, in a process pool when there is more than one.
+
+    Shards are submitted largest first so a big shard starts early instead of
+    running alone at the end. Results come back in `paths` order; a shard that
+    fails to parse is reported and its result is None.
+    """
+    workers = workers or os.cpu_count() or 1
+    results: List[Optional[T]] = [None] * len(paths)
+    order = sorted(range(len(paths)), key=lambda i: paths[i].stat().st_size)[::-1]
+    if workers <= 1 or len(paths) <= 1:
+        for index in order:
+            try:
+                results[index] = read(paths[index])
+            except Exception as e:
+                print(f"Skipping shard {paths[index]}: {e}")
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        futures: Dict[Future, int] = {
+            pool.submit(read, paths[index]): index for index in order
+        }
+        for future, index in futures.items():
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                print(f"Skipping shard {paths[index]}: {e}")
+    return results
+
+
+def load_user_shards(
+    directory: Union[str, Path], pattern: str = "*", workers: Optional[int] = None
+) -> pd.DataFrame:
+    """Every user shard under `directory` as one name/age/email DataFrame."""
+    tables = map_shards(read_user_shard, find_shards(directory, pattern), workers)
+    parsed = [table for table in tables if table is not None]
+    if not parsed:
+        return USER_SCHEMA.empty_table().to_pandas()
+    return pa.concat_tables(parsed).to_pandas()
+
+
+def load_document_shards(
+    directory: Union[str, Path],
+    pattern: str = "*",
+    report: Optional[ValidationReport] = None,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Every document shard under `directory`, validated, as one DataFrame.
+
+    Errors from all shards are merged into `report`; their `index` is the
+    position within the shard named by `source`.
+    """
+    report = report if report is not None else ValidationReport()
+    results = map_shards(read_document_shard, find_shards(directory, pattern), workers)
+    frames: List[pd.DataFrame] = []
+    for result in results:
+        if result is None:
+            continue
+        frame, shard_report = result
+        frames.append(frame)
+        report.merge(shard_report)
+    if not frames:
+        return records_frame([])
+    return pd.concat(frames, ignore_index=True)
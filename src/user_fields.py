@@ -0,0 +1,22 @@
+from typing import Any, Iterable, Type
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+
+def coerce_ages(values: Iterable[Any], dtype: Type[np.integer] = np.int64) -> NDArray:
+    """Ages as a `dtype` array; missing or malformed ages become 0.
+
+    Raises ValueError when an age does not fit `dtype`, instead of letting the
+    cast wrap it around.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values))
+    numbers = pd.to_numeric(series, errors="coerce").fillna(0)
+    limits = np.iinfo(dtype)
+    out_of_range = (numbers < limits.min) | (numbers > limits.max)
+    if out_of_range.any():
+        bad = numbers[out_of_range].tolist()[:5]
+        raise ValueError(f"Ages outside the {np.dtype(dtype).name} range: {bad}")
+    ages: NDArray = numbers.to_numpy(dtype=dtype)
+    return ages
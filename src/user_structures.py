@@ -1,15 +1,17 @@
-from typing import TypedDict, Callable, TypeVar, Any, List
+from typing import TypedDict, Callable, TypeVar, Any, Iterator, List, Mapping
 from collections import namedtuple
 from dataclasses import dataclass
 from pydantic import BaseModel
 import numpy as np
 from numpy.typing import NDArray
-import time
 import pandas as pd
-import json
-import yaml
 import os
-import xml.etree.ElementTree as ET
+
+from src.shard_loader import load_user_shards
+from storage.columnar_cache import get_columnar_cache
+from storage.csv_loader import load_csv
+from storage.streaming_readers import iter_json_array, iter_xml_records
+from usecases.instrumentation import get_instrumentation, timed
 
 # Directory of this file → src/
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -52,14 +54,12 @@ T = TypeVar("T")
 
 
 def measure_time(func: Callable[..., T]) -> Callable[..., T]:
-    def wrapper(*args: Any, **kwargs: Any) -> T:
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"{func.__name__} execution time: {end - start:.6f} seconds")
-        return result
+    """Record every call's duration under the function's name.
 
-    return wrapper
+    Timings go to the shared instrumentation histograms instead of being
+    printed per call; `get_instrumentation().report()` shows them.
+    """
+    return timed(func.__name__)(func)
 
 
 # scalar multiplication functions
@@ -75,11 +75,32 @@ def numpy_scalar_mult(data: NDArray[np.int64], scalar: int) -> NDArray[np.int64]
     return data * scalar
 
 
+# streaming readers
+
+
+def user_from_record(record: Mapping[str, Any]) -> UserDataclass:
+    """Build a user from a parsed record; missing fields become "" or 0."""
+    name, age, email = (record.get(key) for key in ("name", "age", "email"))
+    return UserDataclass(
+        name="" if pd.isna(name) else str(name),
+        age=int(age) if age is not None and pd.notna(age) and age != "" else 0,
+        email="" if pd.isna(email) else str(email),
+    )
+
+
+def iter_users_xml(file_path: str) -> Iterator[UserDataclass]:
+    for record in iter_xml_records(file_path, record_tag="user"):
+        yield user_from_record(record)
+
+
+def iter_users_json(file_path: str) -> Iterator[UserDataclass]:
+    for record in iter_json_array(file_path):
+        yield user_from_record(record)
+
+
 # CSV loading function
 def load_csv_to_dataframe(file_path: str) -> pd.DataFrame:
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"{file_path} does not exist")
-    return pd.read_csv(file_path)
+    return load_csv(file_path)
 
 
 # Main execution
@@ -110,47 +131,39 @@ def main() -> None:
 
     python_list_scalar_mult(py_list, scalar)
     numpy_scalar_mult(np_array, scalar)
+    print(get_instrumentation().report())
+
+    # Each source is parsed once into .cache/columnar and memory-mapped after.
+    cache = get_columnar_cache()
 
     # JSON loading
     print("\n--- LOADING JSON ---")
-    json_path = os.path.join(DATA_DIR, "users.json")
-    with open(json_path, "r", encoding="utf-8") as f:
-        json_data = json.load(f)
-        print(json_data)
+    json_data = cache.load_frame(os.path.join(DATA_DIR, "users.json"))
+    print(json_data.to_dict("records"))
 
     # YAML loading
     print("\n--- LOADING YAML ---")
-    yaml_path = os.path.join(DATA_DIR, "users.yaml")
-    with open(yaml_path, "r", encoding="utf-8") as f:
-        yaml_data = yaml.safe_load(f)
-        print(yaml_data)
+    yaml_data = cache.load_frame(os.path.join(DATA_DIR, "users.yaml"))
+    print(yaml_data.to_dict("records"))
 
     # XML loading
     print("\n--- LOADING XML ---")
-    xml_path = os.path.join(DATA_DIR, "users.xml")
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    users_xml: list[UserDataclass] = []
-
-    for user in root.findall("user"):
-        name_el = user.find("name")
-        age_el = user.find("age")
-        email_el = user.find("email")
-
-        name = name_el.text if name_el is not None and name_el.text else ""
-        age = int(age_el.text) if age_el is not None and age_el.text else 0
-        email = email_el.text if email_el is not None and email_el.text else ""
-
-        users_xml.append(UserDataclass(name=name, age=age, email=email))
+    xml_frame = cache.load_frame(os.path.join(DATA_DIR, "users.xml"))
+    users_xml: list[UserDataclass] = [
+        user_from_record(row) for row in xml_frame.to_dict("records")
+    ]
 
     print(users_xml)
 
     # CSV loading
     print("\n--- LOADING CSV INTO PANDAS ---")
-    csv_path = os.path.join(DATA_DIR, "users.csv")
-    df = load_csv_to_dataframe(csv_path)
+    df = cache.load_frame(os.path.join(DATA_DIR, "users.csv"))
     print(df)
+    print(f"Columnar cache: {cache.hits} hits, {cache.conversions} conversions")
+
+    # All four exports at once, one process per shard
+    print("\n--- LOADING ALL USER SHARDS ---")
+    print(load_user_shards(DATA_DIR, pattern="users.*"))
 
 
 if __name__ == "__main__":
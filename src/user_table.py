@@ -0,0 +1,279 @@
+from typing import Any, Iterable, Iterator, List, Mapping, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from numpy.typing import NDArray
+
+from src.user_fields import coerce_ages
+from src.user_structures import (
+    UserDataclass,
+    UserNamedTuple,
+    UserPydantic,
+    UserTypedDict,
+)
+
+Indexer = Union[NDArray[np.bool_], NDArray[np.int64], Sequence[int]]
+
+
+class OffsetStrings:
+    """Strings stored as one UTF-8 byte buffer plus an offsets array.
+
+    String i is data[offsets[i]:offsets[i + 1]], so a column costs its bytes
+    plus 8 bytes per row instead of a Python object (~50+ bytes) per row.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data: NDArray[np.uint8], offsets: NDArray[np.int64]) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Iterable[Any]) -> "OffsetStrings":
+        # Arrow's large_string layout is exactly this encoding; missing
+        # values become empty strings.
+        array = pa.array(values, type=pa.large_string()).fill_null("")
+        start = array.offset
+        offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)
+        offsets = offsets[start : start + len(array) + 1]
+        data = np.frombuffer(array.buffers()[2] or b"", dtype=np.uint8)
+        return cls(data, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:end].tobytes().decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes + self.offsets.nbytes)
+
+    def lengths(self) -> NDArray[np.int64]:
+        return np.diff(self.offsets)
+
+    def take(self, indices: NDArray[np.int64]) -> "OffsetStrings":
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Byte j of the new buffer comes from starts[row] + (j - offsets[row]).
+        shift = np.repeat(starts - offsets[:-1], lengths)
+        positions = np.arange(offsets[-1], dtype=np.int64) + shift
+        return OffsetStrings(self.data[positions], offsets)
+
+    def endswith(self, suffix: str, ignore_case: bool = True) -> NDArray[np.bool_]:
+        """Vectorized suffix test.
+
+        Compares one byte position at a time from the end, keeping only rows
+        that still match, so most rows are dropped after a byte or two.
+        """
+        wanted = suffix.encode("utf-8")
+        ends = self.offsets[1:]
+        rows = np.flatnonzero(self.lengths() >= len(wanted))
+        for back, byte in enumerate(reversed(wanted), start=1):
+            found = self.data[ends[rows] - back]
+            if ignore_case and ord("a") <= (byte | 0x20) <= ord("z"):
+                # Setting bit 0x20 lowercases ASCII letters and only letters
+                # can equal a lowercase letter after it.
+                found = found | np.uint8(0x20)
+                byte |= 0x20
+            rows = rows[found == byte]
+        mask = np.zeros(len(self), dtype=np.bool_)
+        mask[rows] = True
+        return mask
+
+    def to_list(self) -> List[str]:
+        array = pa.LargeStringArray.from_buffers(
+            len(self), pa.py_buffer(self.offsets), pa.py_buffer(self.data)
+        )
+        strings: List[str] = array.to_pylist()
+        return strings
+
+
+class InternedStrings:
+    """Strings stored as int32 codes into a list of distinct values.
+
+    Suits low-cardinality columns such as names, where a table of millions of
+    rows has a few thousand distinct values.
+    """
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, codes: NDArray[np.int32], values: List[str]) -> None:
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def from_strings(cls, values: Iterable[Any]) -> "InternedStrings":
+        encoded = pa.array(values, type=pa.string()).fill_null("").dictionary_encode()
+        codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+        return cls(codes, encoded.dictionary.to_pylist())
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[int(self.codes[index])]
+
+    @property
+    def nbytes(self) -> int:
+        distinct = sum(len(value.encode("utf-8")) + 8 for value in self.values)
+        return int(self.codes.nbytes + distinct)
+
+    def take(self, indices: NDArray[np.int64]) -> "InternedStrings":
+        return InternedStrings(self.codes[indices], self.values)
+
+    def isin(self, wanted: Iterable[str]) -> NDArray[np.bool_]:
+        lookup = {value: code for code, value in enumerate(self.values)}
+        codes = [lookup[value] for value in wanted if value in lookup]
+        return np.isin(self.codes, codes)
+
+    def to_list(self) -> List[str]:
+        values = np.array(self.values, dtype=object)
+        if not len(values):
+            return [""] * len(self)
+        strings: List[str] = values[self.codes].tolist()
+        return strings
+
+
+def _field(record: Any, name: str) -> Any:
+    if isinstance(record, Mapping):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+class UserRow:
+    """A lazy view of one table row; fields are decoded when read."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "UserTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return self._table.names[self._index]
+
+    @property
+    def age(self) -> int:
+        return int(self._table.ages[self._index])
+
+    @property
+    def email(self) -> str:
+        return self._table.emails[self._index]
+
+    def __repr__(self) -> str:
+        return f"UserRow(name={self.name!r}, age={self.age}, email={self.email!r})"
+
+
+class UserTable:
+    """Users as column arrays: interned names, int32 ages, offset-encoded emails.
+
+    Filters return boolean masks that `filter` applies to every column at once,
+    and rows are only materialised as objects on request.
+    """
+
+    __slots__ = ("names", "ages", "emails")
+
+    def __init__(
+        self, names: InternedStrings, ages: NDArray[np.int32], emails: OffsetStrings
+    ) -> None:
+        if not len(names) == len(ages) == len(emails):
+            raise ValueError("UserTable columns must have the same length")
+        self.names = names
+        self.ages = ages
+        self.emails = emails
+
+    @classmethod
+    def from_columns(
+        cls, names: Iterable[Any], ages: Iterable[Any], emails: Iterable[Any]
+    ) -> "UserTable":
+        return cls(
+            InternedStrings.from_strings(names),
+            coerce_ages(ages, np.int32),
+            OffsetStrings.from_strings(emails),
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "UserTable":
+        """Build from TypedDicts, named tuples, dataclasses or pydantic models."""
+        names: List[Any] = []
+        ages: List[Any] = []
+        emails: List[Any] = []
+        for record in records:
+            names.append(_field(record, "name"))
+            ages.append(_field(record, "age"))
+            emails.append(_field(record, "email"))
+        return cls.from_columns(names, ages, emails)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "UserTable":
+        return cls.from_columns(df["name"], df["age"], df["email"])
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def __getitem__(self, index: int) -> UserRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("UserTable index out of range")
+        return UserRow(self, index)
+
+    def __iter__(self) -> Iterator[UserRow]:
+        return (UserRow(self, index) for index in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        return self.names.nbytes + int(self.ages.nbytes) + self.emails.nbytes
+
+    def age_between(self, low: int, high: int) -> NDArray[np.bool_]:
+        """Mask of rows with low <= age <= high."""
+        return (self.ages >= low) & (self.ages <= high)
+
+    def email_domain(self, domain: str) -> NDArray[np.bool_]:
+        """Mask of rows whose email is at `domain`, ignoring case."""
+        return self.emails.endswith("@" + domain.lstrip("@"))
+
+    def filter(self, rows: Indexer) -> "UserTable":
+        indices = np.asarray(rows)
+        if indices.dtype == np.bool_:
+            indices = np.flatnonzero(indices)
+        indices = indices.astype(np.int64, copy=False)
+        return UserTable(
+            self.names.take(indices), self.ages[indices], self.emails.take(indices)
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "name": pd.Categorical.from_codes(self.names.codes, self.names.values),
+                "age": self.ages,
+                "email": pd.array(self.emails.to_list(), dtype="string"),
+            }
+        )
+
+    def _columns(self) -> Iterator[tuple]:
+        return zip(self.names.to_list(), self.ages.tolist(), self.emails.to_list())
+
+    def to_typed_dicts(self) -> List[UserTypedDict]:
+        return [
+            {"name": name, "age": age, "email": email}
+            for name, age, email in self._columns()
+        ]
+
+    def to_named_tuples(self) -> List[UserNamedTuple]:
+        return [UserNamedTuple(*row) for row in self._columns()]
+
+    def to_dataclasses(self) -> List[UserDataclass]:
+        return [UserDataclass(*row) for row in self._columns()]
+
+    def to_pydantic(self) -> List[UserPydantic]:
+        return [
+            UserPydantic(name=name, age=age, email=email)
+            for name, age, email in self._columns()
+        ]
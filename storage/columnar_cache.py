@@ -0,0 +1,160 @@
+import functools
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+from storage.local_store import CACHE_ROOT
+from storage.streaming_readers import iter_xml_records, load_yaml
+
+DEFAULT_COLUMNAR_CACHE_DIR = CACHE_ROOT / "columnar"
+
+# Part of every cache key; bump it when a reader's output changes so earlier
+# conversions are not reused.
+READER_VERSION = 2
+
+Reader = Callable[[Path], pa.Table]
+
+
+def _records_table(data: Any) -> pa.Table:
+    # A single mapping (e.g. a YAML document that is not a list) is one row.
+    records = data if isinstance(data, list) else [data]
+    return pa.Table.from_pylist(records)
+
+
+def _read_json(path: Path) -> pa.Table:
+    with open(path, "r", encoding="utf-8") as f:
+        return _records_table(json.load(f))
+
+
+def _read_yaml(path: Path) -> pa.Table:
+    return _records_table(load_yaml(path))
+
+
+def _read_xml(path: Path) -> pa.Table:
+    """Children of the root element are rows, their child elements columns.
+
+    XML carries no types, so every column stays a string column; text such as
+    "007" is kept as written and callers convert the columns they know.
+    """
+    columns: Dict[str, List[Optional[str]]] = {}
+    rows = 0
+    for record in iter_xml_records(path):
+        for tag, text in record.items():
+            if tag not in columns:
+                columns[tag] = [None] * rows
+            columns[tag].append(text)
+        rows += 1
+        for values in columns.values():
+            if len(values) < rows:
+                values.append(None)
+    return pa.table(
+        {name: pa.array(values, pa.string()) for name, values in columns.items()}
+    )
+
+
+def _read_csv(path: Path) -> pa.Table:
+    return pa_csv.read_csv(str(path))
+
+
+READERS: Dict[str, Reader] = {
+    ".json": _read_json,
+    ".yaml": _read_yaml,
+    ".yml": _read_yaml,
+    ".xml": _read_xml,
+    ".csv": _read_csv,
+}
+
+
+@dataclass
+class SourceStamp:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ColumnarCache:
+    """Source files converted once to Arrow IPC files and memory-mapped back.
+
+    A cached conversion is reused while the source's size and mtime match. When
+    only the mtime moved (a touch, a checkout) the content hash decides, so
+    unchanged files are not parsed again. Reloads map the Arrow file, so
+    columns are views over the page cache rather than copies.
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_COLUMNAR_CACHE_DIR):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.conversions = 0
+
+    def _paths(self, source: Path) -> Tuple[Path, Path]:
+        raw = f"{READER_VERSION}:{source}".encode("utf-8")
+        key = hashlib.sha256(raw).hexdigest()[:24]
+        stem = self.directory / f"{source.stem}-{key}"
+        return stem.with_suffix(".arrow"), stem.with_suffix(".json")
+
+    def _is_fresh(self, source: Path, stamp_path: Path) -> bool:
+        if not stamp_path.exists():
+            return False
+        stamp = SourceStamp(**json.loads(stamp_path.read_text(encoding="utf-8")))
+        stat = source.stat()
+        if stat.st_size != stamp.size:
+            return False
+        if stat.st_mtime_ns == stamp.mtime_ns:
+            return True
+        if _file_sha256(source) != stamp.sha256:
+            return False
+        stamp.mtime_ns = stat.st_mtime_ns
+        stamp_path.write_text(json.dumps(asdict(stamp)), encoding="utf-8")
+        return True
+
+    def _convert(self, source: Path, data_path: Path, stamp_path: Path) -> None:
+        reader = READERS.get(source.suffix.lower())
+        if reader is None:
+            raise ValueError(f"No columnar reader for {source.suffix} files")
+        stat = source.stat()
+        table = reader(source)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = data_path.with_suffix(f".{os.getpid()}.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, data_path)
+        stamp = SourceStamp(stat.st_size, stat.st_mtime_ns, _file_sha256(source))
+        stamp_path.write_text(json.dumps(asdict(stamp)), encoding="utf-8")
+
+    def load_table(self, source_path: Union[str, Path]) -> pa.Table:
+        """The source as an Arrow table, converting it first if needed."""
+        source = Path(source_path).resolve()
+        if not source.exists():
+            raise FileNotFoundError(f"The file at {source_path} does not exist.")
+        data_path, stamp_path = self._paths(source)
+        if data_path.exists() and self._is_fresh(source, stamp_path):
+            self.hits += 1
+        else:
+            self._convert(source, data_path, stamp_path)
+            self.conversions += 1
+        return pa.ipc.open_file(pa.memory_map(str(data_path))).read_all()
+
+    def load_frame(self, source_path: Union[str, Path]) -> pd.DataFrame:
+        """`load_table` as a DataFrame of Arrow-backed columns, without copying."""
+        return self.load_table(source_path).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+@functools.lru_cache(maxsize=None)
+def get_columnar_cache() -> ColumnarCache:
+    return ColumnarCache()
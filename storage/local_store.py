@@ -0,0 +1,41 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+# Caches and indexes keep their state in subdirectories of this one.
+CACHE_ROOT = Path(__file__).resolve().parent.parent / ".cache"
+
+
+def next_segment_path(directory: Path) -> Path:
+    """`directory/seg_NNNNNN`, numbered one past the highest existing segment."""
+    numbers = [0]
+    if directory.exists():
+        numbers += [int(p.name.split("_")[1]) for p in directory.glob("seg_*")]
+    return directory / f"seg_{max(numbers) + 1:06d}"
+
+
+def read_manifest(directory: Path) -> Optional[Any]:
+    """The parsed `manifest.json` in `directory`, or None before the first commit."""
+    path = directory / "manifest.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def manifest_stamp(directory: Path) -> Optional[Tuple[int, int]]:
+    """Changes whenever `write_manifest` replaces the manifest; None before it."""
+    try:
+        stat = os.stat(directory / "manifest.json")
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def write_manifest(directory: Path, manifest: Any) -> None:
+    """Atomically replace `directory/manifest.json`, so readers never see half."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "manifest.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    tmp.replace(path)
@@ -0,0 +1,153 @@
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    TypeVar,
+    Union,
+)
+
+import yaml
+
+T = TypeVar("T")
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = ",]" + _WHITESPACE
+
+
+class _ChunkedText:
+    """A read buffer over a text file that refills on demand."""
+
+    def __init__(self, f: TextIO, chunk_size: int) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> None:
+        # Read at least as much as is buffered, so an element spanning many
+        # chunks is re-decoded only a logarithmic number of times.
+        chunk = self.f.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        """The next non-whitespace character, or None at the end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return None
+            self.fill()
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            # A number cut by the chunk boundary ("0." of "0.84") still
+            # decodes, so only trust it once a delimiter follows.
+            if (
+                not self.eof
+                and isinstance(value, (int, float))
+                and (end == len(self.buffer) or self.buffer[end] not in _DELIMITERS)
+            ):
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(
+    file_path: Union[str, Path], chunk_size: int = 1 << 16
+) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Only the current element and one read chunk are held in memory. An empty
+    file counts as an empty array.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding="utf-8") as f:
+        text = _ChunkedText(f, chunk_size)
+        char = text.peek()
+        if char is None:
+            return
+        if char != "[":
+            raise ValueError(f"{file_path} does not contain a JSON array")
+        text.pos += 1
+        if text.peek() == "]":
+            return
+        while True:
+            if text.peek() is None:
+                raise ValueError(f"Unterminated JSON array in {file_path}")
+            yield text.decode(decoder)
+            char = text.peek()
+            if char == "]":
+                return
+            if char is None:
+                raise ValueError(f"Unterminated JSON array in {file_path}")
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in {file_path}, got {char!r}")
+            text.pos += 1
+
+
+def iter_xml_records(
+    file_path: Union[str, Path], record_tag: Optional[str] = None
+) -> Iterator[Dict[str, Optional[str]]]:
+    """Yield each child of the root element as a {child tag: text} mapping.
+
+    Finished records are cleared and detached from the root, so memory stays
+    flat however many records the file holds. `record_tag` skips other tags.
+    """
+    root: Optional[ET.Element] = None
+    depth = 0
+    for event, element in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        if record_tag is None or element.tag == record_tag:
+            yield {field.tag: field.text for field in element}
+        if root is not None:
+            root.clear()
+
+
+def load_yaml(file_path: Union[str, Path]) -> Any:
+    """Parse a whole YAML file, with libyaml's C loader when PyYAML has one.
+
+    YAML cannot be read a record at a time; the C loader is several times
+    faster than the pure-Python SafeLoader it falls back to.
+    """
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(file_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=loader)
+
+
+def batched(records: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group `records` into lists of `size`; the last batch may be shorter."""
+    batch: List[T] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
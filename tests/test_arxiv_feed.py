@@ -0,0 +1,99 @@
+import io
+from typing import Any, Dict, List, Tuple, cast
+
+import requests
+
+from usecases.arxiv_feed import ARTICLE_COLUMNS, iter_arxiv_pages, iter_feed_entries
+
+
+def feed(*arxiv_ids: str) -> bytes:
+    entries = "".join(
+        f"<entry><id>http://arxiv.org/abs/{arxiv_id}</id>"
+        f"<title> Paper {arxiv_id} </title><summary>About {arxiv_id}</summary>"
+        f"<published>2024-01-01T00:00:00Z</published>"
+        f"<author><name>Ada Lovelace</name></author></entry>"
+        for arxiv_id in arxiv_ids
+    )
+    return (
+        '<feed xmlns="http://www.w3.org/2005/Atom"><title>results</title>'
+        f"{entries}</feed>"
+    ).encode("utf-8")
+
+
+class FeedResponse:
+    def __init__(self, body: bytes) -> None:
+        self.raw = io.BytesIO(body)
+
+    def __enter__(self) -> "FeedResponse":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FeedSession:
+    """Serves `total` entries, slicing them by the start/max_results params."""
+
+    def __init__(self, total: int) -> None:
+        self.ids = [f"2401.{i:05d}" for i in range(total)]
+        self.requests: List[Tuple[int, int]] = []
+        self.closed = False
+
+    def get(self, url: str, params: Dict[str, Any], stream: bool) -> FeedResponse:
+        start, size = int(params["start"]), int(params["max_results"])
+        self.requests.append((start, size))
+        return FeedResponse(feed(*self.ids[start : start + size]))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def pages(session: FeedSession, **options: Any) -> List[List[str]]:
+    frames = iter_arxiv_pages(
+        "quantum", page_delay=0, session=cast(requests.Session, session), **options
+    )
+    return [frame["arxiv_id"].tolist() for frame in frames]
+
+
+def test_feed_entries_become_rows() -> None:
+    rows = list(iter_feed_entries(io.BytesIO(feed("2401.00001", "2401.00002"))))
+
+    assert [row["arxiv_id"] for row in rows] == ["2401.00001", "2401.00002"]
+    assert rows[0]["title"] == "Paper 2401.00001"
+    assert rows[0]["author_full_name"] == "Ada Lovelace"
+    assert rows[0]["file_path"] == "arxiv_pdf/2401.00001.pdf"
+    assert list(rows[0]) == ARTICLE_COLUMNS
+
+
+def test_pages_until_a_short_page() -> None:
+    session = FeedSession(total=5)
+
+    result = pages(session, page_size=2)
+
+    assert [len(page) for page in result] == [2, 2, 1]
+    assert sum(result, []) == session.ids
+    assert session.requests == [(0, 2), (2, 2), (4, 2)]
+    assert not session.closed
+
+
+def test_max_results_shrinks_the_last_page() -> None:
+    session = FeedSession(total=10)
+
+    result = pages(session, page_size=2, max_results=3)
+
+    assert sum(result, []) == session.ids[:3]
+    assert session.requests == [(0, 2), (2, 1)]
+
+
+def test_full_last_page_costs_one_empty_request() -> None:
+    session = FeedSession(total=4)
+
+    assert [len(page) for page in pages(session, page_size=2)] == [2, 2]
+    assert session.requests == [(0, 2), (2, 2), (4, 2)]
+
+
+def test_empty_result_set_yields_no_frames() -> None:
+    assert pages(FeedSession(total=0)) == []
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pandas as pd
+
+from usecases.bm25_index import BM25Index
+
+
+def articles(*titles: str, first_id: int = 1) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sql_article_id": range(first_id, first_id + len(titles)),
+            "title": list(titles),
+            "summary": ["A summary"] * len(titles),
+            "text": ["Some extracted text"] * len(titles),
+            "author_full_name": ["Ada Lovelace"] * len(titles),
+        }
+    )
+
+
+def test_appends_by_another_instance_are_searched(tmp_path: Path) -> None:
+    reader = BM25Index(tmp_path)
+    assert reader.search("quantum") == []
+
+    BM25Index(tmp_path).add_articles(articles("Quantum circuits"))
+
+    assert [hit.sql_id for hit in reader.search("quantum")] == [1]
+
+
+def test_compaction_keeps_segments_another_index_holds(tmp_path: Path) -> None:
+    writer = BM25Index(tmp_path)
+    writer.add_articles(articles("Quantum circuits"))
+    writer.add_articles(articles("Quantum annealing", first_id=2))
+    reader = BM25Index(tmp_path)
+    held = [segment.path for segment in reader.segments]
+
+    writer.compact()
+
+    assert all(path.exists() for path in held)
+    hits = reader.search("annealing")
+    assert [hit.sql_id for hit in hits] == [2]
+    assert hits[0].title == "Quantum annealing"
+
+    writer.compact()  # nothing left to merge, but the retired segments go
+
+    assert not any(path.exists() for path in held)
+    assert sorted(hit.sql_id for hit in reader.search("quantum")) == [1, 2]
@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Set
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.article_models import IngestedArticle
+from usecases import checkpoint
+from usecases.arxiv_feed import rows_to_frame
+from usecases.checkpoint import get_high_water_mark, ingest_incremental
+from usecases.downloader import HtmlDownloader
+from usecases.extraction import TextExtractor
+from usecases.mongo_loader import MongoWriteReport
+
+QUERY = "quantum"
+
+
+def page(*days: int) -> pd.DataFrame:
+    """One feed page, newest first; entry ids are derived from the day."""
+    return rows_to_frame(
+        [
+            {
+                "title": f"Paper {day}",
+                "arxiv_id": f"2401.{day:05d}",
+                "author_full_name": "Ada Lovelace",
+                "published": f"2024-01-{day:02d}T12:00:00Z",
+            }
+            for day in days
+        ]
+    )
+
+
+class Feed:
+    """Stands in for the arXiv API and the load stages of one run."""
+
+    def __init__(self, *pages: pd.DataFrame) -> None:
+        self.pages = pages
+        self.pages_read = 0
+        self.loaded: List[str] = []
+        self.sql_failures: Set[str] = set()
+        self.mongo_failures: Set[str] = set()
+
+    def iter_pages(self, *args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        for frame in self.pages:
+            self.pages_read += 1
+            yield frame
+
+    def load(
+        self,
+        batch: pd.DataFrame,
+        sql_engine: Engine,
+        mongo_report: Optional[MongoWriteReport] = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        batch = batch.copy()
+        ids = [int(a.split(".")[1]) for a in batch["arxiv_id"]]
+        batch["sql_article_id"] = [
+            -1 if a in self.sql_failures else i for a, i in zip(batch["arxiv_id"], ids)
+        ]
+        for arxiv_id, sql_id in zip(batch["arxiv_id"], ids):
+            if arxiv_id in self.mongo_failures and mongo_report is not None:
+                mongo_report.failures.append({"sql_id": sql_id, "error": "down"})
+        self.loaded.extend(batch["arxiv_id"])
+        return batch
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def run(engine: Engine, feed: Feed, monkeypatch: pytest.MonkeyPatch) -> pd.DataFrame:
+    monkeypatch.setattr(checkpoint, "iter_arxiv_pages", feed.iter_pages)
+    monkeypatch.setattr(checkpoint, "load_data_into_dbs", feed.load)
+    monkeypatch.setattr(
+        checkpoint, "download_html_contents", lambda df, _: df.assign(html_content="")
+    )
+    monkeypatch.setattr(checkpoint, "extract_texts", lambda df, _: df.assign(text=""))
+    with HtmlDownloader() as downloader, TextExtractor() as extractor:
+        return ingest_incremental(
+            QUERY, engine, batch_size=2, downloader=downloader, extractor=extractor
+        )
+
+
+def state(engine: Engine) -> Any:
+    with Session(engine) as session:
+        recorded = [row.arxiv_id for row in session.query(IngestedArticle)]
+        return sorted(recorded), get_high_water_mark(session, QUERY)
+
+
+def test_failed_rows_hold_the_mark_and_are_retried(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = Feed(page(9, 8, 7), page(6, 5))
+    first.sql_failures = {"2401.00008"}
+    first.mongo_failures = {"2401.00005"}
+
+    loaded = run(engine, first, monkeypatch)
+
+    assert sorted(loaded["arxiv_id"]) == ["2401.00006", "2401.00007", "2401.00009"]
+    assert state(engine) == (["2401.00006", "2401.00007", "2401.00009"], None)
+
+    second = Feed(page(9, 8, 7), page(6, 5))
+    run(engine, second, monkeypatch)
+
+    assert second.loaded == ["2401.00008", "2401.00005"]
+    recorded, mark = state(engine)
+    assert len(recorded) == 5
+    assert mark == datetime(2024, 1, 9, 12, 0)
+
+
+def test_paging_stops_at_the_high_water_mark(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    run(engine, Feed(page(9, 8), page(7)), monkeypatch)
+
+    newer = Feed(page(11, 10), page(9, 8), page(7))
+    loaded = run(engine, newer, monkeypatch)
+
+    assert list(loaded["arxiv_id"]) == ["2401.00011", "2401.00010"]
+    assert newer.pages_read == 2
+    assert state(engine)[1] == datetime(2024, 1, 11, 12, 0)
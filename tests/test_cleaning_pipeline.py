@@ -0,0 +1,31 @@
+import pandas as pd
+
+from src.cleaning_pipeline import ToDatetime, users_pipeline
+
+
+def test_to_datetime_infers_the_format_unless_given() -> None:
+    df = pd.DataFrame({"birthdate": ["03/14/1990", "12/01/1985"]})
+
+    inferred = ToDatetime("birthdate")(df)["birthdate"]
+    explicit = ToDatetime("birthdate", format="%Y-%m-%d")(df)["birthdate"]
+
+    assert inferred.tolist() == [pd.Timestamp(1990, 3, 14), pd.Timestamp(1985, 12, 1)]
+    assert explicit.isna().all()
+
+
+def test_users_pipeline_leaves_its_input_unchanged() -> None:
+    df = pd.DataFrame(
+        {
+            "user_id": ["1", "2", "2"],
+            "age": [30, 65, 65],
+            "email": ["a@example.com", None, None],
+            "birthdate": ["1994-01-02", "1959-05-06", "1959-05-06"],
+        }
+    )
+    before = df.copy()
+
+    cleaned = users_pipeline().run(df)
+
+    pd.testing.assert_frame_equal(df, before)
+    assert cleaned["age_IS_HIGH_RISK"].tolist() == [False, True]
+    assert cleaned["email"].notna().all()
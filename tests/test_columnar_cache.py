@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from src.shard_loader import read_user_shard
+from storage.columnar_cache import ColumnarCache
+
+USERS_XML = """<users>
+  <user><name>Ada</name><age>36</age><email>ada@example.com</email><id>007</id></user>
+  <user><name>Bob</name><email>bob@example.com</email><id>042</id></user>
+</users>
+"""
+
+
+def test_xml_values_stay_as_written(tmp_path: Path) -> None:
+    source = tmp_path / "users.xml"
+    source.write_text(USERS_XML, encoding="utf-8")
+
+    table = ColumnarCache(tmp_path / "cache").load_table(source)
+
+    assert table["id"].to_pylist() == ["007", "042"]
+    assert table["age"].to_pylist() == ["36", None]
+
+
+def test_user_shards_convert_xml_ages(tmp_path: Path) -> None:
+    source = tmp_path / "users.xml"
+    source.write_text(USERS_XML, encoding="utf-8")
+
+    assert read_user_shard(source)["age"].to_pylist() == [36, 0]
@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+import pytest
+
+from storage import csv_loader
+from storage.csv_loader import (
+    CsvSchema,
+    cached_schema,
+    infer_schema,
+    iter_csv,
+    load_csv,
+)
+
+
+def write_csv(path: Path, *rows: str) -> Path:
+    path.write_text("\n".join(("id,score,joined,team,name",) + rows) + "\n")
+    return path
+
+
+ROWS = [
+    f"{i},{i / 4},2024-01-{i % 28 + 1:02d},{'ab'[i % 2]},user{i}" for i in range(40)
+]
+
+
+def test_infer_schema_types_each_column(tmp_path: Path) -> None:
+    schema = infer_schema(write_csv(tmp_path / "users.csv", *ROWS))
+
+    assert schema.dtypes == {
+        "id": "int64",
+        "score": "float64",
+        "team": "category",
+        "name": "string",
+    }
+    assert schema.parse_dates == ["joined"]
+    with pytest.raises(KeyError):
+        schema.select(["id", "email"])
+
+
+def test_schema_cache_is_invalidated_when_the_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inferred: List[Path] = []
+    real_infer = csv_loader.infer_schema
+
+    def counting_infer(path: Path, sample_rows: int = 10_000) -> CsvSchema:
+        inferred.append(path)
+        return real_infer(path, sample_rows)
+
+    monkeypatch.setattr(csv_loader, "infer_schema", counting_infer)
+    path = write_csv(tmp_path / "users.csv", *ROWS)
+    cache_dir = tmp_path / "schemas"
+
+    first = cached_schema(path, cache_dir=cache_dir)
+    assert cached_schema(path, cache_dir=cache_dir) == first
+    assert len(inferred) == 1
+
+    write_csv(path, "1,x,2024-01-01,a,user1")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    changed = cached_schema(path, cache_dir=cache_dir)
+
+    assert len(inferred) == 2
+    assert changed.dtypes["score"] == "string"
+    assert cached_schema(path, sample_rows=5, cache_dir=cache_dir) == changed
+    assert len(inferred) == 3  # the sample size is part of the key
+
+
+def test_integer_gap_after_the_sample_is_retried_as_nullable(tmp_path: Path) -> None:
+    path = write_csv(tmp_path / "users.csv", *ROWS, ",9.5,2024-02-01,a,late")
+    schema = infer_schema(path, sample_rows=10)
+    assert schema.dtypes["id"] == "int64"
+
+    df = load_csv(path, schema=schema)
+
+    assert str(df["id"].dtype) == "Int64"
+    assert df["id"].isna().tolist() == [False] * 40 + [True]
+    assert df["id"].iloc[39] == 39
+
+
+def test_iter_csv_reads_integers_as_nullable_in_every_chunk(tmp_path: Path) -> None:
+    path = write_csv(tmp_path / "users.csv", *ROWS, ",9.5,2024-02-01,a,late")
+    schema = infer_schema(path, sample_rows=10)
+
+    chunks = list(iter_csv(path, chunksize=16, columns=["id", "team"], schema=schema))
+
+    assert [len(chunk) for chunk in chunks] == [16, 16, 9]
+    assert all(str(chunk["id"].dtype) == "Int64" for chunk in chunks)
+    combined = pd.concat(chunks, ignore_index=True)
+    assert list(combined.columns) == ["id", "team"]
+    assert combined["id"].isna().sum() == 1
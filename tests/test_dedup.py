@@ -0,0 +1,46 @@
+from typing import Iterator, Optional
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from models.article_models import SQLBase
+from usecases.dedup import MinHashDeduplicator
+
+TEXT = "quantum circuit learning with parameterised gates on noisy hardware"
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    engine = create_engine("sqlite://")
+    SQLBase.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def articles(*texts: Optional[str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sql_article_id": range(1, len(texts) + 1),
+            "title": [None] * len(texts),
+            "summary": [None] * len(texts),
+            "text": list(texts),
+        }
+    )
+
+
+def test_identical_texts_are_duplicates(session: Session) -> None:
+    marked = MinHashDeduplicator().mark_duplicates(session, articles(TEXT, TEXT))
+
+    assert marked["duplicate_of"].tolist() == [-1, 1]
+
+
+def test_articles_without_text_are_not_duplicates(session: Session) -> None:
+    deduplicator = MinHashDeduplicator()
+    deduplicator.mark_duplicates(session, articles("", " "))
+
+    marked = deduplicator.mark_duplicates(session, articles("", " ", None, "..."))
+
+    assert marked["duplicate_of"].tolist() == [-1, -1, -1, -1]
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from src.document_processor import (
+    Document,
+    ValidationReport,
+    load_documents,
+    validate_batch,
+)
+
+
+def document(id: int, **fields: Any) -> Dict[str, Any]:
+    record = {"id": id, "name": "Ada", "age": 36, "city": "London"}
+    record["email"] = f"user{id}@example.com"
+    record.update(fields)
+    return record
+
+
+def test_batches_keep_valid_items_in_order_and_report_the_rest() -> None:
+    items = [document(1), document(2, age="old"), document(3)]
+
+    valid, report = validate_batch(items, start=10)
+
+    assert [doc.id for doc in valid] == [1, 3]
+    assert (report.valid, report.invalid) == (2, 1)
+    assert (report.errors[0].index, report.errors[0].id) == (11, 2)
+    assert report.errors[0].errors[0]["loc"] == ("age",)
+
+
+def test_documents_that_are_already_models_stay_valid() -> None:
+    existing = Document(**document(1))
+
+    valid, report = validate_batch([existing, document(2)])
+
+    assert valid[0] is existing
+    assert [doc.id for doc in valid] == [1, 2]
+    assert (report.valid, report.invalid) == (2, 0)
+
+
+def test_records_are_validated_as_dicts() -> None:
+    valid, report = validate_batch(
+        [document(1, address={"city": "Paris"}), {"id": 2}], as_records=True
+    )
+
+    assert valid == [document(1, address={"city": "Paris"})]
+    assert report.invalid == 1
+
+
+def test_load_documents_without_a_report_prints_nothing(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = tmp_path / "documents.json"
+    path.write_text(json.dumps([document(1), {"id": 2}]), encoding="utf-8")
+
+    documents = load_documents(str(path))
+    report = ValidationReport()
+    load_documents(str(path), report)
+
+    assert [doc.id for doc in documents] == [1]
+    assert report.invalid == 1
+    assert capsys.readouterr().out == ""
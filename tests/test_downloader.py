@@ -0,0 +1,124 @@
+from typing import Any, Iterator, List, Tuple, Union, cast
+
+import pytest
+import requests
+
+from usecases import downloader
+from usecases.downloader import HostLimiter, HtmlDownloader, TokenBucket
+
+Reply = Union[int, Exception]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ScriptedSession:
+    """Answers GETs with the next scripted status code or exception."""
+
+    def __init__(self, *replies: Reply) -> None:
+        self.replies = list(replies)
+        self.urls: List[str] = []
+
+    def get(self, url: str, timeout: float) -> requests.Response:
+        self.urls.append(url)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        response = requests.Response()
+        response.status_code = reply
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = f"<html>{url}</html>".encode("utf-8")
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeClock]:
+    fake = FakeClock()
+    monkeypatch.setattr(downloader.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(downloader.time, "sleep", fake.sleep)
+    yield fake
+
+
+def scripted(*replies: Reply, **options: Any) -> Tuple[HtmlDownloader, ScriptedSession]:
+    html = HtmlDownloader(
+        rate_per_second=1000.0, url_template="http://stub/{arxiv_id}", **options
+    )
+    session = ScriptedSession(*replies)
+    html.session = cast(requests.Session, session)
+    return html, session
+
+
+def test_transient_failures_are_retried_with_backoff(clock: FakeClock) -> None:
+    html, _ = scripted(503, requests.ConnectionError("reset"), 200, backoff_factor=0.5)
+
+    assert html.fetch("http://stub/1") == "<html>http://stub/1</html>"
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_retries_stop_after_max_retries(clock: FakeClock) -> None:
+    html, session = scripted(*[requests.Timeout("slow")] * 4, max_retries=2)
+
+    with pytest.raises(requests.Timeout):
+        html.fetch("http://stub/1")
+    assert len(session.urls) == 3
+
+
+@pytest.mark.parametrize("reply", [404, requests.exceptions.InvalidURL("bad")])
+def test_permanent_failures_are_not_retried(clock: FakeClock, reply: Reply) -> None:
+    html, session = scripted(reply, 200)
+
+    page = html.download_one("1")
+
+    assert page.startswith("<html><body>Error fetching content:")
+    assert len(session.urls) == 1
+
+
+def test_download_all_keeps_input_order(clock: FakeClock) -> None:
+    html, _ = scripted(200, 200, max_workers=1)
+
+    pages = html.download_all(["a", "", "b"])
+
+    assert pages == [
+        "<html>http://stub/a</html>",
+        "<html><body>No ArXiv ID</body></html>",
+        "<html>http://stub/b</html>",
+    ]
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst(clock: FakeClock) -> None:
+    bucket = TokenBucket(rate=2.0, capacity=2.0)
+
+    for _ in range(4):
+        bucket.acquire()
+
+    assert clock.sleeps == [0.5, 0.5]
+    assert clock.now == 101.0
+
+
+def test_token_bucket_rejects_non_positive_rates() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_host_limiter_caps_each_host_separately() -> None:
+    hosts = HostLimiter(per_host=1)
+    first = hosts.for_url("https://arxiv.org/abs/1")
+
+    assert hosts.for_url("https://arxiv.org/abs/2") is first
+    assert hosts.for_url("https://example.org/") is not first
+    assert first.acquire(blocking=False)
+    assert not first.acquire(blocking=False)
@@ -0,0 +1,131 @@
+import io
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, cast
+
+import pytest
+import requests
+
+from usecases import http_cache
+from usecases.http_cache import HttpCache
+
+BODY_SIZE = 10
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+class Response:
+    def __init__(self, status_code: int, body: bytes, etag: str) -> None:
+        self.status_code = status_code
+        self.raw = io.BytesIO(body)
+        self.encoding = "utf-8"
+        self.headers = {"ETag": etag}
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class Origin:
+    """A fake server: fixed-size bodies per URL, 304 when the ETag matches."""
+
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, str]] = []
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool,
+        timeout: Optional[float],
+    ) -> Response:
+        self.requests.append(headers)
+        etag = f'"{url}"'
+        if headers.get("If-None-Match") == etag:
+            return Response(304, b"", etag)
+        return Response(200, url.encode("utf-8").ljust(BODY_SIZE, b"."), etag)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Iterator[Clock]:
+    fake = Clock()
+    monkeypatch.setattr(http_cache.time, "time", fake.time)
+    yield fake
+
+
+def make_cache(tmp_path: Path, max_bytes: int) -> HttpCache:
+    return HttpCache(tmp_path, max_bytes=max_bytes, max_age=60.0)
+
+
+def fetch(cache: HttpCache, origin: Origin, url: str) -> str:
+    return cache.fetch_text(url, session=cast(requests.Session, origin))
+
+
+def cached_urls(cache: HttpCache) -> List[str]:
+    return sorted(
+        url for url in "abc" if cache._body_path(cache.make_key(url)).exists()
+    )
+
+
+def test_fresh_entries_are_served_without_a_request(
+    tmp_path: Path, clock: Clock
+) -> None:
+    cache, origin = make_cache(tmp_path, 100), Origin()
+
+    assert fetch(cache, origin, "a") == "a........."
+    assert fetch(cache, origin, "a") == "a........."
+
+    assert len(origin.requests) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_stale_entries_are_revalidated(tmp_path: Path, clock: Clock) -> None:
+    cache, origin = make_cache(tmp_path, 100), Origin()
+    fetch(cache, origin, "a")
+    clock.now += 120
+
+    assert fetch(cache, origin, "a") == "a........."
+
+    assert origin.requests[-1] == {"If-None-Match": '"a"'}
+    assert cache.stats.revalidated == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path, clock: Clock) -> None:
+    cache, origin = make_cache(tmp_path, 2 * BODY_SIZE), Origin()
+    fetch(cache, origin, "a")
+    fetch(cache, origin, "b")
+    fetch(cache, origin, "a")  # a is now more recent than b
+
+    fetch(cache, origin, "c")
+
+    assert cached_urls(cache) == ["a", "c"]
+    assert cache.stats.evictions == 1
+    assert cache.total_bytes() == 2 * BODY_SIZE
+
+
+def test_open_bodies_are_pinned_against_eviction(tmp_path: Path, clock: Clock) -> None:
+    cache, origin = make_cache(tmp_path, BODY_SIZE), Origin()
+    session = cast(requests.Session, origin)
+
+    with cache.open_fetched("a", session=session) as body:
+        fetch(cache, origin, "b")
+        fetch(cache, origin, "c")
+        assert body.read() == b"a........."
+        assert "a" in cached_urls(cache)
+
+    cache.evict()
+
+    assert cached_urls(cache) == ["c"]
+    assert cache.total_bytes() == BODY_SIZE
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.engine import Engine
+
+from db_project.orm_models import Base, User
+from models.article_models import SQLBase
+from usecases.indexes import (
+    HotQuery,
+    article_hot_queries,
+    check_sql_plans,
+    explain_sql,
+)
+
+# users.age has no index, so this always plans a full scan.
+SCANNING = [HotQuery("users by age", select(User.id).where(User.age == 30))]
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {"name": f"user{i}", "email": f"user{i}@example.com", "age": 30}
+                for i in range(5)
+            ],
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_scans_are_reported(engine: Engine) -> None:
+    problems = check_sql_plans(engine, SCANNING)
+
+    assert len(problems) == 1
+    assert problems[0].startswith("users by age: SCAN users")
+
+
+def test_tables_below_min_rows_are_skipped(engine: Engine) -> None:
+    assert check_sql_plans(engine, SCANNING, min_rows=6) == []
+    assert len(check_sql_plans(engine, SCANNING, min_rows=5)) == 1
+
+
+def test_article_hot_queries_use_their_indexes() -> None:
+    engine = create_engine("sqlite://")
+    SQLBase.metadata.create_all(bind=engine)
+
+    assert check_sql_plans(engine, article_hot_queries()) == []
+    plans = {
+        query.name: " ".join(explain_sql(engine, query.statement))
+        for query in article_hot_queries()
+    }
+    assert "ix_scientific_articles_author_id" in plans["articles by author"]
+    assert "ix_scientific_articles_created_at" in plans["recent articles"]
+    assert "ix_scientific_articles_created_at" in plans["articles since"]
+    engine.dispose()
+
+
+def test_articles_since_cutoff_follows_the_check_time() -> None:
+    now = datetime(2024, 5, 2, 12, 0)
+    statement = article_hot_queries(now)[2].statement
+
+    params = statement.compile().params
+    assert list(params.values()) == [now - timedelta(days=1)]
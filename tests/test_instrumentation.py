@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from usecases.instrumentation import (
+    Instrumentation,
+    LatencyHistogram,
+    _bucket,
+    _bucket_midpoint,
+)
+
+
+def histogram(*values_ns: int) -> LatencyHistogram:
+    latency = LatencyHistogram()
+    for value in values_ns:
+        latency.record(value)
+    return latency
+
+
+def test_small_values_get_exact_buckets() -> None:
+    assert [_bucket(value) for value in range(16)] == list(range(16))
+    assert _bucket(-5) == 0
+    assert _bucket(16) == _bucket(17) == 16
+    assert _bucket(18) == 17
+
+
+def test_buckets_stay_within_one_sixteenth_of_their_values() -> None:
+    previous = 0
+    for value in list(range(1, 5000)) + [10**6, 10**9 + 7, 3_600 * 10**9]:
+        index = _bucket(value)
+        assert index >= previous
+        previous = index
+        assert abs(_bucket_midpoint(index) - value) <= value / 16
+
+
+def test_percentiles_on_small_counts_stay_within_min_and_max() -> None:
+    assert histogram().percentile(99) == 0.0
+    assert histogram(1234).percentile(99) == 1234
+    assert histogram(1234).percentile(1) == 1234
+
+    latency = histogram(100, 200, 300, 400, 10_000)
+    assert latency.percentile(99) == pytest.approx(10_000, rel=1 / 16)
+    assert latency.percentile(99) <= latency.max_ns
+    assert latency.percentile(0) == pytest.approx(100, rel=1 / 16)
+
+
+def test_merge_matches_recording_everything_in_one() -> None:
+    left, right = histogram(50, 5000), histogram(7, 90_000, 90_001)
+    empty = LatencyHistogram()
+
+    empty.merge(right)
+    left.merge(right)
+
+    assert left == histogram(50, 5000, 7, 90_000, 90_001)
+    assert (empty.min_ns, empty.max_ns, empty.count) == (7, 90_001, 3)
+
+
+def test_spans_and_timed_calls_are_recorded() -> None:
+    instrumentation = Instrumentation()
+
+    @instrumentation.timed()
+    def parse(text: str) -> int:
+        if not text:
+            raise ValueError("empty")
+        return len(text)
+
+    with instrumentation.span("load") as span:
+        assert parse("abc") == 3
+    with pytest.raises(ValueError):
+        parse("")
+
+    snapshot = instrumentation.snapshot()
+    assert span.elapsed_ns > 0
+    assert snapshot["load"]["count"] == 1
+    assert parse.__name__ == "parse"
+    assert snapshot[parse.__qualname__]["count"] == 2  # the failed call too
+
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {}
+
+
+def test_export_json_writes_the_snapshot(tmp_path: Path) -> None:
+    instrumentation = Instrumentation()
+    instrumentation.record("fetch", 2_000_000, allocated_bytes=64)
+    instrumentation.record("fetch", 4_000_000)
+    path = tmp_path / "spans.json"
+
+    instrumentation.export_json(path)
+
+    exported = json.loads(path.read_text(encoding="utf-8"))
+    assert exported == instrumentation.snapshot()
+    assert exported["fetch"]["count"] == 2
+    assert exported["fetch"]["total_ms"] == 6.0
+    assert exported["fetch"]["max_allocated_bytes"] == 64
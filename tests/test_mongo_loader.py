@@ -0,0 +1,62 @@
+from typing import Iterator
+
+import mongoengine
+import mongomock
+import pandas as pd
+import pytest
+
+from models.article_models import MongoScientificArticle
+from usecases.mongo_loader import bulk_write_articles
+
+
+@pytest.fixture(autouse=True)
+def mongo() -> Iterator[None]:
+    mongoengine.disconnect(alias="default")
+    mongoengine.connect(
+        db="test",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        alias="default",
+    )
+    # mongomock keeps data per host across clients; start every test empty.
+    MongoScientificArticle.drop_collection()
+    yield
+    mongoengine.disconnect(alias="default")
+
+
+def loaded_articles(*sql_ids: int, title: str = "A title") -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sql_article_id": list(sql_ids),
+            "title": [title] * len(sql_ids),
+            "summary": ["A summary"] * len(sql_ids),
+            "arxiv_id": [f"2401.{sql_id:05d}" for sql_id in sql_ids],
+            "author_full_name": ["Ada Lovelace"] * len(sql_ids),
+            "author_title": [None] * len(sql_ids),
+            "text": ["Body text"] * len(sql_ids),
+        }
+    )
+
+
+def test_rewriting_the_same_articles_is_idempotent() -> None:
+    first = bulk_write_articles(loaded_articles(1, 2, 3), batch_size=2)
+    second = bulk_write_articles(loaded_articles(1, 2, 3, title="New"), batch_size=2)
+
+    assert (first.upserted, first.matched) == (3, 0)
+    assert (second.upserted, second.matched) == (0, 3)
+    assert MongoScientificArticle.objects.count() == 3
+    assert {article.title for article in MongoScientificArticle.objects} == {"New"}
+
+
+def test_failed_documents_are_reported_and_the_rest_written() -> None:
+    df = loaded_articles(1, 2, 3, 4)
+    df.loc[1, "title"] = None  # title is required
+    df.loc[3, "sql_article_id"] = -1  # rejected by the SQL stage
+
+    report = bulk_write_articles(df)
+
+    assert report.upserted == 2
+    assert report.skipped == 1
+    assert [failure["sql_id"] for failure in report.failures] == [2]
+    assert "title" in report.failures[0]["error"]
+    assert sorted(MongoScientificArticle.objects.distinct("sql_id")) == [1, 3]
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+import mongomock
+import pytest
+
+from models.article_models import MongoScientificArticle
+from usecases.mongo_search import (
+    SearchHit,
+    decode_cursor,
+    encode_cursor,
+    search_articles,
+    search_pipeline,
+)
+
+# (sql_id, text score); ties on the score are broken by sql_id.
+SCORES = [(1, 0.5), (2, 1.5), (3, 1.0), (4, 1.5), (5, 1.0), (6, 0.75), (7, 1.0)]
+RANKED = [2, 4, 3, 5, 7, 6, 1]
+
+
+class ScoredCollection:
+    """Articles with a stored score, standing in for the $text stages.
+
+    mongomock has no text search, so the two stages computing the score are
+    dropped and the rest of the pipeline runs as is.
+    """
+
+    def __init__(self) -> None:
+        self.collection: Any = mongomock.MongoClient().db.articles
+        self.collection.insert_many(
+            {"sql_id": sql_id, "score": score, "title": f"Paper {sql_id}"}
+            for sql_id, score in SCORES
+        )
+
+    def aggregate(
+        self, pipeline: List[Dict[str, Any]], batchSize: int
+    ) -> Iterator[Dict[str, Any]]:
+        assert "$text" in pipeline[0]["$match"]
+        return iter(self.collection.aggregate(pipeline[2:]))
+
+
+@pytest.fixture(autouse=True)
+def collection(monkeypatch: pytest.MonkeyPatch) -> None:
+    scored = ScoredCollection()
+    monkeypatch.setattr(MongoScientificArticle, "_get_collection", lambda: scored)
+
+
+def walk(limit: int) -> List[List[int]]:
+    pages: List[List[int]] = []
+    cursor: Optional[str] = None
+    while True:
+        page = search_articles("quantum", limit=limit, cursor=cursor, fields=["title"])
+        pages.append([hit.sql_id for hit in page])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages_follow_the_ranking_across_ties() -> None:
+    assert walk(limit=3) == [[2, 4, 3], [5, 7, 6], [1]]
+
+
+def test_full_last_page_is_followed_by_an_empty_one() -> None:
+    pages = walk(limit=len(SCORES))
+
+    assert pages == [RANKED, []]
+
+
+def test_offset_paging_matches_cursor_paging() -> None:
+    by_offset = [
+        [
+            hit.sql_id
+            for hit in search_articles("quantum", 2, offset=offset, fields=["title"])
+        ]
+        for offset in range(0, len(SCORES), 2)
+    ]
+
+    assert sum(by_offset, []) == sum(walk(limit=2), []) == RANKED
+
+
+def test_hits_carry_only_the_requested_fields() -> None:
+    hit = search_articles("quantum", limit=1, fields=["title"]).hits[0]
+
+    assert hit == SearchHit(sql_id=2, score=1.5, title="Paper 2")
+
+
+def test_cursor_round_trip_and_field_validation() -> None:
+    cursor = encode_cursor(SearchHit(sql_id=7, score=1.0))
+
+    assert decode_cursor(cursor) == [1.0, 7]
+    with pytest.raises(ValueError):
+        search_pipeline("quantum", 10, fields=["title", "password"])
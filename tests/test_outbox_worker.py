@@ -0,0 +1,114 @@
+import json
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import mongoengine
+import mongomock
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.article_models import ArticleOutbox, MongoScientificArticle, SQLBase
+from usecases import outbox_worker
+from usecases.outbox_worker import OutboxWorker, drain_outbox, pending_count
+from usecases.sql_loader import bulk_load_articles
+
+
+@pytest.fixture(autouse=True)
+def mongo(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    mongoengine.disconnect(alias="default")
+    mongoengine.connect(
+        db="test",
+        host="mongodb://localhost",
+        mongo_client_class=mongomock.MongoClient,
+        alias="default",
+    )
+    MongoScientificArticle.drop_collection()
+    # The worker connects on start; keep it on the mock connection.
+    monkeypatch.setattr(outbox_worker, "setup_mongodb_connection", lambda: None)
+    yield
+    mongoengine.disconnect(alias="default")
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    # A file, not :memory:, so the worker thread sees the same database.
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.sqlite3'}")
+    SQLBase.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def enqueue(engine: Engine, *arxiv_ids: str) -> List[int]:
+    df = pd.DataFrame(
+        {
+            "title": [f"Paper {arxiv_id}" for arxiv_id in arxiv_ids],
+            "summary": ["A summary"] * len(arxiv_ids),
+            "file_path": [f"papers/{arxiv_id}.pdf" for arxiv_id in arxiv_ids],
+            "arxiv_id": list(arxiv_ids),
+            "author_full_name": ["Ada Lovelace"] * len(arxiv_ids),
+            "author_title": ["Dr"] * len(arxiv_ids),
+            "text": ["Body text"] * len(arxiv_ids),
+        }
+    )
+    with Session(engine) as session:
+        loaded = bulk_load_articles(df, session, outbox=True)
+    return [int(sql_id) for sql_id in loaded["sql_article_id"]]
+
+
+def break_payload(engine: Engine, article_id: int) -> None:
+    """Make Mongo reject the entry: its document loses the required title."""
+    with Session(engine) as session:
+        entry = session.query(ArticleOutbox).filter_by(article_id=article_id).one()
+        entry.payload = json.dumps({**json.loads(entry.payload), "title": None})
+        session.commit()
+
+
+def test_drain_delivers_in_batches(engine: Engine) -> None:
+    ids = enqueue(engine, "2401.00001", "2401.00002", "2401.00003")
+
+    first = drain_outbox(engine, batch_size=2)
+
+    assert first.upserted == 2
+    assert pending_count(engine) == 1
+    assert drain_outbox(engine, batch_size=2).upserted == 1
+    assert drain_outbox(engine, batch_size=2).written == 0
+    assert sorted(MongoScientificArticle.objects.distinct("sql_id")) == ids
+
+
+def test_failed_entries_stay_pending_until_max_attempts(engine: Engine) -> None:
+    ids = enqueue(engine, "2401.00001", "2401.00002")
+    break_payload(engine, ids[0])
+
+    report = drain_outbox(engine, max_attempts=2)
+
+    assert [failure["sql_id"] for failure in report.failures] == [ids[0]]
+    with Session(engine) as session:
+        entry = session.query(ArticleOutbox).filter_by(article_id=ids[0]).one()
+        assert (entry.attempts, entry.delivered_at) == (1, None)
+        assert entry.last_error and "title" in entry.last_error
+
+    assert len(drain_outbox(engine, max_attempts=2).failures) == 1
+    assert drain_outbox(engine, max_attempts=2).failures == []
+    assert pending_count(engine) == 1  # given up on, but never marked delivered
+    assert MongoScientificArticle.objects.distinct("sql_id") == [ids[1]]
+
+
+def test_worker_drains_until_stopped(engine: Engine) -> None:
+    enqueue(engine, "2401.00001", "2401.00002", "2401.00003")
+    worker = OutboxWorker(engine, batch_size=2, poll_interval=0.01)
+
+    worker.start()
+    deadline = time.monotonic() + 5
+    while pending_count(engine) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.stop()
+    worker.join(timeout=5)
+
+    assert not worker.is_alive()
+    assert worker.last_error is None
+    assert worker.delivered == 3
+    assert MongoScientificArticle.objects.count() == 3
@@ -0,0 +1,93 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from usecases import search_cache
+from usecases.bm25_index import HitAuthor
+from usecases.mongo_search import SearchHit, SearchPage
+from usecases.search_cache import SearchCache, _dump_page, _load_page
+
+
+def page(*sql_ids: int) -> SearchPage:
+    return SearchPage(
+        hits=[
+            SearchHit(
+                sql_id=sql_id,
+                score=1.5,
+                title=f"Article {sql_id}",
+                author=HitAuthor("Ada Lovelace", "Countess") if sql_id % 2 else None,
+            )
+            for sql_id in sql_ids
+        ],
+        next_cursor="abc" if sql_ids else None,
+    )
+
+
+class Compute:
+    def __init__(self, result: SearchPage) -> None:
+        self.result = result
+        self.calls: List[int] = []
+
+    def __call__(self) -> SearchPage:
+        self.calls.append(1)
+        return self.result
+
+
+def test_bump_invalidates_cached_pages() -> None:
+    cache = SearchCache()
+    compute = Compute(page(1))
+
+    assert cache.cached("quantum", compute) == page(1)
+    assert cache.cached("quantum", compute) == page(1)
+    assert len(compute.calls) == 1
+
+    assert cache.bump() == 1
+    cache.cached("quantum", compute)
+
+    assert len(compute.calls) == 2
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_pages_expire_after_the_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: clock[0])
+    cache = SearchCache(ttl=10.0)
+    compute = Compute(page(1))
+
+    cache.cached("quantum", compute)
+    clock[0] += 10.0
+    cache.cached("quantum", compute)
+    assert len(compute.calls) == 1
+
+    clock[0] += 0.5
+    cache.cached("quantum", compute)
+    assert len(compute.calls) == 2
+
+
+def test_page_survives_the_disk_format() -> None:
+    for original in (page(1, 2), page()):
+        assert _load_page(_dump_page(original)) == original
+
+
+def test_disk_tier_is_shared_between_caches(tmp_path: Path) -> None:
+    writer = SearchCache(directory=tmp_path)
+    reader = SearchCache(directory=tmp_path)
+    writer.cached("quantum", Compute(page(1, 2)))
+
+    assert reader.cached("quantum", Compute(page())) == page(1, 2)
+    assert reader.stats.disk_hits == 1
+
+    writer.bump()
+
+    assert reader.cached("quantum", Compute(page(3))) == page(3)
+    writer.close()
+    reader.close()
+
+
+def test_process_wide_cache_is_memory_only_by_default() -> None:
+    search_cache.get_search_cache.cache_clear()
+    try:
+        assert search_cache.get_search_cache()._db is None
+    finally:
+        search_cache.get_search_cache.cache_clear()
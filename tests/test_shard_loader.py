@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.shard_loader import load_user_shards, map_shards
+
+
+def read_size(path: Path) -> int:
+    """Module-level so the process pool can pickle it."""
+    if path.read_text() == "broken":
+        raise ValueError("cannot parse")
+    return path.stat().st_size
+
+
+def shards(directory: Path, *contents: str) -> List[Path]:
+    paths = []
+    for number, content in enumerate(contents):
+        path = directory / f"shard-{number}"
+        path.write_text(content)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_results_keep_path_order_and_failures_become_none(
+    tmp_path: Path, workers: int, capsys: pytest.CaptureFixture[str]
+) -> None:
+    paths = shards(tmp_path, "a", "broken", "ccc", "bb")
+
+    results = map_shards(read_size, paths, workers=workers)
+
+    assert results == [1, None, 3, 2]
+    assert f"Skipping shard {paths[1]}: cannot parse" in capsys.readouterr().out
+
+
+def test_largest_shards_are_read_first(tmp_path: Path) -> None:
+    paths = shards(tmp_path, "a", "ccc", "bb")
+    read: List[str] = []
+
+    def record(path: Path) -> int:
+        read.append(path.name)
+        return read_size(path)
+
+    assert map_shards(record, paths, workers=1) == [1, 3, 2]
+    assert read == ["shard-1", "shard-2", "shard-0"]
+
+
+def test_user_shards_of_every_format_are_combined(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "users.csv").write_text("name,age,email\nAda,36,ada@example.com\n")
+    (tmp_path / "users.json").write_text('[{"name": "Alan", "age": "41"}]')
+    (tmp_path / "users.xml").write_text(
+        "<users><user><name>Grace</name><age>85</age></user></users>"
+    )
+    (tmp_path / "users.part-0001").write_text('[{"name": "Edsger", "age": null}]')
+    (tmp_path / "users.empty").write_text("")
+
+    df = load_user_shards(tmp_path, pattern="users.*", workers=2)
+
+    assert sorted(df.itertuples(index=False, name=None)) == [
+        ("Ada", 36, "ada@example.com"),
+        ("Alan", 41, ""),
+        ("Edsger", 0, ""),
+        ("Grace", 85, ""),
+    ]
+    assert "Skipping" not in capsys.readouterr().out
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pandas as pd
+
+from usecases.similarity import TfidfIndex
+
+
+def articles(*texts: str, first_id: int = 1) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "sql_article_id": range(first_id, first_id + len(texts)),
+            "title": list(texts),
+            "summary": ["A summary"] * len(texts),
+            "text": [None] * len(texts),
+        }
+    )
+
+
+def test_similar_to_ranks_the_closest_article_first(tmp_path: Path) -> None:
+    index = TfidfIndex(tmp_path)
+    index.add_articles(
+        articles(
+            "Quantum error correction with surface codes",
+            "Surface codes for quantum error correction",
+            "Protein folding with deep networks",
+        )
+    )
+
+    hits = index.similar_to(1)
+
+    assert [hit.sql_id for hit in hits][:1] == [2]
+    assert 1 not in [hit.sql_id for hit in hits]
+    assert index.similar_to_text("protein folding")[0].sql_id == 3
+
+
+def test_appends_by_another_instance_are_seen(tmp_path: Path) -> None:
+    reader = TfidfIndex(tmp_path)
+    assert reader.similar_to_text("quantum") == []
+
+    TfidfIndex(tmp_path).add_articles(articles("Quantum circuits"))
+    writer = TfidfIndex(tmp_path)
+    writer.add_articles(articles("Quantum annealing", first_id=2))
+
+    assert sorted(hit.sql_id for hit in reader.similar_to_text("quantum")) == [1, 2]
+    assert [hit.sql_id for hit in reader.similar_to(2)] == [1]
+
+
+def test_compaction_keeps_results_and_held_segments(tmp_path: Path) -> None:
+    writer = TfidfIndex(tmp_path)
+    writer.add_articles(articles("Quantum circuits", "Protein folding"))
+    writer.add_articles(articles("Quantum annealing", "Folding proteins", first_id=3))
+    before = writer.similar_to_many([1, 2, 3, 4])
+    reader = TfidfIndex(tmp_path)
+    held = [segment.path for segment in reader.segments]
+
+    writer.compact()
+
+    assert len(writer.segments) == 1
+    assert all(path.exists() for path in held)
+    after = reader.similar_to_many([1, 2, 3, 4])
+    assert len(reader.segments) == 1
+    for sql_id, hits in before.items():
+        assert [hit.sql_id for hit in after[sql_id]] == [hit.sql_id for hit in hits]
+
+    writer.compact()  # nothing left to merge, but the retired segments go
+
+    assert not any(path.exists() for path in held)
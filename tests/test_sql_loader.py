@@ -0,0 +1,110 @@
+from typing import Iterator
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from models.article_models import Author, ScientificArticle, SQLBase
+from usecases.sql_loader import SQLLoadReport, bulk_load_articles
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    engine = create_engine("sqlite://")
+    SQLBase.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def articles(*arxiv_ids: str, title: str = "A title") -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "title": [title] * len(arxiv_ids),
+            "summary": ["A summary"] * len(arxiv_ids),
+            "file_path": [f"papers/{arxiv_id}.pdf" for arxiv_id in arxiv_ids],
+            "arxiv_id": list(arxiv_ids),
+            "author_full_name": ["Ada Lovelace"] * len(arxiv_ids),
+            "author_title": ["Dr"] * len(arxiv_ids),
+        }
+    )
+
+
+def test_constraint_violation_rejects_only_that_row(session: Session) -> None:
+    df = articles("2401.00001", "2401.00002", "2401.00003")
+    df.loc[1, "title"] = None  # scientific_articles.title is NOT NULL
+    report = SQLLoadReport()
+
+    loaded = bulk_load_articles(df, session, batch_size=10, report=report)
+
+    assert (loaded["sql_article_id"] == -1).tolist() == [False, True, False]
+    assert (loaded["sql_author_id"] == -1).tolist() == [False, True, False]
+    stored = session.scalars(select(ScientificArticle.arxiv_id)).all()
+    assert sorted(stored) == ["2401.00001", "2401.00003"]
+
+
+def test_report_counts_batches_loads_and_rejections(session: Session) -> None:
+    df = articles("2401.00001", "2401.00002", "2401.00003", "2401.00004")
+    df.loc[1, "title"] = None
+    df.loc[3, "author_full_name"] = None
+    report = SQLLoadReport()
+
+    bulk_load_articles(df, session, batch_size=2, report=report)
+
+    assert report.committed_batches == 2
+    assert report.retried_batches == 1
+    assert report.loaded == 2
+    assert [rejected["arxiv_id"] for rejected in report.rejected] == [
+        "2401.00004",
+        "2401.00002",
+    ]
+    assert report.rejected[0]["error"] == "missing arxiv_id or author_full_name"
+    assert "NOT NULL" in report.rejected[1]["error"]
+
+
+def test_reloading_returns_existing_ids(session: Session) -> None:
+    first = bulk_load_articles(articles("2401.00001", "2401.00002"), session)
+    report = SQLLoadReport()
+
+    again = bulk_load_articles(
+        articles("2401.00002", "2401.00001", title="Changed"), session, report=report
+    )
+
+    expected = first.set_index("arxiv_id")[["sql_article_id", "sql_author_id"]]
+    actual = again.set_index("arxiv_id")[["sql_article_id", "sql_author_id"]]
+    pd.testing.assert_frame_equal(actual.loc[expected.index], expected)
+    assert report.loaded == 2 and not report.rejected
+    assert session.scalar(select(func.count()).select_from(ScientificArticle)) == 2
+    assert session.scalar(select(func.count()).select_from(Author)) == 1
+    titles = session.scalars(select(ScientificArticle.title)).all()
+    assert titles == ["A title", "A title"]
+
+
+@pytest.fixture
+def nocase_session(monkeypatch: pytest.MonkeyPatch) -> Iterator[Session]:
+    """SQLite compares names like MariaDB's default collation (case only)."""
+    columns = (Author.__table__.c.full_name, ScientificArticle.__table__.c.arxiv_id)
+    for column in columns:
+        monkeypatch.setattr(column.type, "collation", "NOCASE")
+    engine = create_engine("sqlite://")
+    SQLBase.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_names_differing_only_in_case_reuse_the_stored_row(
+    nocase_session: Session,
+) -> None:
+    first = bulk_load_articles(articles("2401.00001", "cs/0101001"), nocase_session)
+    df = articles("2401.00002", "CS/0101001")
+    df["author_full_name"] = "ADA LOVELACE"
+    report = SQLLoadReport()
+
+    again = bulk_load_articles(df, nocase_session, report=report)
+
+    assert report.loaded == 2 and not report.rejected
+    assert again["sql_author_id"].tolist() == [first["sql_author_id"][0]] * 2
+    assert again["sql_article_id"][1] == first["sql_article_id"][1]
+    assert nocase_session.scalar(select(func.count()).select_from(Author)) == 1
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from storage.streaming_readers import iter_json_array, iter_xml_records
+
+RECORDS: List[Any] = [
+    0.84,
+    -12345678901234567890,
+    1e-7,
+    'a, [quoted] "string" ending in 0.',
+    {"name": "Ada", "scores": [1, 2.5, {"nested": [None, True]}], "tag": "]"},
+    [],
+    {},
+    "",
+    7,
+]
+
+
+def write(tmp_path: Path, text: str, name: str = "data.json") -> Path:
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 64, 1 << 16])
+def test_json_elements_split_across_chunks(tmp_path: Path, chunk_size: int) -> None:
+    for text in (json.dumps(RECORDS), json.dumps(RECORDS, indent=4)):
+        path = write(tmp_path, text)
+
+        assert list(iter_json_array(path, chunk_size=chunk_size)) == RECORDS
+
+
+@pytest.mark.parametrize("text", ["", "  \n", "[]", " [ \n ] "])
+def test_empty_json_files_and_arrays(tmp_path: Path, text: str) -> None:
+    assert list(iter_json_array(write(tmp_path, text))) == []
+
+
+@pytest.mark.parametrize(
+    "text", ["[1 2]", "[,1]", "[1,,2]", "[1,]", "[1", "[1,", "{}", '{"a": 1}']
+)
+def test_malformed_json_arrays_are_rejected(tmp_path: Path, text: str) -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array(write(tmp_path, text), chunk_size=1))
+
+
+def test_xml_records_filtered_by_tag(tmp_path: Path) -> None:
+    path = write(
+        tmp_path,
+        "<users>"
+        "<user><name>Ada</name><age>36</age></user>"
+        "<meta><generated>today</generated></meta>"
+        "<user><name>Alan</name><email/></user>"
+        "</users>",
+        name="users.xml",
+    )
+
+    assert list(iter_xml_records(path, record_tag="user")) == [
+        {"name": "Ada", "age": "36"},
+        {"name": "Alan", "email": None},
+    ]
+    assert len(list(iter_xml_records(path))) == 3
+
+
+def test_xml_without_records(tmp_path: Path) -> None:
+    assert list(iter_xml_records(write(tmp_path, "<users/>", "users.xml"))) == []
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from src.user_table import UserTable
+
+
+def test_missing_and_malformed_ages_become_zero() -> None:
+    table = UserTable.from_columns(
+        ["Ada", "Bob", "Cy", "Di"],
+        [36, float("nan"), None, "forty"],
+        ["a@x.io", "b@x.io", "c@x.io", "d@x.io"],
+    )
+
+    assert table.ages.dtype == np.int32
+    assert table.ages.tolist() == [36, 0, 0, 0]
+
+
+def test_ages_outside_int32_are_rejected() -> None:
+    with pytest.raises(ValueError, match="int32"):
+        UserTable.from_columns(["Ada", "Bob"], [36, 2**31], ["a@x.io", "b@x.io"])
@@ -0,0 +1,121 @@
+import time
+import xml.etree.ElementTree as ET
+from typing import IO, Any, Dict, Iterator, List, Optional, Union, cast
+
+import pandas as pd
+import requests
+
+from usecases.http_cache import HttpCache
+
+ARXIV_URL = "http://export.arxiv.org/api/query?"
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+# Submission timestamp used by the incremental ingest; fetch_arxiv_data drops it.
+PUBLISHED_COLUMN = "published"
+
+ARTICLE_COLUMNS = [
+    "title",
+    "summary",
+    "file_path",
+    "arxiv_id",
+    "author_full_name",
+    "author_title",
+    "html_content",
+    PUBLISHED_COLUMN,
+]
+
+
+def _child_text(element: ET.Element, tag: str) -> str:
+    child = element.find(ATOM + tag)
+    if child is None or child.text is None:
+        return ""
+    return child.text.strip()
+
+
+def entry_to_row(entry: ET.Element) -> Dict[str, str]:
+    author_element = entry.find(ATOM + "author")
+    author_name = ""
+    if author_element is not None:
+        author_name = _child_text(author_element, "name")
+
+    arxiv_id_full = _child_text(entry, "id")
+    arxiv_id = arxiv_id_full.split("/")[-1] if arxiv_id_full else ""
+
+    return {
+        "title": _child_text(entry, "title"),
+        "summary": _child_text(entry, "summary"),
+        "file_path": f"arxiv_pdf/{arxiv_id}.pdf",
+        "arxiv_id": arxiv_id,
+        "author_full_name": author_name or "Unknown Author",
+        "author_title": "ArXiv Contributor",
+        "html_content": "",
+        PUBLISHED_COLUMN: _child_text(entry, "published"),
+    }
+
+
+def iter_feed_entries(source: IO[bytes]) -> Iterator[Dict[str, str]]:
+    """Parse an Atom feed incrementally, clearing each entry once it is read."""
+    root: Optional[ET.Element] = None
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            continue
+        if element.tag == ATOM + "entry":
+            yield entry_to_row(element)
+            element.clear()
+            if root is not None:
+                root.clear()
+
+
+def rows_to_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=ARTICLE_COLUMNS).astype("string")
+
+
+def iter_arxiv_pages(
+    query: str,
+    max_results: Optional[int] = None,
+    page_size: int = 100,
+    page_delay: float = 3.0,
+    session: Optional[requests.Session] = None,
+    cache: Optional[HttpCache] = None,
+) -> Iterator[pd.DataFrame]:
+    """Walk the arXiv result set `page_size` entries at a time, one DataFrame per page.
+
+    Stops after `max_results` entries, or when the API returns a short page.
+    """
+    http = session or requests.Session()
+    start = 0
+    try:
+        while max_results is None or start < max_results:
+            if start and page_delay:
+                time.sleep(page_delay)
+
+            size = page_size
+            if max_results is not None:
+                size = min(page_size, max_results - start)
+            params: Dict[str, Union[str, int]] = {
+                "search_query": f"all:{query}",
+                "start": start,
+                "max_results": size,
+                "sortBy": "submittedDate",
+                "sortOrder": "descending",
+            }
+
+            if cache is not None:
+                with cache.open_fetched(ARXIV_URL, params, session=http) as body:
+                    rows = list(iter_feed_entries(body))
+            else:
+                with http.get(ARXIV_URL, params=params, stream=True) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    rows = list(iter_feed_entries(cast(IO[bytes], response.raw)))
+
+            if rows:
+                yield rows_to_frame(rows)
+            if len(rows) < size:
+                break
+            start += len(rows)
+    finally:
+        if session is None:
+            http.close()
@@ -0,0 +1,573 @@
+import functools
+import heapq
+import json
+import math
+import re
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from storage.local_store import (
+    CACHE_ROOT,
+    manifest_stamp,
+    next_segment_path,
+    read_manifest,
+    write_manifest,
+)
+
+DEFAULT_INDEX_DIR = CACHE_ROOT / "bm25"
+
+# Postings per block for the block-max bounds used to stop scoring early.
+BLOCK_SIZE = 128
+BLOCK_ARRAYS = (
+    "impact_order",
+    "block_offsets",
+    "block_starts",
+    "block_max_tf",
+    "block_min_dl",
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to with we "
+    "our its into using via".split()
+)
+
+# Every Segment open in this process; compaction leaves their files in place.
+_OPEN_SEGMENTS: "weakref.WeakSet[Segment]" = weakref.WeakSet()
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+@dataclass
+class HitAuthor:
+    full_name: str
+    title: Optional[str] = None
+
+
+@dataclass
+class BM25Hit:
+    sql_id: int
+    score: float
+    title: str
+    author: HitAuthor
+    text: str
+
+
+def impact_blocks(
+    offsets: NDArray[np.int64],
+    doc_ids: NDArray[np.uint32],
+    tfs: NDArray[np.uint16],
+    doc_len: NDArray[np.uint32],
+) -> Dict[str, NDArray[Any]]:
+    """Impact-ordered blocks of each term's postings, for early termination.
+
+    `impact_order[offsets[t]:offsets[t + 1]]` lists term `t`'s postings (as
+    positions within the term) by descending tf, then ascending document
+    length. That sequence is cut into BLOCK_SIZE blocks, and term `t` owns
+    blocks `block_offsets[t]:block_offsets[t + 1]`, which start at
+    `block_starts`. BM25 grows with tf and shrinks with length, so a block's
+    max tf scored at its min length bounds every posting in it, whatever the
+    avgdl, and the bounds fall quickly from one block to the next.
+    """
+    counts = np.diff(offsets)
+    terms = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    posting_len = np.asarray(doc_len)[doc_ids]
+    order = np.lexsort((posting_len, -np.asarray(tfs, dtype=np.int64), terms))
+    impact_order = (order - np.repeat(offsets[:-1], counts)).astype(np.uint32)
+
+    block_counts = -(-counts // BLOCK_SIZE)
+    block_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(block_counts, out=block_offsets[1:])
+    first = np.repeat(block_offsets[:-1], block_counts)
+    block_starts = np.repeat(offsets[:-1], block_counts) + BLOCK_SIZE * (
+        np.arange(block_offsets[-1], dtype=np.int64) - first
+    )
+    blocks: Dict[str, NDArray[Any]] = {
+        "impact_order": impact_order,
+        "block_offsets": block_offsets,
+        "block_starts": block_starts,
+        "block_max_tf": np.zeros(0, dtype=np.uint16),
+        "block_min_dl": np.zeros(0, dtype=np.uint32),
+    }
+    if len(block_starts):
+        blocks["block_max_tf"] = np.maximum.reduceat(
+            np.asarray(tfs)[order], block_starts
+        )
+        blocks["block_min_dl"] = np.minimum.reduceat(posting_len[order], block_starts)
+    return blocks
+
+
+class Segment:
+    """Immutable, memory-mapped slice of the index.
+
+    Postings are stored term-major: the documents containing term `t` are
+    `doc_ids[offsets[t]:offsets[t + 1]]`, with their term frequencies in `tfs`.
+    Impact-ordered blocks (see `impact_blocks`) are stored alongside; segments
+    written before they existed compute them on first use.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        terms = json.loads((path / "terms.json").read_text(encoding="utf-8"))
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.offsets: NDArray[np.int64] = np.load(path / "offsets.npy", mmap_mode="r")
+        self.doc_ids: NDArray[np.uint32] = np.load(path / "doc_ids.npy", mmap_mode="r")
+        self.tfs: NDArray[np.uint16] = np.load(path / "tfs.npy", mmap_mode="r")
+        self.doc_len: NDArray[np.uint32] = np.load(path / "doc_len.npy", mmap_mode="r")
+        self.sql_ids: NDArray[np.int64] = np.load(path / "sql_ids.npy", mmap_mode="r")
+        self._doc_offsets: Optional[NDArray[np.int64]] = None
+        self._blocks: Optional[Dict[str, NDArray[Any]]] = None
+        _OPEN_SEGMENTS.add(self)
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.sql_ids)
+
+    @property
+    def blocks(self) -> Dict[str, NDArray[Any]]:
+        if self._blocks is None:
+            files = {name: self.path / f"{name}.npy" for name in BLOCK_ARRAYS}
+            if all(file.exists() for file in files.values()):
+                self._blocks = {
+                    name: np.load(file, mmap_mode="r") for name, file in files.items()
+                }
+            else:
+                self._blocks = impact_blocks(
+                    self.offsets, self.doc_ids, self.tfs, self.doc_len
+                )
+        return self._blocks
+
+    def postings(self, term: str) -> Tuple[NDArray[np.uint32], NDArray[np.uint16]]:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return self.doc_ids[:0], self.tfs[:0]
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.doc_ids[start:end], self.tfs[start:end]
+
+    def document(self, local_id: int) -> Dict[str, Any]:
+        if self._doc_offsets is None:
+            self._doc_offsets = np.load(self.path / "doc_offsets.npy", mmap_mode="r")
+        with (self.path / "docs.jsonl").open("rb") as f:
+            f.seek(int(self._doc_offsets[local_id]))
+            doc: Dict[str, Any] = json.loads(f.readline())
+        return doc
+
+    @staticmethod
+    def write(
+        path: Path,
+        vocab: List[str],
+        term_ids: NDArray[np.int64],
+        doc_ids: NDArray[np.int64],
+        tfs: NDArray[np.uint16],
+        doc_len: NDArray[np.uint32],
+        sql_ids: NDArray[np.int64],
+        docs: Iterable[Dict[str, Any]],
+    ) -> None:
+        """Write postings given as parallel (term, doc, tf) arrays in any order."""
+        order = np.lexsort((doc_ids, term_ids))
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(vocab)), out=offsets[1:])
+
+        sorted_docs = doc_ids[order].astype(np.uint32)
+        sorted_tfs = tfs[order]
+
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "offsets.npy", offsets)
+        np.save(path / "doc_ids.npy", sorted_docs)
+        np.save(path / "tfs.npy", sorted_tfs)
+        np.save(path / "doc_len.npy", doc_len)
+        blocks = impact_blocks(offsets, sorted_docs, sorted_tfs, doc_len)
+        for name, values in blocks.items():
+            np.save(path / f"{name}.npy", values)
+        np.save(path / "sql_ids.npy", sql_ids)
+        (path / "terms.json").write_text(json.dumps(vocab), encoding="utf-8")
+
+        doc_offsets: List[int] = []
+        with (path / "docs.jsonl").open("wb") as f:
+            for doc in docs:
+                doc_offsets.append(f.tell())
+                f.write(json.dumps(doc).encode("utf-8") + b"\n")
+        np.save(path / "doc_offsets.npy", np.array(doc_offsets, dtype=np.int64))
+
+    @classmethod
+    def write_tokens(
+        cls,
+        path: Path,
+        sql_ids: List[int],
+        token_lists: List[List[str]],
+        docs: List[Dict[str, Any]],
+    ) -> None:
+        vocab: Dict[str, int] = {}
+        term_col: List[int] = []
+        doc_col: List[int] = []
+        tf_col: List[int] = []
+        for local_id, tokens in enumerate(token_lists):
+            for term, tf in Counter(tokens).items():
+                term_col.append(vocab.setdefault(term, len(vocab)))
+                doc_col.append(local_id)
+                tf_col.append(min(tf, np.iinfo(np.uint16).max))
+
+        cls.write(
+            path,
+            list(vocab),
+            np.array(term_col, dtype=np.int64),
+            np.array(doc_col, dtype=np.int64),
+            np.array(tf_col, dtype=np.uint16),
+            np.array([len(tokens) for tokens in token_lists], dtype=np.uint32),
+            np.array(sql_ids, dtype=np.int64),
+            docs,
+        )
+
+
+class BM25Index:
+    """Local BM25 search over article title, summary and extracted text.
+
+    Each ingest appends a segment; `compact` merges them back into one. Term
+    statistics are combined across segments at query time, so scores do not depend
+    on how the corpus was split.
+
+    The manifest is re-read whenever another instance or process has replaced
+    it, so a long-lived index sees their appends and compactions.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_INDEX_DIR,
+        k1: float = 1.2,
+        b: float = 0.75,
+        snippet_chars: int = 300,
+    ) -> None:
+        self.directory = Path(directory)
+        self.k1 = k1
+        self.b = b
+        self.snippet_chars = snippet_chars
+        self.segments: List[Segment] = []
+        self._indexed: Optional[Set[int]] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._retired: List[Path] = []
+        self.reload()
+
+    def reload(self) -> None:
+        self._stamp = manifest_stamp(self.directory)
+        names: List[str] = read_manifest(self.directory) or []
+        open_segments = {segment.path.name: segment for segment in self.segments}
+        self.segments = [
+            open_segments.get(name) or Segment(self.directory / name) for name in names
+        ]
+        self._indexed = None
+
+    def refresh(self) -> None:
+        """Reload if the manifest changed since this instance last read it."""
+        if manifest_stamp(self.directory) != self._stamp:
+            self.reload()
+
+    @property
+    def num_docs(self) -> int:
+        return sum(segment.num_docs for segment in self.segments)
+
+    def indexed_ids(self) -> Set[int]:
+        if self._indexed is None:
+            self._indexed = {int(i) for s in self.segments for i in s.sql_ids}
+        return self._indexed
+
+    def add_articles(self, df: pd.DataFrame) -> int:
+        """Index loaded articles not seen before; returns the number added."""
+        self.refresh()
+        seen = self.indexed_ids()
+        sql_ids: List[int] = []
+        token_lists: List[List[str]] = []
+        docs: List[Dict[str, Any]] = []
+        has_text = "text" in df.columns
+        for row in df.itertuples(index=False):
+            sql_id = int(row.sql_article_id)
+            if sql_id == -1 or sql_id in seen:
+                continue
+            text = str(row.text) if has_text and not pd.isna(row.text) else ""
+            title = "" if pd.isna(row.title) else str(row.title)
+            summary = "" if pd.isna(row.summary) else str(row.summary)
+            seen.add(sql_id)
+            sql_ids.append(sql_id)
+            token_lists.append(tokenize(f"{title}\n{summary}\n{text}"))
+            docs.append(
+                {
+                    "title": title,
+                    "author": None
+                    if pd.isna(row.author_full_name)
+                    else str(row.author_full_name),
+                    "text": (text or summary)[: self.snippet_chars],
+                }
+            )
+        if not sql_ids:
+            return 0
+        path = next_segment_path(self.directory)
+        Segment.write_tokens(path, sql_ids, token_lists, docs)
+        self._commit([s.path.name for s in self.segments] + [path.name])
+        return len(sql_ids)
+
+    def _commit(self, names: List[str]) -> None:
+        """Atomically point the manifest at `names` and reopen the segments."""
+        write_manifest(self.directory, names)
+        self.reload()
+
+    def search(self, query: str, limit: int = 10) -> List[BM25Hit]:
+        self.refresh()
+        try:
+            return self._search(query, limit)
+        except FileNotFoundError:
+            # Another process compacted these segments away mid-query.
+            self.reload()
+            return self._search(query, limit)
+
+    def _search(self, query: str, limit: int) -> List[BM25Hit]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        total_docs = self.num_docs
+        if not terms or not total_docs:
+            return []
+
+        total_len = sum(int(s.doc_len.sum(dtype=np.int64)) for s in self.segments)
+        avgdl = total_len / total_docs
+        idf: Dict[str, float] = {}
+        for term in terms:
+            df = sum(len(s.postings(term)[0]) for s in self.segments)
+            idf[term] = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+        # Min-heap of the best (score, segment, doc) so far; its smallest score
+        # is the bar a later segment's documents have to clear.
+        best: List[Tuple[float, int, int]] = []
+        for seg_no, segment in enumerate(self.segments):
+            floor = best[0][0] if len(best) == limit else 0.0
+            for score, local_id in self._segment_top(
+                segment, terms, idf, avgdl, limit, floor
+            ):
+                entry = (score, seg_no, local_id)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+
+        hits: List[BM25Hit] = []
+        for score, seg_no, local_id in sorted(best, reverse=True):
+            segment = self.segments[seg_no]
+            doc = segment.document(local_id)
+            hits.append(
+                BM25Hit(
+                    sql_id=int(segment.sql_ids[local_id]),
+                    score=score,
+                    title=doc["title"],
+                    author=HitAuthor(full_name=doc["author"] or ""),
+                    text=doc["text"],
+                )
+            )
+        return hits
+
+    def _weights(self, tf: NDArray[Any], dl: NDArray[Any], avgdl: float) -> Any:
+        norm = self.k1 * (1 - self.b + self.b * dl / avgdl)
+        return tf * (self.k1 + 1) / (tf + norm)
+
+    def _score(
+        self,
+        segment: Segment,
+        terms: List[Tuple[str, int]],
+        idf: Dict[str, float],
+        avgdl: float,
+        docs: NDArray[np.uint32],
+    ) -> NDArray[np.float32]:
+        """Exact scores of `docs` (local ids), one binary search per term."""
+        scores = np.zeros(len(docs), dtype=np.float32)
+        for term, term_id in terms:
+            start, end = segment.offsets[term_id], segment.offsets[term_id + 1]
+            term_docs = segment.doc_ids[start:end]
+            positions = np.searchsorted(term_docs, docs)
+            found = positions < len(term_docs)
+            found[found] = term_docs[positions[found]] == docs[found]
+            tf = segment.tfs[start:end][positions[found]].astype(np.float32)
+            dl = segment.doc_len[docs[found]].astype(np.float32)
+            scores[found] += idf[term] * self._weights(tf, dl, avgdl)
+        return scores
+
+    def _segment_top(
+        self,
+        segment: Segment,
+        terms: List[str],
+        idf: Dict[str, float],
+        avgdl: float,
+        limit: int,
+        floor: float,
+    ) -> List[Tuple[float, int]]:
+        """Top `limit` (score, local id) pairs of one segment, scoring above `floor`.
+
+        Blocks are visited in descending order of their score bound, in rounds of
+        doubling size, and every document seen is scored exactly. Scanning stops
+        once the best score an unseen document could reach, the sum of each
+        term's highest unvisited block bound, no longer beats the k-th score, so
+        common terms only touch the blocks holding their top documents.
+        """
+        present = [
+            (term, segment.term_ids[term]) for term in terms if term in segment.term_ids
+        ]
+        if not present:
+            return []
+        blocks = segment.blocks
+        bounds, starts, ends, owners, bases = [], [], [], [], []
+        for number, (term, term_id) in enumerate(present):
+            lo, hi = blocks["block_offsets"][term_id : term_id + 2]
+            max_tf = blocks["block_max_tf"][lo:hi].astype(np.float64)
+            min_dl = blocks["block_min_dl"][lo:hi].astype(np.float64)
+            bounds.append(idf[term] * self._weights(max_tf, min_dl, avgdl))
+            term_starts = np.asarray(blocks["block_starts"][lo:hi])
+            starts.append(term_starts)
+            ends.append(np.append(term_starts[1:], segment.offsets[term_id + 1]))
+            owners.append(np.full(hi - lo, number))
+            bases.append(np.full(hi - lo, segment.offsets[term_id], dtype=np.int64))
+        bound = np.concatenate(bounds)
+        order = np.argsort(-bound, kind="stable")
+        block_starts = np.concatenate(starts)[order]
+        block_lengths = np.concatenate(ends)[order] - block_starts
+        block_owners = np.concatenate(owners)[order]
+        block_bases = np.concatenate(bases)[order]
+        # Each term's bounds in visiting order, with a 0 once all are visited.
+        term_bounds = [np.append(np.sort(b)[::-1], 0.0) for b in bounds]
+
+        # -1 for documents not seen yet; scatter/compare dedupes without sorting.
+        slots = np.full(segment.num_docs, -1, dtype=np.int32)
+        doc_parts: List[NDArray[np.uint32]] = []
+        score_parts: List[NDArray[np.float32]] = []
+        visited, step = 0, max(1, -(-limit // BLOCK_SIZE))
+        total, scanned = int(block_lengths.sum()), 0
+        while visited < len(order):
+            batch = slice(visited, min(len(order), visited + step))
+            lengths = block_lengths[batch]
+            scanned += int(lengths.sum())
+            if scanned > total // 8 and total > segment.num_docs // 8:
+                # Past an eighth of long posting lists a plain scan of all of
+                # them is cheaper than binary-searching the rest; short lists
+                # never pay for the scan's array over every document.
+                return self._scan_top(segment, present, idf, avgdl, limit, floor)
+            offsets = np.zeros(len(lengths), dtype=np.int64)
+            np.cumsum(lengths[:-1], out=offsets[1:])
+            positions = np.repeat(block_starts[batch] - offsets, lengths)
+            positions += np.arange(int(lengths.sum()), dtype=np.int64)
+            postings = np.repeat(block_bases[batch], lengths)
+            postings += blocks["impact_order"][positions]
+            found = segment.doc_ids[postings]
+            # Only documents not seen in earlier rounds need scoring.
+            found = found[slots[found] < 0]
+            index = np.arange(len(found), dtype=np.int32)
+            slots[found] = index
+            new = found[slots[found] == index]
+            visited, step = batch.stop, step * 2
+
+            doc_parts.append(new)
+            score_parts.append(self._score(segment, present, idf, avgdl, new))
+            scores = np.concatenate(score_parts)
+            kth = (
+                float(np.partition(scores, -limit)[-limit])
+                if len(scores) >= limit
+                else 0.0
+            )
+            seen = np.bincount(block_owners[:visited], minlength=len(present))
+            unseen_best = sum(float(b[n]) for b, n in zip(term_bounds, seen))
+            # The tolerance absorbs float32 rounding in the exact scores, so
+            # unseen documents that could only tie the k-th are not scanned.
+            if unseen_best <= max(kth, floor) * (1 + 1e-6):
+                break
+
+        return self._top(np.concatenate(doc_parts), scores, limit, floor)
+
+    def _scan_top(
+        self,
+        segment: Segment,
+        terms: List[Tuple[str, int]],
+        idf: Dict[str, float],
+        avgdl: float,
+        limit: int,
+        floor: float,
+    ) -> List[Tuple[float, int]]:
+        """`_segment_top` by scoring every posting into a dense array."""
+        scores = np.zeros(segment.num_docs, dtype=np.float32)
+        for term, _ in terms:
+            doc_ids, tfs = segment.postings(term)
+            tf = tfs.astype(np.float32)
+            dl = segment.doc_len[doc_ids].astype(np.float32)
+            scores[doc_ids] += idf[term] * self._weights(tf, dl, avgdl)
+        docs = np.flatnonzero(scores)
+        return self._top(docs, scores[docs], limit, floor)
+
+    @staticmethod
+    def _top(
+        docs: NDArray[Any], scores: NDArray[np.float32], limit: int, floor: float
+    ) -> List[Tuple[float, int]]:
+        keep = np.flatnonzero(scores > floor)
+        if len(keep) > limit:
+            keep = keep[np.argpartition(scores[keep], -limit)[-limit:]]
+        return [(float(scores[i]), int(docs[i])) for i in keep]
+
+    def compact(self) -> None:
+        """Merge all segments into one to keep per-query overhead flat.
+
+        The merged segments are deleted once no index in this process still
+        holds them; until then a later `compact` retries.
+        """
+        self.refresh()
+        self._remove_retired()
+        if len(self.segments) < 2:
+            return
+        path = next_segment_path(self.directory)
+        self._write_merged(path, self.segments)
+        self._retired.extend(segment.path for segment in self.segments)
+        self._commit([path.name])
+        self._remove_retired()
+
+    @staticmethod
+    def _write_merged(path: Path, old: List[Segment]) -> None:
+        vocab: Dict[str, int] = {}
+        term_parts, doc_parts, tf_parts = [], [], []
+        doc_base = 0
+        for segment in old:
+            remap = np.array(
+                [vocab.setdefault(term, len(vocab)) for term in segment.term_ids],
+                dtype=np.int64,
+            )
+            counts = np.diff(segment.offsets)
+            term_parts.append(np.repeat(remap, counts))
+            doc_parts.append(segment.doc_ids.astype(np.int64) + doc_base)
+            tf_parts.append(np.asarray(segment.tfs))
+            doc_base += segment.num_docs
+
+        Segment.write(
+            path,
+            list(vocab),
+            np.concatenate(term_parts),
+            np.concatenate(doc_parts),
+            np.concatenate(tf_parts),
+            np.concatenate([s.doc_len for s in old]),
+            np.concatenate([s.sql_ids for s in old]),
+            (s.document(i) for s in old for i in range(s.num_docs)),
+        )
+
+    def _remove_retired(self) -> None:
+        held = {segment.path for segment in _OPEN_SEGMENTS}
+        for path in [p for p in self._retired if p not in held]:
+            if path.exists():
+                for file in path.iterdir():
+                    file.unlink()
+                path.rmdir()
+            self._retired.remove(path)
+
+
+@functools.lru_cache(maxsize=None)
+def get_bm25_index() -> BM25Index:
+    return BM25Index()
+
+
+def search_local_articles(search_term: str) -> List[BM25Hit]:
+    return get_bm25_index().search(search_term)
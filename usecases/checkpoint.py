@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import List, Optional, Set
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.article_models import IngestCheckpoint, IngestedArticle, SQLBase
+from usecases.arxiv_feed import PUBLISHED_COLUMN, iter_arxiv_pages
+from usecases.bm25_index import BM25Index
+from usecases.data_pipeline import load_data_into_dbs
+from usecases.dedup import MinHashDeduplicator
+from usecases.downloader import HtmlDownloader, download_html_contents
+from usecases.extraction import TextExtractor, extract_texts
+from usecases.http_cache import HttpCache
+from usecases.mongo_loader import MongoWriteReport
+from usecases.similarity import TfidfIndex
+
+
+def parse_submitted(values: pd.Series) -> pd.Series:
+    """Parse Atom `published` timestamps into naive UTC datetimes."""
+    return pd.to_datetime(values, utc=True, errors="coerce").dt.tz_convert(None)
+
+
+def get_high_water_mark(session: Session, query: str) -> Optional[datetime]:
+    checkpoint = session.query(IngestCheckpoint).filter_by(query=query).first()
+    return checkpoint.latest_submitted if checkpoint else None
+
+
+def already_ingested(session: Session, query: str, arxiv_ids: List[str]) -> Set[str]:
+    if not arxiv_ids:
+        return set()
+    rows = (
+        session.query(IngestedArticle.arxiv_id)
+        .filter(IngestedArticle.query == query)
+        .filter(IngestedArticle.arxiv_id.in_(arxiv_ids))
+        .all()
+    )
+    return {arxiv_id for (arxiv_id,) in rows}
+
+
+def filter_new_articles(df: pd.DataFrame, session: Session, query: str) -> pd.DataFrame:
+    """Drop entries at or below the high-water mark or already recorded for `query`."""
+    seen = already_ingested(session, query, df["arxiv_id"].dropna().tolist())
+    mask = ~df["arxiv_id"].isin(seen)
+
+    latest = get_high_water_mark(session, query)
+    if latest is not None:
+        mask &= ~(parse_submitted(df[PUBLISHED_COLUMN]) <= latest)
+
+    return df[mask]
+
+
+def record_ingested(session: Session, query: str, df: pd.DataFrame) -> None:
+    submitted = parse_submitted(df[PUBLISHED_COLUMN])
+    session.add_all(
+        IngestedArticle(
+            query=query,
+            arxiv_id=arxiv_id,
+            submitted=None if pd.isna(ts) else ts.to_pydatetime(),
+        )
+        for arxiv_id, ts in zip(df["arxiv_id"], submitted)
+    )
+
+
+def advance_high_water_mark(session: Session, query: str, latest: datetime) -> None:
+    checkpoint = session.query(IngestCheckpoint).filter_by(query=query).first()
+    if checkpoint is None:
+        session.add(IngestCheckpoint(query=query, latest_submitted=latest))
+    elif checkpoint.latest_submitted is None or latest > checkpoint.latest_submitted:
+        checkpoint.latest_submitted = latest
+
+
+def ingest_incremental(
+    query: str,
+    sql_engine: Engine,
+    max_results: Optional[int] = None,
+    page_size: int = 100,
+    batch_size: int = 50,
+    cache: Optional[HttpCache] = None,
+    downloader: Optional[HtmlDownloader] = None,
+    extractor: Optional[TextExtractor] = None,
+    deduplicator: Optional[MinHashDeduplicator] = None,
+    search_index: Optional[BM25Index] = None,
+    similarity_index: Optional[TfidfIndex] = None,
+) -> pd.DataFrame:
+    """Ingest only the entries of `query` that earlier runs have not committed.
+
+    Each batch is loaded and then recorded in `ingested_articles`, so an interrupted
+    run resumes after the last committed batch. Rows that failed in MariaDB or
+    MongoDB are not recorded, so the next run retries them. The high-water mark only moves once
+    the whole run has finished without failed rows, because results arrive newest
+    first.
+    """
+    SQLBase.metadata.create_all(bind=sql_engine)
+
+    with Session(sql_engine) as session:
+        latest = get_high_water_mark(session, query)
+
+    loaded: List[pd.DataFrame] = []
+    newest: Optional[datetime] = None
+    failed = 0
+    owns_downloader = downloader is None
+    downloader = downloader or HtmlDownloader(cache=cache)
+    owns_extractor = extractor is None
+    extractor = extractor or TextExtractor()
+
+    try:
+        pages = iter_arxiv_pages(query, max_results, page_size=page_size, cache=cache)
+        for page in pages:
+            submitted = parse_submitted(page[PUBLISHED_COLUMN])
+            if submitted.notna().any():
+                page_newest = submitted.max().to_pydatetime()
+                newest = page_newest if newest is None else max(newest, page_newest)
+
+            with Session(sql_engine) as session:
+                new_rows = filter_new_articles(page, session, query)
+
+            for start in range(0, len(new_rows), batch_size):
+                batch = new_rows.iloc[start : start + batch_size]
+                batch = download_html_contents(batch, downloader)
+                batch = extract_texts(batch, extractor)
+                mongo_report = MongoWriteReport()
+                batch = load_data_into_dbs(
+                    batch,
+                    sql_engine,
+                    search_index=search_index,
+                    similarity_index=similarity_index,
+                    deduplicator=deduplicator,
+                    mongo_report=mongo_report,
+                )
+                mongo_failed = {int(f["sql_id"]) for f in mongo_report.failures}
+                ok = batch[
+                    (batch["sql_article_id"] != -1)
+                    & ~batch["sql_article_id"].isin(mongo_failed)
+                ]
+                failed += len(batch) - len(ok)
+
+                with Session(sql_engine) as session:
+                    record_ingested(session, query, ok)
+                    session.commit()
+                loaded.append(
+                    ok.drop(columns=["html_content", "text", PUBLISHED_COLUMN])
+                )
+
+            if latest is not None and (submitted <= latest).all():
+                break
+    finally:
+        if owns_downloader:
+            downloader.close()
+        if owns_extractor:
+            extractor.close()
+
+    if newest is not None and not failed:
+        with Session(sql_engine) as session:
+            advance_high_water_mark(session, query, newest)
+            session.commit()
+
+    if not loaded:
+        return pd.DataFrame()
+    return pd.concat(loaded, ignore_index=True)
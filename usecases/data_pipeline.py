@@ -1,202 +1,216 @@
-import os
-from typing import List, Optional, Tuple, Any, Dict
+from typing import List, Optional, Tuple, Iterable, Sequence
 import pandas as pd
-import requests
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from mongoengine.queryset import QuerySet
-from pathlib import Path
-import xml.etree.ElementTree as ET
-import html2text
-import time
+import queue
+import threading
 
 from models.article_models import (
     SQLBase,
-    Author,
-    ScientificArticle,
     MongoScientificArticle,
-    MongoAuthor,
 )
-from storage.db_setup import get_sql_session, setup_mongodb_connection
-
-
+from storage.csv_loader import load_csv
+from storage.db_setup import setup_mongodb_connection
+from usecases.arxiv_feed import PUBLISHED_COLUMN, iter_arxiv_pages, rows_to_frame
+from usecases.bm25_index import BM25Index
+from usecases.dedup import MinHashDeduplicator
+from usecases.downloader import HtmlDownloader
+from usecases.extraction import html2text_extract
+from usecases.http_cache import HttpCache
+from usecases.instrumentation import span, timed
+from usecases.mongo_loader import MongoWriteReport, bulk_write_articles
+from usecases.mongo_search import DEFAULT_FIELDS, SearchPage, search_articles
+from usecases.search_cache import get_search_cache
+from usecases.similarity import TfidfIndex
+from usecases.sql_loader import SQLLoadReport, bulk_load_articles
+
+ID_COLUMNS = ["arxiv_id", "sql_article_id", "sql_author_id"]
+
+
+@timed("extract_row")
 def extract_text_from_html(html_content: str) -> str:
-    h = html2text.HTML2Text()
-    h.ignore_links = True
-    h.ignore_images = True
-    return h.handle(html_content).strip()
+    return html2text_extract(html_content)
 
 
 def save_article_to_mariadb(row: pd.Series, session: Session) -> pd.Series:
-    try:
-        author_full_name = row["author_full_name"]
-        author_title = row["author_title"]
-        
-        author = session.query(Author).filter_by(full_name=author_full_name).first()
-        if not author:
-            author = Author(full_name=author_full_name, title=author_title)
-            session.add(author)
-            session.flush()
-
-        article_data = {
-            "title": row["title"],
-            "summary": row["summary"],
-            "file_path": row["file_path"],
-            "arxiv_id": row["arxiv_id"],
-            "author_id": author.id,
-        }
-        
-        existing_article = session.query(ScientificArticle).filter_by(
-            arxiv_id=article_data["arxiv_id"]
-        ).first()
-
-        if not existing_article:
-            article = ScientificArticle(**article_data)
-            session.add(article)
-            session.flush()
-            
-            row["sql_article_id"] = article.id
-            row["sql_author_id"] = author.id
-        else:
-            row["sql_article_id"] = existing_article.id
-            row["sql_author_id"] = existing_article.author_id
-            
-    except SQLAlchemyError as e:
-        session.rollback()
-        row["sql_article_id"] = -1
-        row["sql_author_id"] = -1
-    
+    """Load one article with `bulk_load_articles`, which commits the session.
+
+    Prefer `bulk_load_articles` for more than a handful of rows.
+    """
+    loaded = bulk_load_articles(row.to_frame().T, session)
+    row["sql_article_id"] = int(loaded["sql_article_id"].iloc[0])
+    row["sql_author_id"] = int(loaded["sql_author_id"].iloc[0])
     return row
 
 
 def save_article_to_mongodb(row: pd.Series) -> None:
-    if row["sql_article_id"] == -1:
-        return
+    """Upsert one article's Mongo copy with `bulk_write_articles`."""
+    report = bulk_write_articles(row.to_frame().T)
+    for failure in report.failures:
+        print(f"Mongo write failed for sql_id {failure['sql_id']}: {failure['error']}")
 
-    try:
-        mongo_author = MongoAuthor(
-            full_name=row["author_full_name"],
-            title=row["author_title"],
-        )
 
-        mongo_article = MongoScientificArticle(
-            sql_id=int(row["sql_article_id"]),
-            title=row["title"],
-            summary=row["summary"],
-            arxiv_id=row["arxiv_id"],
-            text=extract_text_from_html(row["html_content"]), 
-            author=mongo_author,
-        )
-        
-        if not MongoScientificArticle.objects(sql_id=mongo_article.sql_id).first():
-            mongo_article.save()
-        
-    except Exception as e:
-        pass
+def load_csv_to_dataframe(csv_path: str) -> pd.DataFrame:
+    return load_csv(csv_path, as_strings=True)
+
+
+@timed("fetch")
+def fetch_arxiv_data(
+    query: str, max_results: int = 5, cache: Optional[HttpCache] = None
+) -> pd.DataFrame:
+    pages = list(
+        iter_arxiv_pages(query, max_results, page_size=max_results, cache=cache)
+    )
+    df = pd.concat(pages, ignore_index=True) if pages else rows_to_frame([])
+    return df.drop(columns=[PUBLISHED_COLUMN])
+
+
+def download_html_content(
+    row: pd.Series, cache: Optional[HttpCache] = None
+) -> pd.Series:
+    """Download one article page; `download_html_contents` does many in parallel."""
+    with HtmlDownloader(cache=cache) as downloader:
+        row["html_content"] = downloader.download_one(row["arxiv_id"])
+    return row
 
 
-def load_csv_to_dataframe(csv_path: str) -> pd.DataFrame:
-    if not Path(csv_path).exists():
-        raise FileNotFoundError(f"The file at {csv_path} does not exist.")
+def print_rejected_rows(report: SQLLoadReport) -> None:
+    for rejected in report.rejected:
+        print(f"SQL load rejected arxiv_id {rejected['arxiv_id']}: {rejected['error']}")
 
-    df_temp = pd.read_csv(csv_path, nrows=1)
-    string_dtypes = {col: 'string' for col in df_temp.columns}
-    
-    df = pd.read_csv(csv_path, dtype=string_dtypes)
-    return df
 
+def load_data_into_dbs(
+    df: pd.DataFrame,
+    sql_engine: Engine,
+    batch_size: int = 500,
+    sql_report: Optional[SQLLoadReport] = None,
+    sync_mongo: bool = True,
+    search_index: Optional[BM25Index] = None,
+    similarity_index: Optional[TfidfIndex] = None,
+    deduplicator: Optional[MinHashDeduplicator] = None,
+    mongo_report: Optional[MongoWriteReport] = None,
+) -> pd.DataFrame:
+    SQLBase.metadata.create_all(bind=sql_engine)
+    sql_report = sql_report if sql_report is not None else SQLLoadReport()
+    mongo_report = mongo_report if mongo_report is not None else MongoWriteReport()
 
-def fetch_arxiv_data(query: str, max_results: int = 5) -> pd.DataFrame:
-    ARXIV_URL = "http://export.arxiv.org/api/query?"
-    params = {
-        "search_query": f"all:{query}",
-        "start": 0,
-        "max_results": max_results,
-        "sortBy": "submittedDate",
-        "sortOrder": "descending",
-    }
-    
-    response = requests.get(ARXIV_URL, params=params)
-    response.raise_for_status()
-    
-    ns = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
-    root = ET.fromstring(response.content)
-    
-    articles_data: List[Dict[str, Any]] = []
-
-    for entry in root.findall("atom:entry", ns):
-        
-        author_element = entry.find("atom:author", ns)
-        author_name = author_element.find("atom:name", ns).text if author_element and author_element.find("atom:name", ns) is not None else "Unknown Author"
-        
-        title = entry.find("atom:title", ns).text.strip() if entry.find("atom:title", ns) is not None else ""
-        summary = entry.find("atom:summary", ns).text.strip() if entry.find("atom:summary", ns) is not None else ""
-        
-        arxiv_id_full = entry.find("atom:id", ns).text
-        arxiv_id = arxiv_id_full.split('/')[-1] if arxiv_id_full else ""
-        
-        article_row = {
-            "title": title,
-            "summary": summary,
-            "file_path": f"arxiv_pdf/{arxiv_id}.pdf",
-            "arxiv_id": arxiv_id,
-            "author_full_name": author_name,
-            "author_title": "ArXiv Contributor",
-            "html_content": "",
-        }
-        articles_data.append(article_row)
-
-    df = pd.DataFrame(articles_data).astype('string')
-    return df
+    with span("sql_load"), Session(sql_engine) as session:
+        df = bulk_load_articles(
+            df, session, batch_size, sql_report, outbox=not sync_mongo
+        )
+    print_rejected_rows(sql_report)
+    originals = df
+    if deduplicator is not None:
+        with span("dedup"), Session(sql_engine) as session:
+            df = deduplicator.mark_duplicates(session, df)
+        originals = df[df["duplicate_of"] == -1]
+        if len(originals) < len(df):
+            print(f"Collapsed {len(df) - len(originals)} near-duplicate articles")
+    with span("index"):
+        if search_index is not None:
+            search_index.add_articles(originals)
+        if similarity_index is not None:
+            similarity_index.add_articles(originals)
+    if not sync_mongo:
+        return df
 
+    setup_mongodb_connection()
+    with span("mongo_load"):
+        report = bulk_write_articles(originals, batch_size)
+    mongo_report.merge(report)
+    get_search_cache().bump()
+    for failure in report.failures:
+        print(f"Mongo write failed for sql_id {failure['sql_id']}: {failure['error']}")
 
-def download_html_content(row: pd.Series) -> pd.Series:
-    arxiv_id = row["arxiv_id"]
-    if not arxiv_id:
-        row["html_content"] = "<html><body>No ArXiv ID</body></html>"
-        return row
-    
-    html_url = f"https://arxiv.org/abs/{arxiv_id}"
-    
-    try:
-        time.sleep(0.5) 
-        response = requests.get(html_url, timeout=10)
-        response.raise_for_status() 
-        
-        row["html_content"] = response.text
-    except Exception as e:
-        row["html_content"] = f"<html><body>Error fetching content: {e}</body></html>"
-        
-    return row
+    return df
 
 
-def load_data_into_dbs(df: pd.DataFrame, sql_engine) -> pd.DataFrame:
-    
-    df["sql_article_id"] = pd.NA
-    df["sql_author_id"] = pd.NA
-    
+def load_data_into_dbs_streaming(
+    chunks: Iterable[pd.DataFrame],
+    sql_engine: Engine,
+    queue_size: int = 2,
+    batch_size: int = 500,
+    sql_report: Optional[SQLLoadReport] = None,
+) -> Tuple[pd.DataFrame, MongoWriteReport]:
+    """Load DataFrame chunks with the SQL and Mongo stages running side by side.
+
+    Chunk N+1 goes into MariaDB while chunk N is written to Mongo. The bounded queue
+    between the stages blocks the SQL stage when Mongo falls behind, so at most
+    `queue_size + 2` chunks are held at once. Returns the id columns of every row
+    and the combined Mongo write report.
+    """
     SQLBase.metadata.create_all(bind=sql_engine)
-
-    with next(get_sql_session()) as session:
-        df = df.apply(lambda row: save_article_to_mariadb(row, session), axis=1)
-        session.commit()
-        
     setup_mongodb_connection()
-    df.apply(save_article_to_mongodb, axis=1)
-    
-    return df
+    sql_report = sql_report if sql_report is not None else SQLLoadReport()
+
+    pending: "queue.Queue[Optional[pd.DataFrame]]" = queue.Queue(maxsize=queue_size)
+    report = MongoWriteReport()
+    errors: List[BaseException] = []
+
+    def mongo_stage() -> None:
+        while True:
+            chunk = pending.get()
+            if chunk is None:
+                return
+            if errors:
+                continue
+            try:
+                with span("mongo_load"):
+                    report.merge(bulk_write_articles(chunk, batch_size))
+            except Exception as e:
+                errors.append(e)
+
+    worker = threading.Thread(target=mongo_stage, name="mongo-stage", daemon=True)
+    worker.start()
+
+    id_frames: List[pd.DataFrame] = []
+    try:
+        with Session(sql_engine) as session:
+            for chunk in chunks:
+                if errors:
+                    break
+                with span("sql_load"):
+                    loaded = bulk_load_articles(chunk, session, batch_size, sql_report)
+                pending.put(loaded)
+                id_frames.append(loaded[ID_COLUMNS])
+    finally:
+        pending.put(None)
+        worker.join()
+        get_search_cache().bump()
+
+    print_rejected_rows(sql_report)
+    if errors:
+        raise errors[0]
+    if not id_frames:
+        return pd.DataFrame(columns=ID_COLUMNS), report
+    return pd.concat(id_frames, ignore_index=True), report
 
 
 def clear_mongo_collection(collection_class: type[MongoScientificArticle]) -> None:
     setup_mongodb_connection()
     collection_class.objects.delete()
+    get_search_cache().bump()
 
 
-def search_newly_ingested_data(query: str) -> QuerySet:
-    setup_mongodb_connection()
+def search_newly_ingested_data(query: str) -> SearchPage:
     return search_mongodb_articles(query)
 
-def search_mongodb_articles(search_term: str) -> QuerySet:
-    setup_mongodb_connection()
-    results = MongoScientificArticle.objects.search_text(search_term)
-    return results
\ No newline at end of file
+
+@timed("search")
+def search_mongodb_articles(
+    search_term: str,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+) -> SearchPage:
+    """Top `limit` articles by text score; pass `next_cursor` for the next page.
+
+    Pages are served from the search cache until the collection is written to.
+    """
+
+    def run_search() -> SearchPage:
+        setup_mongodb_connection()
+        return search_articles(search_term, limit=limit, cursor=cursor, fields=fields)
+
+    key = ("mongo", search_term, limit, cursor, tuple(fields))
+    return get_search_cache().cached(key, run_search)
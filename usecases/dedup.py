@@ -0,0 +1,216 @@
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from models.article_models import ArticleLSHBucket, ArticleOutbox, ArticleSignature
+from usecases.similarity import article_text
+
+_WORD = re.compile(r"\w+")
+_MERSENNE = np.uint64((1 << 61) - 1)
+
+
+def shingle_hashes(text: str, k: int = 5) -> NDArray[np.uint64]:
+    """32-bit hashes of the distinct k-word shingles of `text`."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    hashes = np.array([zlib.crc32(w.encode("utf-8")) for w in words], dtype=np.uint64)
+    k = min(k, len(hashes))
+    # Polynomial rolling hash; uint64 arithmetic wraps, which is what we want.
+    with np.errstate(over="ignore"):
+        combined = np.zeros(len(hashes) - k + 1, dtype=np.uint64)
+        for offset in range(k):
+            combined = (
+                combined * np.uint64(1_000_003)
+                + hashes[offset : offset + len(combined)]
+            )
+    return np.unique(combined & np.uint64(0xFFFFFFFF))
+
+
+@dataclass
+class DedupReport:
+    checked: int = 0
+    duplicates: int = 0
+
+
+class MinHashDeduplicator:
+    """Near-duplicate detection with MinHash signatures and LSH banding.
+
+    A signature has `bands * rows` minimum hashes. Articles sharing any band are
+    candidates, and a candidate is a duplicate when the share of equal minimums
+    (the Jaccard estimate) reaches `threshold`. Bands are stored as indexed
+    bucket keys in `article_lsh_buckets`, so a lookup reads a handful of rows
+    whatever the corpus size. Duplicates keep their SQL row and are recorded in
+    `article_signatures.duplicate_of` but never enter the buckets themselves.
+    """
+
+    def __init__(
+        self,
+        bands: int = 16,
+        rows: int = 8,
+        threshold: float = 0.8,
+        shingle_size: int = 5,
+        seed: int = 1,
+    ) -> None:
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        num_perm = bands * rows
+        # a * x stays below 2**61 for 32-bit x, so (a * x + b) cannot overflow.
+        self._a = rng.integers(1, 1 << 29, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 61, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> NDArray[np.uint64]:
+        shingles = shingle_hashes(text, self.shingle_size)
+        if not len(shingles):
+            return np.full(len(self._a), int(_MERSENNE), dtype=np.uint64)
+        permuted = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % _MERSENNE
+        minimums: NDArray[np.uint64] = permuted.min(axis=1)
+        return minimums
+
+    def band_keys(self, signature: NDArray[np.uint64]) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows : (band + 1) * self.rows]
+            digest = hashlib.blake2b(
+                band.to_bytes(2, "little") + chunk.tobytes(), digest_size=8
+            ).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def similarity(self, a: NDArray[np.uint64], b: NDArray[np.uint64]) -> float:
+        return float(np.mean(a == b))
+
+    def _known(self, session: Session, article_ids: List[int]) -> Dict[int, int]:
+        rows = session.execute(
+            select(ArticleSignature.article_id, ArticleSignature.duplicate_of).where(
+                ArticleSignature.article_id.in_(article_ids)
+            )
+        )
+        return {article_id: dup or -1 for article_id, dup in rows}
+
+    def _candidates(self, session: Session, keys: List[int]) -> Dict[int, Set[int]]:
+        candidates: Dict[int, Set[int]] = {}
+        for start in range(0, len(keys), 1000):
+            rows = session.execute(
+                select(ArticleLSHBucket.bucket, ArticleLSHBucket.article_id).where(
+                    ArticleLSHBucket.bucket.in_(keys[start : start + 1000])
+                )
+            )
+            for bucket, article_id in rows:
+                candidates.setdefault(bucket, set()).add(article_id)
+        return candidates
+
+    def _signatures(
+        self, session: Session, article_ids: Set[int]
+    ) -> Dict[int, NDArray[np.uint64]]:
+        if not article_ids:
+            return {}
+        rows = session.execute(
+            select(ArticleSignature.article_id, ArticleSignature.signature).where(
+                ArticleSignature.article_id.in_(article_ids)
+            )
+        )
+        return {
+            article_id: np.frombuffer(raw, dtype=np.uint64) for article_id, raw in rows
+        }
+
+    def _best_match(
+        self,
+        signature: NDArray[np.uint64],
+        candidates: Set[int],
+        stored: Dict[int, NDArray[np.uint64]],
+    ) -> int:
+        best, best_score = -1, 0.0
+        for candidate in sorted(candidates):
+            score = self.similarity(signature, stored[candidate])
+            if score >= self.threshold and score > best_score:
+                best, best_score = candidate, score
+        return best
+
+    def mark_duplicates(
+        self,
+        session: Session,
+        df: pd.DataFrame,
+        report: Optional[DedupReport] = None,
+    ) -> pd.DataFrame:
+        """Add a `duplicate_of` column (-1 for originals) and record the batch.
+
+        Articles seen in an earlier run keep their earlier verdict, and articles
+        without a single word are never duplicates. Pending outbox entries of new
+        duplicates are dropped so they never reach Mongo either.
+        """
+        report = report if report is not None else DedupReport()
+        df = df.copy()
+        ids = [int(i) for i in df["sql_article_id"]]
+        verdicts = self._known(session, [i for i in ids if i != -1])
+        verdicts[-1] = -1
+
+        pending: List[Tuple[int, NDArray[np.uint64], List[int]]] = []
+        seen: Set[int] = set(verdicts)
+        for row in df.to_dict("records"):
+            article_id = int(row["sql_article_id"])
+            if article_id in seen:
+                continue
+            seen.add(article_id)
+            text = article_text(row)
+            signature = self.signature(text)
+            # Texts without words share one signature; leaving them out of the
+            # buckets keeps them from matching each other.
+            keys = self.band_keys(signature) if _WORD.search(text) else []
+            pending.append((article_id, signature, keys))
+
+        all_keys = [key for _, _, keys in pending for key in keys]
+        buckets = self._candidates(session, all_keys)
+        stored = self._signatures(session, set().union(*buckets.values()))
+        new_duplicates: List[int] = []
+        signature_rows: List[Dict[str, object]] = []
+        bucket_rows: List[Dict[str, int]] = []
+        for article_id, signature, keys in pending:
+            report.checked += 1
+            candidates = set().union(*(buckets.get(key, set()) for key in keys))
+            candidates.discard(article_id)
+            best = self._best_match(signature, candidates, stored)
+            verdicts[article_id] = best
+
+            signature_rows.append(
+                {
+                    "article_id": article_id,
+                    "signature": signature.tobytes(),
+                    "duplicate_of": None if best == -1 else best,
+                }
+            )
+            if best != -1:
+                new_duplicates.append(article_id)
+                report.duplicates += 1
+                continue
+            # Later rows of the same batch must see this article as a candidate.
+            stored[article_id] = signature
+            for key in keys:
+                buckets.setdefault(key, set()).add(article_id)
+                bucket_rows.append({"bucket": key, "article_id": article_id})
+
+        if signature_rows:
+            session.execute(insert(ArticleSignature.__table__), signature_rows)
+        if bucket_rows:
+            session.execute(insert(ArticleLSHBucket.__table__), bucket_rows)
+
+        if new_duplicates:
+            session.query(ArticleOutbox).filter(
+                ArticleOutbox.article_id.in_(new_duplicates),
+                ArticleOutbox.delivered_at.is_(None),
+            ).delete(synchronize_session=False)
+        session.commit()
+
+        df["duplicate_of"] = np.array([verdicts[i] for i in ids], dtype=np.int64)
+        return df
@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from usecases.http_cache import HttpCache
+from usecases.instrumentation import timed
+
+ARXIV_ABS_URL = "https://arxiv.org/abs/{arxiv_id}"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """Caps the number of in-flight requests per host."""
+
+    def __init__(self, per_host: int) -> None:
+        self.per_host = per_host
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+
+class HtmlDownloader:
+    """Downloads article pages on a bounded thread pool over one keep-alive session."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        rate_per_second: float = 4.0,
+        burst: Optional[float] = None,
+        per_host_limit: int = 4,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 10.0,
+        url_template: str = ARXIV_ABS_URL,
+        cache: Optional[HttpCache] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.url_template = url_template
+        self.cache = cache
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.hosts = HostLimiter(per_host_limit)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> "HtmlDownloader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def fetch(self, url: str) -> str:
+        if self.cache is not None:
+            cached = self.cache.fresh_text(url)
+            if cached is not None:
+                return cached
+
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                with self.hosts.for_url(url):
+                    if self.cache is not None:
+                        return self.cache.fetch_text(
+                            url, session=self.session, timeout=self.timeout
+                        )
+                    response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                return response.text
+            except requests.RequestException as e:
+                # Without a response only dropped connections and timeouts are
+                # transient; InvalidURL, MissingSchema and the like are not.
+                if e.response is not None:
+                    retryable = e.response.status_code in RETRY_STATUSES
+                else:
+                    retryable = isinstance(e, RETRY_EXCEPTIONS)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                time.sleep(self.backoff_factor * (2**attempt))
+                attempt += 1
+
+    def download_one(self, arxiv_id: str) -> str:
+        if pd.isna(arxiv_id) or not arxiv_id:
+            return "<html><body>No ArXiv ID</body></html>"
+        try:
+            return self.fetch(self.url_template.format(arxiv_id=arxiv_id))
+        except Exception as e:
+            return f"<html><body>Error fetching content: {e}</body></html>"
+
+    def download_all(self, arxiv_ids: Iterable[str]) -> List[str]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.download_one, arxiv_ids))
+
+
+@timed("download")
+def download_html_contents(
+    df: pd.DataFrame, downloader: Optional[HtmlDownloader] = None
+) -> pd.DataFrame:
+    df = df.copy()
+    if downloader is None:
+        with HtmlDownloader() as owned:
+            pages = owned.download_all(df["arxiv_id"].tolist())
+    else:
+        pages = downloader.download_all(df["arxiv_id"].tolist())
+    df["html_content"] = pd.Series(pages, index=df.index, dtype="string")
+    return df
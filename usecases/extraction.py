@@ -0,0 +1,148 @@
+import hashlib
+import importlib.util
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import html2text
+import pandas as pd
+
+from usecases.instrumentation import timed
+
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_lxml_parser: Any = None
+
+
+def html2text_extract(html_content: str) -> str:
+    # HTML2Text keeps parser state (open <pre>/<blockquote>) between handle()
+    # calls, so a fresh converter per page is needed for stable output.
+    h = html2text.HTML2Text()
+    h.ignore_links = True
+    h.ignore_images = True
+    return h.handle(html_content).strip()
+
+
+def lxml_extract(html_content: str) -> str:
+    """Faster plain-text extraction with lxml; drops markdown formatting."""
+    global _lxml_parser
+    import lxml.html
+
+    if _lxml_parser is None:
+        _lxml_parser = lxml.html.HTMLParser(remove_comments=True)
+    if not html_content.strip():
+        return ""
+
+    root = lxml.html.document_fromstring(html_content, parser=_lxml_parser)
+    for element in list(root.iter("script", "style", "noscript")):
+        element.drop_tree()
+    for element in root.iter("p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4"):
+        element.tail = "\n" + (element.tail or "")
+
+    text = _WHITESPACE.sub(" ", root.text_content())
+    lines = (line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "html2text": html2text_extract,
+    "lxml": lxml_extract,
+}
+
+
+def content_hash(html_content: str) -> str:
+    return hashlib.blake2b(html_content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TextExtractor:
+    """HTML-to-text stage: memoized by content hash, parallel on a process pool.
+
+    Batches with fewer than `min_parallel` unseen pages are converted in-process,
+    where pool start-up would cost more than it saves.
+    """
+
+    def __init__(
+        self,
+        engine: str = "html2text",
+        max_workers: Optional[int] = None,
+        memo_size: int = 10_000,
+        min_parallel: int = 16,
+        chunksize: int = 8,
+    ) -> None:
+        if engine not in EXTRACTORS:
+            raise ValueError(
+                f"Unknown extractor {engine!r}, use one of {list(EXTRACTORS)}"
+            )
+        if engine == "lxml" and importlib.util.find_spec("lxml") is None:
+            raise ValueError(
+                "The lxml extractor needs lxml (pip install -r requirements.txt);"
+                " use engine='html2text' without it"
+            )
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.memo_size = memo_size
+        self.min_parallel = min_parallel
+        self.chunksize = chunksize
+        self.memo: "OrderedDict[str, str]" = OrderedDict()
+        self.memo_hits = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "TextExtractor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _remember(self, key: str, text: str) -> None:
+        self.memo[key] = text
+        self.memo.move_to_end(key)
+        while len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+
+    def extract_many(self, pages: List[str]) -> List[str]:
+        keys = [content_hash(page) for page in pages]
+        results: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+        for key, page in zip(keys, pages):
+            if key in self.memo:
+                self.memo.move_to_end(key)
+                self.memo_hits += 1
+                results[key] = self.memo[key]
+            elif key not in pending:
+                pending[key] = page
+
+        func = EXTRACTORS[self.engine]
+        todo = list(pending.values())
+        if len(todo) < self.min_parallel or self.max_workers == 1:
+            texts = [func(page) for page in todo]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            texts = list(self._pool.map(func, todo, chunksize=self.chunksize))
+
+        for key, text in zip(pending.keys(), texts):
+            results[key] = text
+            self._remember(key, text)
+        return [results[key] for key in keys]
+
+
+@timed("extract")
+def extract_texts(
+    df: pd.DataFrame, extractor: Optional[TextExtractor] = None
+) -> pd.DataFrame:
+    df = df.copy()
+    pages = df["html_content"].fillna("").astype(str).tolist()
+    if extractor is None:
+        with TextExtractor() as owned:
+            texts = owned.extract_many(pages)
+    else:
+        texts = extractor.extract_many(pages)
+    df["text"] = pd.Series(texts, index=df.index, dtype="string")
+    return df
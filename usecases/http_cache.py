@@ -0,0 +1,279 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Mapping, Optional
+from urllib.parse import urlencode
+
+import requests
+
+from storage.local_store import CACHE_ROOT
+
+DEFAULT_CACHE_DIR = CACHE_ROOT / "http"
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    path: Path
+    encoding: str
+
+    def open(self) -> IO[bytes]:
+        return self.path.open("rb")
+
+    def text(self) -> str:
+        return self.path.read_bytes().decode(self.encoding, errors="replace")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / total if total else 0.0
+
+
+class HttpCache:
+    """On-disk cache of response bodies keyed by URL and query params.
+
+    Entries younger than `max_age` seconds are served without a request; older ones
+    are revalidated with ETag/Last-Modified. The total body size is capped at
+    `max_bytes` by evicting the least recently used entries.
+
+    Eviction never removes an entry that a fetch is still returning or reading,
+    so `fresh_text`, `fetch_text` and `open_fetched` always see their body; a
+    CacheEntry kept after `fetch` returns can still be evicted later.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_age: float = 24 * 3600,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._pinned: Dict[str, int] = {}
+        self._db = sqlite3.connect(
+            str(self.directory / "index.sqlite3"), check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, url TEXT NOT NULL, etag TEXT,"
+            " last_modified TEXT, encoding TEXT NOT NULL, size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.body"
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, encoding, stored_at FROM entries"
+                " WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None or not self._body_path(key).exists():
+            return None
+        etag, last_modified, encoding, stored_at = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": encoding,
+            "stored_at": stored_at,
+        }
+
+    @contextmanager
+    def _pin(self, key: str) -> Iterator[None]:
+        with self._lock:
+            self._pinned[key] = self._pinned.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pinned[key] -= 1
+                if not self._pinned[key]:
+                    del self._pinned[key]
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def _touch(self, key: str, refreshed: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._db.execute(
+                    "UPDATE entries SET last_access = ?, stored_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+            else:
+                self._db.execute(
+                    "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+                )
+            self._db.commit()
+
+    def fresh(
+        self, url: str, params: Optional[Mapping[str, Any]] = None
+    ) -> Optional[CacheEntry]:
+        """Return the cached entry if it can be served without any request."""
+        key = self.make_key(url, params)
+        entry = self._lookup(key)
+        if entry is None or time.time() - entry["stored_at"] > self.max_age:
+            return None
+        self._touch(key)
+        self._count("hits")
+        return CacheEntry(key, self._body_path(key), entry["encoding"])
+
+    def fresh_text(
+        self, url: str, params: Optional[Mapping[str, Any]] = None
+    ) -> Optional[str]:
+        """`fresh`, with the body read before it can be evicted."""
+        with self._pin(self.make_key(url, params)):
+            cached = self.fresh(url, params)
+            return cached.text() if cached is not None else None
+
+    def fetch(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+    ) -> CacheEntry:
+        """Return the body for `url`, from disk when fresh or still valid."""
+        with self._pin(self.make_key(url, params)):
+            return self._fetch(url, params, session, timeout)
+
+    def fetch_text(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """`fetch`, with the body read before it can be evicted."""
+        with self._pin(self.make_key(url, params)):
+            return self._fetch(url, params, session, timeout).text()
+
+    @contextmanager
+    def open_fetched(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[IO[bytes]]:
+        """`fetch` and open the body; it is not evicted while open."""
+        with self._pin(self.make_key(url, params)):
+            with self._fetch(url, params, session, timeout).open() as body:
+                yield body
+
+    def _fetch(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        session: Optional[requests.Session],
+        timeout: Optional[float],
+    ) -> CacheEntry:
+        cached = self.fresh(url, params)
+        if cached is not None:
+            return cached
+
+        key = self.make_key(url, params)
+        entry = self._lookup(key)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        get = session.get if session is not None else requests.get
+        with get(
+            url, params=params, headers=headers, stream=True, timeout=timeout
+        ) as response:
+            if response.status_code == 304 and entry is not None:
+                self._touch(key, refreshed=True)
+                self._count("revalidated")
+                return CacheEntry(key, self._body_path(key), entry["encoding"])
+
+            response.raise_for_status()
+            response.raw.decode_content = True
+            path = self._body_path(key)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            size = 0
+            with tmp_path.open("wb") as f:
+                for chunk in iter(lambda: response.raw.read(64 * 1024), b""):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+            encoding = response.encoding or "utf-8"
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, encoding, size, now, now),
+            )
+            self._db.commit()
+        self._count("misses")
+        self.evict()
+        return CacheEntry(key, path, encoding)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            (total,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return int(total)
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache fits in `max_bytes`.
+
+        Pinned entries, those a fetch is returning or reading, are skipped, so
+        the total can stay above `max_bytes` until they are released.
+        """
+        with self._lock:
+            (total,) = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            if total <= self.max_bytes:
+                return
+            rows = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY last_access"
+            ).fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if key in self._pinned:
+                    continue
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._body_path(key).unlink(missing_ok=True)
+                total -= size
+                self.stats.evictions += 1
+            self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
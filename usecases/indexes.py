@@ -0,0 +1,209 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import MetaData, func, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+from db_project.orm_models import Base as UserBase
+from db_project.orm_models import User
+from models.article_models import (
+    ArticleOutbox,
+    MongoScientificArticle,
+    ScientificArticle,
+    SQLBase,
+)
+
+
+# Below this many rows MariaDB prefers a full scan even when an index fits,
+# so smaller tables are not held to their plans.
+MIN_PLAN_ROWS = 1000
+
+
+class QueryPlanError(Exception):
+    pass
+
+
+@dataclass
+class HotQuery:
+    name: str
+    statement: Select
+
+
+@dataclass
+class MongoHotQuery:
+    name: str
+    filter: Dict[str, Any]
+
+
+def article_hot_queries(now: Optional[datetime] = None) -> List[HotQuery]:
+    """The hot article queries, with "articles since" relative to `now`."""
+    now = now if now is not None else datetime.now()
+    return [
+        HotQuery(
+            "articles by author",
+            select(ScientificArticle.id).where(ScientificArticle.author_id == 1),
+        ),
+        HotQuery(
+            "recent articles",
+            select(ScientificArticle.id)
+            .order_by(ScientificArticle.created_at.desc())
+            .limit(20),
+        ),
+        HotQuery(
+            "articles since",
+            # Only the last day, so the cutoff stays selective and the
+            # created_at index is the right plan; an old cutoff matches most
+            # rows, where a scan would be.
+            select(ScientificArticle.id).where(
+                ScientificArticle.created_at >= now - timedelta(days=1)
+            ),
+        ),
+        HotQuery(
+            "pending outbox",
+            select(ArticleOutbox.id).where(ArticleOutbox.delivered_at.is_(None)),
+        ),
+    ]
+
+
+USER_HOT_QUERIES = [
+    HotQuery("user by name", select(User.id).where(User.name == "pasindu")),
+]
+
+MONGO_HOT_QUERIES = [
+    MongoHotQuery("article by sql_id", {"sql_id": 1}),
+]
+
+
+def ensure_sql_indexes(sql_engine: Engine, metadata: MetaData) -> List[str]:
+    """Create the declared indexes missing from existing tables.
+
+    `create_all` only adds indexes together with a new table, so databases
+    created before an index was declared need this. Returns the created names.
+    """
+    inspector = inspect(sql_engine)
+    created: List[str] = []
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(sql_engine, checkfirst=True)
+                created.append(str(index.name))
+    return created
+
+
+def ensure_mongo_indexes() -> List[Any]:
+    """Create the indexes declared on `MongoScientificArticle`; returns the missing."""
+    missing: List[Any] = MongoScientificArticle.compare_indexes()["missing"]
+    MongoScientificArticle.ensure_indexes()
+    return missing
+
+
+def explain_sql(sql_engine: Engine, statement: Select) -> List[str]:
+    """Plan rows for `statement`, one readable line each."""
+    compiled = statement.compile(sql_engine)
+    positions = compiled.positiontup
+    if compiled.positional and positions is not None:
+        params: Any = tuple(compiled.params[name] for name in positions)
+    else:
+        params = compiled.params
+
+    dialect = sql_engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    with sql_engine.connect() as conn:
+        result = conn.exec_driver_sql(prefix + str(compiled), params)
+        if dialect == "sqlite":
+            return [row.detail for row in result]
+        return [
+            f"{row._mapping['table']}: type={row._mapping['type']} "
+            f"key={row._mapping['key']}"
+            for row in result
+        ]
+
+
+def is_full_scan(plan_line: str) -> bool:
+    if plan_line.startswith("SCAN "):
+        return "INDEX" not in plan_line
+    return "type=ALL" in plan_line
+
+
+def _find_stage(plan: Any, stage: str) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage:
+            return True
+        return any(_find_stage(value, stage) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_find_stage(value, stage) for value in plan)
+    return False
+
+
+def _row_count(sql_engine: Engine, statement: Select) -> int:
+    with sql_engine.connect() as conn:
+        return max(
+            conn.scalar(select(func.count()).select_from(table)) or 0
+            for table in statement.get_final_froms()
+        )
+
+
+def check_sql_plans(
+    sql_engine: Engine, queries: List[HotQuery], min_rows: int = 0
+) -> List[str]:
+    """Describe every hot query that falls back to a full table scan.
+
+    Queries whose tables all hold fewer than `min_rows` rows are skipped.
+    """
+    problems: List[str] = []
+    for query in queries:
+        if min_rows and _row_count(sql_engine, query.statement) < min_rows:
+            continue
+        for line in explain_sql(sql_engine, query.statement):
+            if is_full_scan(line):
+                problems.append(f"{query.name}: {line}")
+    return problems
+
+
+def check_mongo_plans(queries: Optional[List[MongoHotQuery]] = None) -> List[str]:
+    collection = MongoScientificArticle._get_collection()
+    problems: List[str] = []
+    for query in queries if queries is not None else MONGO_HOT_QUERIES:
+        plan = collection.find(query.filter).explain()["queryPlanner"]
+        if _find_stage(plan["winningPlan"], "COLLSCAN"):
+            problems.append(f"{query.name}: COLLSCAN on {query.filter}")
+    return problems
+
+
+def verify_query_plans(
+    sql_engine: Optional[Engine] = None,
+    user_engine: Optional[Engine] = None,
+    mongo: bool = False,
+    min_rows: int = MIN_PLAN_ROWS,
+) -> None:
+    """Raise QueryPlanError when any hot query on the given stores scans.
+
+    SQL tables with fewer than `min_rows` rows are not checked.
+    """
+    problems: List[str] = []
+    if sql_engine is not None:
+        problems += check_sql_plans(sql_engine, article_hot_queries(), min_rows)
+    if user_engine is not None:
+        problems += check_sql_plans(user_engine, USER_HOT_QUERIES, min_rows)
+    if mongo:
+        problems += check_mongo_plans()
+    if problems:
+        raise QueryPlanError("Full scans in hot queries:\n" + "\n".join(problems))
+
+
+if __name__ == "__main__":
+    from db_project.db_setup import engine as user_engine
+    from storage.db_setup import setup_mongodb_connection, sql_engine
+
+    setup_mongodb_connection()
+    SQLBase.metadata.create_all(bind=sql_engine)
+    print("Created SQL indexes:", ensure_sql_indexes(sql_engine, SQLBase.metadata))
+    print("Created user indexes:", ensure_sql_indexes(user_engine, UserBase.metadata))
+    print("Created Mongo indexes:", ensure_mongo_indexes())
+    verify_query_plans(sql_engine, user_engine, mongo=True)
+    print("All hot queries use an index.")
@@ -0,0 +1,229 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+
+# Eight sub-buckets per power of two keeps every bucket within 12.5% of its
+# values while covering nanoseconds to hours in a few hundred counters.
+_SUB_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BITS
+
+
+def _bucket(value_ns: int) -> int:
+    if value_ns < _SUB_BUCKETS:
+        return max(value_ns, 0)
+    exponent = value_ns.bit_length() - _SUB_BITS - 1
+    return (exponent + 1) * _SUB_BUCKETS + (value_ns >> exponent) - _SUB_BUCKETS
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index < _SUB_BUCKETS:
+        return float(index)
+    exponent = index // _SUB_BUCKETS - 1
+    mantissa = index % _SUB_BUCKETS + _SUB_BUCKETS
+    return (mantissa + 0.5) * (1 << exponent)
+
+
+@dataclass
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond durations.
+
+    Recording is a bit_length and an increment, and percentiles are read from
+    the bucket counts, so the cost per sample does not grow with the run.
+    """
+
+    counts: Dict[int, int] = field(default_factory=dict)
+    count: int = 0
+    total_ns: int = 0
+    min_ns: int = 0
+    max_ns: int = 0
+
+    def record(self, value_ns: int) -> None:
+        index = _bucket(value_ns)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if not self.count or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        self.max_ns = max(self.max_ns, value_ns)
+        self.count += 1
+        self.total_ns += value_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if other.count and (not self.count or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-th percentile (0-100) in nanoseconds."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(q / 100 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                estimate = _bucket_midpoint(index)
+                return min(max(estimate, self.min_ns), self.max_ns)
+        return float(self.max_ns)
+
+
+@dataclass
+class SpanStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    allocated_bytes: int = 0
+    max_allocated_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = self.latency
+        mean_ns = latency.total_ns / latency.count if latency.count else 0.0
+        return {
+            "count": latency.count,
+            "total_ms": latency.total_ns / 1e6,
+            "mean_ms": mean_ns / 1e6,
+            "p50_ms": latency.percentile(50) / 1e6,
+            "p95_ms": latency.percentile(95) / 1e6,
+            "p99_ms": latency.percentile(99) / 1e6,
+            "max_ms": latency.max_ns / 1e6,
+            "allocated_bytes": self.allocated_bytes,
+            "max_allocated_bytes": self.max_allocated_bytes,
+        }
+
+
+class Span:
+    """One timed section, used as a context manager.
+
+    `elapsed_ns` is set when it closes. A plain class rather than a generator
+    context manager keeps the overhead around 2 microseconds per span.
+    """
+
+    __slots__ = ("name", "start_ns", "elapsed_ns", "_owner", "_start_bytes")
+
+    def __init__(self, owner: "Instrumentation", name: str) -> None:
+        self.name = name
+        self.start_ns = 0
+        self.elapsed_ns = 0
+        self._owner = owner
+        self._start_bytes = -1
+
+    def __enter__(self) -> "Span":
+        if self._owner.track_allocations and tracemalloc.is_tracing():
+            self._start_bytes = tracemalloc.get_traced_memory()[0]
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.elapsed_ns = time.perf_counter_ns() - self.start_ns
+        allocated = 0
+        if self._start_bytes >= 0:
+            allocated = tracemalloc.get_traced_memory()[0] - self._start_bytes
+        self._owner.record(self.name, self.elapsed_ns, allocated)
+
+
+class Instrumentation:
+    """Aggregates span timings per name into histograms.
+
+    With `track_allocations`, tracemalloc is started and each span also records
+    the net bytes it left allocated; that roughly doubles the cost of Python
+    allocations, so it is off by default.
+    """
+
+    def __init__(self, track_allocations: bool = False) -> None:
+        self._stats: Dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+        self.track_allocations = False
+        if track_allocations:
+            self.enable_allocation_tracking()
+
+    def enable_allocation_tracking(self) -> None:
+        self.track_allocations = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def record(self, name: str, elapsed_ns: int, allocated_bytes: int = 0) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = SpanStats()
+            stats.latency.record(elapsed_ns)
+            stats.allocated_bytes += allocated_bytes
+            stats.max_allocated_bytes = max(stats.max_allocated_bytes, allocated_bytes)
+
+    def span(self, name: str) -> Span:
+        return Span(self, name)
+
+    def timed(
+        self, name: Optional[str] = None
+    ) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        """Decorator recording every call under `name` (default: the qualname)."""
+
+        def decorator(func: Callable[..., T]) -> Callable[..., T]:
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> T:
+                with self.span(label):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def export_json(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> str:
+        """A per-span latency table, slowest total first."""
+        rows = sorted(
+            self.snapshot().items(), key=lambda item: item[1]["total_ms"], reverse=True
+        )
+        lines: List[str] = [
+            f"{'span':<24}{'count':>7}{'total ms':>11}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'p99 ms':>10}"
+        ]
+        for name, stats in rows:
+            lines.append(
+                f"{name:<24}{stats['count']:>7}{stats['total_ms']:>11.2f}"
+                f"{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                f"{stats['p99_ms']:>10.3f}"
+            )
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=None)
+def get_instrumentation() -> Instrumentation:
+    return Instrumentation()
+
+
+def span(name: str) -> Span:
+    """`Instrumentation.span` on the process-wide instance."""
+    return get_instrumentation().span(name)
+
+
+def timed(name: Optional[str] = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """`Instrumentation.timed` on the process-wide instance."""
+    return get_instrumentation().timed(name)
@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import pandas as pd
+from mongoengine.errors import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models.article_models import MongoAuthor, MongoScientificArticle
+from usecases.extraction import html2text_extract
+from usecases.records import missing_to_none
+
+
+@dataclass
+class MongoWriteReport:
+    upserted: int = 0
+    matched: int = 0
+    skipped: int = 0
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def written(self) -> int:
+        return self.upserted + self.matched
+
+    def merge(self, other: "MongoWriteReport") -> None:
+        self.upserted += other.upserted
+        self.matched += other.matched
+        self.skipped += other.skipped
+        self.failures.extend(other.failures)
+
+
+def build_article_document(row: Dict[str, Any]) -> MongoScientificArticle:
+    text = missing_to_none(row.get("text"))
+    if text is None:
+        text = html2text_extract(row["html_content"])
+
+    return MongoScientificArticle(
+        sql_id=int(row["sql_article_id"]),
+        title=missing_to_none(row["title"]),
+        summary=missing_to_none(row["summary"]),
+        arxiv_id=missing_to_none(row["arxiv_id"]),
+        text=text,
+        author=MongoAuthor(
+            full_name=missing_to_none(row["author_full_name"]),
+            title=missing_to_none(row["author_title"]),
+        ),
+    )
+
+
+def _upsert(document: MongoScientificArticle) -> UpdateOne:
+    fields = document.to_mongo().to_dict()
+    fields.pop("_id", None)
+    return UpdateOne({"sql_id": document.sql_id}, {"$set": fields}, upsert=True)
+
+
+def write_batch(rows: List[Dict[str, Any]], report: MongoWriteReport) -> None:
+    operations: List[UpdateOne] = []
+    sql_ids: List[int] = []
+    for row in rows:
+        if row["sql_article_id"] == -1:
+            report.skipped += 1
+            continue
+        try:
+            document = build_article_document(row)
+            document.validate()
+        except (ValidationError, KeyError, TypeError, ValueError) as e:
+            report.failures.append({"sql_id": row["sql_article_id"], "error": str(e)})
+            continue
+        operations.append(_upsert(document))
+        sql_ids.append(document.sql_id)
+
+    if not operations:
+        return
+
+    collection = MongoScientificArticle._get_collection()
+    try:
+        result = collection.bulk_write(operations, ordered=False)
+        report.upserted += result.upserted_count
+        report.matched += result.matched_count
+    except BulkWriteError as e:
+        report.upserted += e.details.get("nUpserted", 0)
+        report.matched += e.details.get("nMatched", 0)
+        for error in e.details.get("writeErrors", []):
+            report.failures.append(
+                {"sql_id": sql_ids[error["index"]], "error": error.get("errmsg", "")}
+            )
+
+
+def bulk_write_articles(df: pd.DataFrame, batch_size: int = 500) -> MongoWriteReport:
+    """Upsert the Mongo copy of each loaded article, one unordered bulk_write per batch.
+
+    Rows that failed the SQL stage are skipped; documents that fail validation or
+    the write itself are listed in the report instead of being dropped silently.
+    """
+    report = MongoWriteReport()
+    for start in range(0, len(df), batch_size):
+        write_batch(df.iloc[start : start + batch_size].to_dict("records"), report)
+    return report
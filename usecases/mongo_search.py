@@ -0,0 +1,135 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from models.article_models import MongoScientificArticle
+from usecases.bm25_index import HitAuthor
+
+SEARCH_FIELDS = ("sql_id", "title", "summary", "arxiv_id", "author", "text")
+DEFAULT_FIELDS = ("title", "author", "text")
+
+
+@dataclass
+class SearchHit:
+    sql_id: int
+    score: float
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    arxiv_id: Optional[str] = None
+    author: Optional[HitAuthor] = None
+    text: Optional[str] = None
+
+
+@dataclass
+class SearchPage:
+    hits: List[SearchHit] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+    def __iter__(self) -> Iterator[SearchHit]:
+        return iter(self.hits)
+
+
+def encode_cursor(hit: SearchHit) -> str:
+    raw = json.dumps([hit.score, hit.sql_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    position: List[Any] = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    return position
+
+
+def search_pipeline(
+    search_term: str,
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    snippet_chars: Optional[int] = 80,
+) -> List[Dict[str, Any]]:
+    """Aggregation that ranks by text score and ships only `fields`.
+
+    Paging by `cursor` resumes after the last hit of the previous page, keyed on
+    (score, sql_id); `offset` skips hits instead and gets slower as it grows.
+    """
+    unknown = set(fields) - set(SEARCH_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown search fields {sorted(unknown)}")
+
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"$text": {"$search": search_term}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if cursor is not None:
+        score, sql_id = decode_cursor(cursor)
+        pipeline.append(
+            {
+                "$match": {
+                    "$or": [
+                        {"score": {"$lt": score}},
+                        {"score": score, "sql_id": {"$gt": sql_id}},
+                    ]
+                }
+            }
+        )
+    pipeline.append({"$sort": {"score": -1, "sql_id": 1}})
+    if offset:
+        pipeline.append({"$skip": offset})
+    pipeline.append({"$limit": limit})
+
+    projection: Dict[str, Any] = {"_id": 0, "sql_id": 1, "score": 1}
+    for name in fields:
+        projection[name] = 1
+    if "text" in fields and snippet_chars is not None:
+        projection["text"] = {"$substrCP": ["$text", 0, snippet_chars]}
+    pipeline.append({"$project": projection})
+    return pipeline
+
+
+def _to_hit(document: Dict[str, Any]) -> SearchHit:
+    author = document.get("author")
+    return SearchHit(
+        sql_id=document["sql_id"],
+        score=document["score"],
+        title=document.get("title"),
+        summary=document.get("summary"),
+        arxiv_id=document.get("arxiv_id"),
+        author=HitAuthor(**author) if author else None,
+        text=document.get("text"),
+    )
+
+
+def iter_search_hits(
+    search_term: str,
+    limit: int = 10,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    snippet_chars: Optional[int] = 80,
+) -> Iterator[SearchHit]:
+    """Stream one page of hits straight off the server cursor."""
+    collection = MongoScientificArticle._get_collection()
+    pipeline = search_pipeline(
+        search_term, limit, offset, cursor, fields, snippet_chars
+    )
+    for document in collection.aggregate(pipeline, batchSize=limit):
+        yield _to_hit(document)
+
+
+def search_articles(
+    search_term: str,
+    limit: int = 10,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    snippet_chars: Optional[int] = 80,
+) -> SearchPage:
+    hits = list(
+        iter_search_hits(search_term, limit, offset, cursor, fields, snippet_chars)
+    )
+    next_cursor = encode_cursor(hits[-1]) if len(hits) == limit else None
+    return SearchPage(hits=hits, next_cursor=next_cursor)
@@ -0,0 +1,110 @@
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.article_models import ArticleOutbox, SQLBase
+from storage.db_setup import setup_mongodb_connection
+from usecases.mongo_loader import MongoWriteReport, bulk_write_articles
+from usecases.search_cache import get_search_cache
+
+
+def pending_count(sql_engine: Engine) -> int:
+    with Session(sql_engine) as session:
+        return (
+            session.query(ArticleOutbox)
+            .filter(ArticleOutbox.delivered_at.is_(None))
+            .count()
+        )
+
+
+def drain_outbox(
+    sql_engine: Engine, batch_size: int = 500, max_attempts: int = 5
+) -> MongoWriteReport:
+    """Deliver one batch of undelivered outbox entries to Mongo.
+
+    Entries are only marked delivered after the bulk upsert has returned, so a crash
+    in between re-delivers them; the upsert on sql_id makes that harmless. Entries
+    that fail stay pending with their attempt count and last error, and are given
+    up on after `max_attempts`.
+    """
+    with Session(sql_engine) as session:
+        entries = (
+            session.query(ArticleOutbox)
+            .filter(ArticleOutbox.delivered_at.is_(None))
+            .filter(ArticleOutbox.attempts < max_attempts)
+            .order_by(ArticleOutbox.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not entries:
+            return MongoWriteReport()
+
+        df = pd.DataFrame([json.loads(entry.payload) for entry in entries])
+        report = bulk_write_articles(df, batch_size)
+
+        errors = {failure["sql_id"]: failure["error"] for failure in report.failures}
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for entry in entries:
+            entry.attempts += 1
+            if entry.article_id in errors:
+                entry.last_error = errors[entry.article_id]
+            else:
+                entry.delivered_at = now
+                entry.last_error = None
+        session.commit()
+    if report.written:
+        get_search_cache().bump()
+    return report
+
+
+class OutboxWorker(threading.Thread):
+    """Background thread that keeps draining the outbox into Mongo."""
+
+    def __init__(
+        self,
+        sql_engine: Engine,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+    ) -> None:
+        super().__init__(name="outbox-worker", daemon=True)
+        self.sql_engine = sql_engine
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.delivered = 0
+        self.last_error: Optional[BaseException] = None
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        SQLBase.metadata.create_all(bind=self.sql_engine)
+        setup_mongodb_connection()
+        while not self._stop_event.is_set():
+            try:
+                report = drain_outbox(self.sql_engine, self.batch_size)
+            except Exception as e:
+                self.last_error = e
+                self._stop_event.wait(self.poll_interval)
+                continue
+            self.delivered += report.written
+            if report.written + len(report.failures) == 0 or report.failures:
+                self._stop_event.wait(self.poll_interval)
+
+
+if __name__ == "__main__":
+    from storage.db_setup import sql_engine
+
+    worker = OutboxWorker(sql_engine)
+    worker.start()
+    try:
+        worker.join()
+    except KeyboardInterrupt:
+        worker.stop()
+        worker.join()
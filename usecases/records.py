@@ -0,0 +1,8 @@
+from typing import Any
+
+import pandas as pd
+
+
+def missing_to_none(value: Any) -> Any:
+    """NaN, NaT and pd.NA become None so SQL and Mongo store a null."""
+    return None if pd.isna(value) else value
@@ -0,0 +1,190 @@
+import functools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Hashable, Optional, Tuple
+
+from storage.local_store import CACHE_ROOT
+from usecases.bm25_index import HitAuthor
+from usecases.mongo_search import SearchHit, SearchPage
+
+DEFAULT_SEARCH_CACHE_DIR = CACHE_ROOT / "search"
+
+# Set to a directory (e.g. DEFAULT_SEARCH_CACHE_DIR) before the first search to
+# share pages and invalidation between processes through SQLite.
+SEARCH_CACHE_DIR: Optional[Path] = None
+
+_Key = Tuple[int, Hashable]
+
+
+@dataclass
+class SearchCacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    hit_seconds: float = 0.0
+    miss_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    @property
+    def mean_hit_ms(self) -> float:
+        served = self.hits + self.disk_hits
+        return 1000 * self.hit_seconds / served if served else 0.0
+
+    @property
+    def mean_miss_ms(self) -> float:
+        return 1000 * self.miss_seconds / self.misses if self.misses else 0.0
+
+
+def _dump_page(page: SearchPage) -> str:
+    return json.dumps(asdict(page))
+
+
+def _load_page(raw: str) -> SearchPage:
+    data = json.loads(raw)
+    hits = []
+    for hit in data["hits"]:
+        author = hit.pop("author")
+        hits.append(SearchHit(**hit, author=HitAuthor(**author) if author else None))
+    return SearchPage(hits=hits, next_cursor=data["next_cursor"])
+
+
+class SearchCache:
+    """LRU + TTL cache of search pages, with an optional SQLite tier on disk.
+
+    Keys carry the collection generation, which writers bump after changing the
+    articles collection, so pages computed before a write are never served after
+    it. With a `directory` the generation lives in the same SQLite file, which
+    lets several processes share both the pages and the invalidation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        directory: Optional[Path] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = SearchCacheStats()
+        self._memory: "OrderedDict[_Key, Tuple[float, SearchPage]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if directory is not None:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                str(Path(directory) / "search.sqlite3"),
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pages (key TEXT PRIMARY KEY,"
+                " generation INTEGER NOT NULL, stored_at REAL NOT NULL,"
+                " page TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS generation (id INTEGER PRIMARY KEY,"
+                " value INTEGER NOT NULL)"
+            )
+            self._db.execute("INSERT OR IGNORE INTO generation VALUES (1, 0)")
+
+    def generation(self) -> int:
+        if self._db is None:
+            return self._generation
+        with self._lock:
+            (value,) = self._db.execute(
+                "SELECT value FROM generation WHERE id = 1"
+            ).fetchone()
+        return int(value)
+
+    def bump(self) -> int:
+        """Invalidate every cached page; call after writing to the collection."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is None:
+                self._generation += 1
+                return self._generation
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("UPDATE generation SET value = value + 1 WHERE id = 1")
+            (value,) = self._db.execute(
+                "SELECT value FROM generation WHERE id = 1"
+            ).fetchone()
+            self._db.execute("DELETE FROM pages WHERE generation < ?", (value,))
+            self._db.execute("COMMIT")
+        return int(value)
+
+    def _get(self, key: _Key) -> Tuple[Optional[SearchPage], bool]:
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and now - cached[0] <= self.ttl:
+                self._memory.move_to_end(key)
+                return cached[1], False
+            if self._db is None:
+                return None, False
+            row = self._db.execute(
+                "SELECT stored_at, page FROM pages WHERE key = ?", (repr(key),)
+            ).fetchone()
+        if row is None or now - row[0] > self.ttl:
+            return None, False
+        page = _load_page(row[1])
+        self._remember(key, row[0], page)
+        return page, True
+
+    def _remember(self, key: _Key, stored_at: float, page: SearchPage) -> None:
+        with self._lock:
+            self._memory[key] = (stored_at, page)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _put(self, key: _Key, page: SearchPage) -> None:
+        now = time.time()
+        self._remember(key, now, page)
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                    (repr(key), key[0], now, _dump_page(page)),
+                )
+
+    def cached(self, key: Hashable, compute: Callable[[], SearchPage]) -> SearchPage:
+        """Return the page stored for `key`, running `compute` on a miss."""
+        start = time.perf_counter()
+        full_key = (self.generation(), key)
+        page, from_disk = self._get(full_key)
+        if page is not None:
+            with self._lock:
+                if from_disk:
+                    self.stats.disk_hits += 1
+                else:
+                    self.stats.hits += 1
+                self.stats.hit_seconds += time.perf_counter() - start
+            return page
+
+        page = compute()
+        self._put(full_key, page)
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.miss_seconds += time.perf_counter() - start
+        return page
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+@functools.lru_cache(maxsize=None)
+def get_search_cache() -> SearchCache:
+    """The process-wide cache; memory-only unless `SEARCH_CACHE_DIR` is set."""
+    return SearchCache(directory=SEARCH_CACHE_DIR)
@@ -0,0 +1,405 @@
+import heapq
+import json
+import math
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from storage.local_store import (
+    CACHE_ROOT,
+    manifest_stamp,
+    next_segment_path,
+    read_manifest,
+    write_manifest,
+)
+from usecases.bm25_index import tokenize
+
+DEFAULT_SIMILARITY_DIR = CACHE_ROOT / "tfidf"
+
+# A sparse row: global term ids and their weights.
+SparseRow = Tuple[NDArray[np.int64], NDArray[np.float32]]
+
+# Every TfidfSegment open in this process; compaction leaves their files in place.
+_OPEN_SEGMENTS: "weakref.WeakSet[TfidfSegment]" = weakref.WeakSet()
+
+
+@dataclass
+class SimilarArticle:
+    sql_id: int
+    score: float
+
+
+def article_text(row: Dict[str, Any]) -> str:
+    parts = [row.get("title"), row.get("summary"), row.get("text")]
+    return "\n".join(str(part) for part in parts if not pd.isna(part))
+
+
+class TfidfSegment:
+    """One append of the TF-IDF matrix, kept both row-major and column-major.
+
+    Rows give an article's own vector for "more like this"; columns let a query
+    touch only the postings of its terms. Weights are sublinear term frequencies
+    (1 + log tf); idf and the L2 norms are applied at query time, because they
+    change as segments are added.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.indptr: NDArray[np.int64] = self._load("indptr")
+        self.terms: NDArray[np.uint32] = self._load("terms")
+        self.weights: NDArray[np.float32] = self._load("weights")
+        self.col_ptr: NDArray[np.int64] = self._load("col_ptr")
+        self.col_docs: NDArray[np.uint32] = self._load("col_docs")
+        self.col_weights: NDArray[np.float32] = self._load("col_weights")
+        self.sql_ids: NDArray[np.int64] = self._load("sql_ids")
+        _OPEN_SEGMENTS.add(self)
+
+    def _load(self, name: str) -> NDArray[Any]:
+        # Plain ndarray views of the mapping; slicing a np.memmap is much slower.
+        return np.asarray(np.load(self.path / f"{name}.npy", mmap_mode="r"))
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.sql_ids)
+
+    def row(self, local_id: int) -> SparseRow:
+        start, end = self.indptr[local_id], self.indptr[local_id + 1]
+        return self.terms[start:end].astype(np.int64), np.asarray(
+            self.weights[start:end]
+        )
+
+    def column(self, term_id: int) -> Tuple[NDArray[np.uint32], NDArray[np.float32]]:
+        if term_id + 1 >= len(self.col_ptr):
+            return self.col_docs[:0], self.col_weights[:0]
+        start, end = self.col_ptr[term_id], self.col_ptr[term_id + 1]
+        return self.col_docs[start:end], self.col_weights[start:end]
+
+    def doc_freq(self, vocab_size: int) -> NDArray[np.int64]:
+        return np.bincount(self.terms, minlength=vocab_size)
+
+    def sq_norms(self, idf: NDArray[np.float32]) -> NDArray[np.float32]:
+        rows = np.repeat(np.arange(self.num_docs), np.diff(self.indptr))
+        values = (self.weights * idf[self.terms]) ** 2
+        return np.bincount(rows, weights=values, minlength=self.num_docs).astype(
+            np.float32
+        )
+
+    @staticmethod
+    def write(
+        path: Path,
+        sql_ids: List[int],
+        rows: List[SparseRow],
+        vocab_size: int,
+    ) -> None:
+        lengths = np.array([len(terms) for terms, _ in rows], dtype=np.int64)
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        terms = np.concatenate([t for t, _ in rows or [empty]]).astype(np.uint32)
+        weights = np.concatenate([w for _, w in rows or [empty]]).astype(np.float32)
+        TfidfSegment.write_csr(
+            path, np.array(sql_ids, dtype=np.int64), indptr, terms, weights, vocab_size
+        )
+
+    @staticmethod
+    def write_csr(
+        path: Path,
+        sql_ids: NDArray[np.int64],
+        indptr: NDArray[np.int64],
+        terms: NDArray[np.uint32],
+        weights: NDArray[np.float32],
+        vocab_size: int,
+    ) -> None:
+        """Write rows already in CSR form and derive the column-major copy."""
+        docs = np.repeat(np.arange(len(sql_ids), dtype=np.uint32), np.diff(indptr))
+
+        order = np.argsort(terms, kind="stable")
+        col_ptr = np.zeros(vocab_size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=vocab_size), out=col_ptr[1:])
+
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "indptr.npy", indptr)
+        np.save(path / "terms.npy", terms)
+        np.save(path / "weights.npy", weights)
+        np.save(path / "col_ptr.npy", col_ptr)
+        np.save(path / "col_docs.npy", docs[order])
+        np.save(path / "col_weights.npy", weights[order])
+        np.save(path / "sql_ids.npy", sql_ids)
+
+
+class TfidfIndex:
+    """Local "more like this" index: cosine similarity of L2-normalised TF-IDF.
+
+    Query vectors are trimmed to their `max_query_terms` heaviest terms, as
+    Lucene's MoreLikeThis does, so a query reads a few posting lists instead of
+    the whole matrix. Candidate scores are still divided by the full document
+    norms, so the ranking stays cosine.
+
+    Every append adds a segment and `compact` merges them back into one. As in
+    `BM25Index`, the manifest is re-read whenever another instance replaced it.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_SIMILARITY_DIR,
+        max_query_terms: int = 32,
+        batch_size: int = 16,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_query_terms = max_query_terms
+        self.batch_size = batch_size
+        self.vocab: Dict[str, int] = {}
+        self.segments: List[TfidfSegment] = []
+        self._idf: Optional[NDArray[np.float32]] = None
+        self._inv_norms: List[NDArray[np.float32]] = []
+        self._locations: Dict[int, Tuple[int, int]] = {}
+        self._vocab_name: Optional[str] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._retired: List[Path] = []
+        self.reload()
+
+    def reload(self) -> None:
+        names: List[str] = []
+        while True:
+            self._stamp = manifest_stamp(self.directory)
+            manifest = read_manifest(self.directory)
+            if manifest is None:
+                break
+            try:
+                text = (self.directory / manifest["vocab"]).read_text("utf-8")
+            except FileNotFoundError:
+                # An append replaced manifest and vocabulary since we read it.
+                continue
+            names = manifest["segments"]
+            self.vocab = {term: i for i, term in enumerate(json.loads(text))}
+            self._vocab_name = manifest["vocab"]
+            break
+        open_segments = {segment.path.name: segment for segment in self.segments}
+        self.segments = [
+            open_segments.get(name) or TfidfSegment(self.directory / name)
+            for name in names
+        ]
+        self._idf = None
+        self._inv_norms = []
+        self._locations = {
+            int(sql_id): (seg_no, local_id)
+            for seg_no, segment in enumerate(self.segments)
+            for local_id, sql_id in enumerate(segment.sql_ids)
+        }
+
+    def refresh(self) -> None:
+        """Reload if the manifest changed since this instance last read it."""
+        if manifest_stamp(self.directory) != self._stamp:
+            self.reload()
+
+    @property
+    def num_docs(self) -> int:
+        return len(self._locations)
+
+    def idf(self) -> NDArray[np.float32]:
+        """Smoothed idf, ln((1 + n) / (1 + df)) + 1, cached until the next append."""
+        if self._idf is None:
+            doc_freq = np.zeros(len(self.vocab), dtype=np.int64)
+            for segment in self.segments:
+                doc_freq += segment.doc_freq(len(self.vocab))
+            n = self.num_docs
+            self._idf = (np.log((1 + n) / (1 + doc_freq)) + 1).astype(np.float32)
+            self._inv_norms = []
+            for segment in self.segments:
+                norms = np.sqrt(segment.sq_norms(self._idf))
+                norms[norms == 0] = 1
+                self._inv_norms.append((1 / norms).astype(np.float32))
+        return self._idf
+
+    def _vectorize(self, text: str, grow: bool = False) -> SparseRow:
+        counts = Counter(tokenize(text))
+        if grow:
+            for term in counts:
+                self.vocab.setdefault(term, len(self.vocab))
+        known = [(self.vocab[t], tf) for t, tf in counts.items() if t in self.vocab]
+        terms = np.array([term_id for term_id, _ in known], dtype=np.int64)
+        weights = np.array([1 + math.log(tf) for _, tf in known], dtype=np.float32)
+        return terms, weights
+
+    def add_articles(self, df: pd.DataFrame) -> int:
+        """Append loaded articles not indexed yet; returns the number added."""
+        self.refresh()
+        sql_ids: List[int] = []
+        seen: Set[int] = set(self._locations)
+        rows: List[SparseRow] = []
+        for row in df.to_dict("records"):
+            sql_id = int(row["sql_article_id"])
+            if sql_id == -1 or sql_id in seen:
+                continue
+            seen.add(sql_id)
+            sql_ids.append(sql_id)
+            rows.append(self._vectorize(article_text(row), grow=True))
+        if not sql_ids:
+            return 0
+
+        path = next_segment_path(self.directory)
+        TfidfSegment.write(path, sql_ids, rows, len(self.vocab))
+
+        # The vocabulary is numbered after the segment that first needed it.
+        vocab_name = path.name.replace("seg_", "vocab_") + ".json"
+        (self.directory / vocab_name).write_text(
+            json.dumps(list(self.vocab)), encoding="utf-8"
+        )
+        self._commit([s.path.name for s in self.segments] + [path.name], vocab_name)
+        # Readers that still find an old name in their manifest re-read it.
+        for old in self.directory.glob("vocab_*.json"):
+            if old.name != vocab_name:
+                old.unlink()
+        return len(sql_ids)
+
+    def _commit(self, names: List[str], vocab_name: str) -> None:
+        """Atomically point the manifest at `names` and reopen the segments."""
+        write_manifest(self.directory, {"segments": names, "vocab": vocab_name})
+        self.reload()
+
+    def compact(self) -> None:
+        """Merge all segments into one, so a query reads one posting list per term.
+
+        The merged segments are deleted once no index in this process still
+        holds them; until then a later `compact` retries.
+        """
+        self.refresh()
+        self._remove_retired()
+        if len(self.segments) < 2 or self._vocab_name is None:
+            return
+        path = next_segment_path(self.directory)
+        self._write_merged(path, self.segments, len(self.vocab))
+        self._retired.extend(segment.path for segment in self.segments)
+        self._commit([path.name], self._vocab_name)
+        self._remove_retired()
+
+    @staticmethod
+    def _write_merged(path: Path, old: List[TfidfSegment], vocab_size: int) -> None:
+        # Term ids are global, so merging is concatenating the rows.
+        bases = np.cumsum([0] + [len(segment.terms) for segment in old])
+        indptr = np.concatenate(
+            [np.zeros(1, dtype=np.int64)]
+            + [segment.indptr[1:] + base for segment, base in zip(old, bases)]
+        )
+        TfidfSegment.write_csr(
+            path,
+            np.concatenate([segment.sql_ids for segment in old]),
+            indptr,
+            np.concatenate([segment.terms for segment in old]),
+            np.concatenate([segment.weights for segment in old]),
+            vocab_size,
+        )
+
+    def _remove_retired(self) -> None:
+        held = {segment.path for segment in _OPEN_SEGMENTS}
+        for path in [p for p in self._retired if p not in held]:
+            if path.exists():
+                for file in path.iterdir():
+                    file.unlink()
+                path.rmdir()
+            self._retired.remove(path)
+
+    def _trim(self, row: SparseRow) -> SparseRow:
+        terms, weights = row
+        weights = weights * self.idf()[terms]
+        if len(terms) > self.max_query_terms:
+            keep = np.argpartition(weights, -self.max_query_terms)
+            keep = keep[-self.max_query_terms :]
+            terms, weights = terms[keep], weights[keep]
+        return terms, weights
+
+    def _top_k_batch(
+        self, queries: List[SparseRow], k: int, exclude: Sequence[int]
+    ) -> List[List[SimilarArticle]]:
+        idf = self.idf()
+        queries = [self._trim(query) for query in queries]
+        query_terms = np.unique(np.concatenate([t for t, _ in queries]))
+        # Dense (batch x terms) query block; one column per distinct query term.
+        block = np.zeros((len(queries), len(query_terms)), dtype=np.float32)
+        for i, (terms, weights) in enumerate(queries):
+            block[i, np.searchsorted(query_terms, terms)] = weights
+        q_norms = np.linalg.norm(block, axis=1)
+        q_norms[q_norms == 0] = 1
+
+        candidates: List[List[Tuple[float, int]]] = [[] for _ in queries]
+        for seg_no, segment in enumerate(self.segments):
+            row_parts, doc_parts, values = [], [], []
+            for column, term_id in enumerate(query_terms):
+                docs, weights = segment.column(int(term_id))
+                rows = np.flatnonzero(block[:, column])
+                if not len(docs) or not len(rows):
+                    continue
+                # One posting list read serves every query in the batch using it.
+                row_parts.append(np.repeat(rows, len(docs)))
+                doc_parts.append(np.tile(docs, len(rows)))
+                contribution = block[rows, column, None] * (weights * idf[term_id])
+                values.append(contribution.ravel())
+            if not doc_parts:
+                continue
+            # Scores are accumulated over the touched documents only, so the
+            # (batch x docs) array grows with the postings read, not the segment.
+            touched, local = np.unique(np.concatenate(doc_parts), return_inverse=True)
+            m = len(touched)
+            counts = np.bincount(
+                np.concatenate(row_parts) * m + local,
+                weights=np.concatenate(values),
+                minlength=len(queries) * m,
+            )
+            inv_norms = self._inv_norms[seg_no][touched]
+            scores = counts.reshape(len(queries), m) * inv_norms
+
+            for i, sql_id in enumerate(exclude):
+                location = self._locations.get(sql_id)
+                if location is not None and location[0] == seg_no:
+                    position = np.searchsorted(touched, location[1])
+                    if position < m and touched[position] == location[1]:
+                        scores[i, position] = 0
+            top = np.argsort(scores, axis=1)[:, -k:] if m <= k else None
+            if top is None:
+                top = np.argpartition(scores, -k, axis=1)[:, -k:]
+            top_scores = np.take_along_axis(scores, top, axis=1) / q_norms[:, None]
+            top_docs = touched[top]
+            for i in range(len(queries)):
+                candidates[i].extend(
+                    (float(score), int(segment.sql_ids[j]))
+                    for score, j in zip(top_scores[i], top_docs[i])
+                    if score > 0
+                )
+
+        return [
+            [SimilarArticle(sql_id, score) for score, sql_id in heapq.nlargest(k, c)]
+            for c in candidates
+        ]
+
+    def similar_to_many(
+        self, sql_ids: Sequence[int], k: int = 10
+    ) -> Dict[int, List[SimilarArticle]]:
+        """Top-k related articles for each indexed `sql_id`, in batches."""
+        self.refresh()
+        known = [sql_id for sql_id in sql_ids if sql_id in self._locations]
+        results: Dict[int, List[SimilarArticle]] = {}
+        for start in range(0, len(known), self.batch_size):
+            batch = known[start : start + self.batch_size]
+            rows = []
+            for sql_id in batch:
+                seg_no, local_id = self._locations[sql_id]
+                rows.append(self.segments[seg_no].row(local_id))
+            for sql_id, hits in zip(batch, self._top_k_batch(rows, k, batch)):
+                results[sql_id] = hits
+        return results
+
+    def similar_to(self, sql_id: int, k: int = 10) -> List[SimilarArticle]:
+        return self.similar_to_many([sql_id], k).get(sql_id, [])
+
+    def similar_to_text(self, text: str, k: int = 10) -> List[SimilarArticle]:
+        self.refresh()
+        row = self._vectorize(text)
+        if not self.segments or not len(row[0]):
+            return []
+        return self._top_k_batch([row], k, [-1])[0]
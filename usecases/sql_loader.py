@@ -0,0 +1,240 @@
+import json
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Table, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+from models.article_models import ArticleOutbox, Author, ScientificArticle
+from usecases.records import missing_to_none
+
+
+def upsert_statement(session: Session, table: Table, key: str) -> Insert:
+    """INSERT that leaves an existing row with the same `key` untouched."""
+    dialect = session.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({key: stmt.inserted[key]})
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=[key])
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=[key])
+    return insert(table)
+
+
+def collation_key(value: str) -> str:
+    """`value` compared the way MariaDB's default case- and accent-insensitive
+    collation does, so ids read back can be matched to the incoming spelling."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _author_ids(session: Session, names: List[str]) -> Dict[str, int]:
+    rows = session.execute(
+        select(Author.full_name, Author.id).where(Author.full_name.in_(names))
+    )
+    return {collation_key(name): author_id for name, author_id in rows}
+
+
+def _article_ids(session: Session, arxiv_ids: List[str]) -> Dict[str, Tuple[int, int]]:
+    rows = session.execute(
+        select(
+            ScientificArticle.arxiv_id,
+            ScientificArticle.id,
+            ScientificArticle.author_id,
+        ).where(ScientificArticle.arxiv_id.in_(arxiv_ids))
+    )
+    return {
+        collation_key(arxiv_id): (article_id, author_id)
+        for arxiv_id, article_id, author_id in rows
+    }
+
+
+def upsert_authors(session: Session, batch: pd.DataFrame) -> Dict[str, int]:
+    """Author ids keyed by `collation_key` of the full name."""
+    keys = batch["author_full_name"].map(collation_key)
+    authors = batch[~keys.duplicated()]
+    keys = keys[authors.index]
+    ids = _author_ids(session, authors["author_full_name"].tolist())
+
+    missing = authors[~keys.isin(ids.keys())]
+    if len(missing):
+        values = [
+            {"full_name": name, "title": missing_to_none(title)}
+            for name, title in zip(missing["author_full_name"], missing["author_title"])
+        ]
+        session.execute(
+            upsert_statement(session, Author.__table__, "full_name"), values
+        )
+        ids.update(_author_ids(session, missing["author_full_name"].tolist()))
+    return ids
+
+
+def upsert_articles(
+    session: Session, batch: pd.DataFrame, author_ids: Dict[str, int]
+) -> Dict[str, Tuple[int, int]]:
+    """Article and author ids keyed by `collation_key` of the arxiv_id.
+
+    Articles whose author has no id are left out, so the caller rejects them.
+    """
+    keys = batch["arxiv_id"].map(collation_key)
+    articles = batch[~keys.duplicated()]
+    keys = keys[articles.index]
+    ids = _article_ids(session, articles["arxiv_id"].tolist())
+
+    missing = articles[
+        ~keys.isin(ids.keys())
+        & articles["author_full_name"].map(collation_key).isin(author_ids.keys())
+    ]
+    if len(missing):
+        values: List[Dict[str, Any]] = [
+            {
+                "title": missing_to_none(row.title),
+                "summary": missing_to_none(row.summary),
+                "file_path": missing_to_none(row.file_path),
+                "arxiv_id": row.arxiv_id,
+                "author_id": author_ids[collation_key(row.author_full_name)],
+            }
+            for row in missing.itertuples(index=False)
+        ]
+        table = ScientificArticle.__table__
+        session.execute(upsert_statement(session, table, "arxiv_id"), values)
+        ids.update(_article_ids(session, missing["arxiv_id"].tolist()))
+    return ids
+
+
+@dataclass
+class SQLLoadReport:
+    committed_batches: int = 0
+    retried_batches: int = 0
+    loaded: int = 0
+    rejected: List[Dict[str, Any]] = field(default_factory=list)
+
+    def merge(self, other: "SQLLoadReport") -> None:
+        self.committed_batches += other.committed_batches
+        self.retried_batches += other.retried_batches
+        self.loaded += other.loaded
+        self.rejected.extend(other.rejected)
+
+
+OUTBOX_FIELDS = [
+    "title",
+    "summary",
+    "arxiv_id",
+    "author_full_name",
+    "author_title",
+    "text",
+    "html_content",
+]
+
+
+def enqueue_outbox(
+    session: Session, batch: pd.DataFrame, article_ids: Dict[str, Tuple[int, int]]
+) -> None:
+    """Queue the Mongo copy of each article in the transaction that loaded it."""
+    fields = [name for name in OUTBOX_FIELDS if name in batch.columns]
+    if "text" in fields and "html_content" in fields:
+        fields.remove("html_content")
+    values = []
+    keys = batch["arxiv_id"].map(collation_key)
+    for record in batch[~keys.duplicated()][fields].to_dict("records"):
+        ids = article_ids.get(collation_key(record["arxiv_id"]))
+        if ids is None:
+            continue
+        article_id, _ = ids
+        payload = {key: missing_to_none(value) for key, value in record.items()}
+        payload["sql_article_id"] = article_id
+        values.append({"article_id": article_id, "payload": json.dumps(payload)})
+    if values:
+        session.execute(insert(ArticleOutbox.__table__), values)
+
+
+def _load_batch(
+    session: Session, batch: pd.DataFrame, outbox: bool = False
+) -> Dict[str, Tuple[int, int]]:
+    with session.begin_nested():
+        author_ids = upsert_authors(session, batch)
+        article_ids = upsert_articles(session, batch, author_ids)
+        if outbox:
+            enqueue_outbox(session, batch, article_ids)
+        return article_ids
+
+
+def bulk_load_articles(
+    df: pd.DataFrame,
+    session: Session,
+    batch_size: int = 500,
+    report: Optional[SQLLoadReport] = None,
+    outbox: bool = False,
+) -> pd.DataFrame:
+    """Load articles and their authors with set-based queries instead of row by row.
+
+    Each batch costs one IN query per table for the rows that already exist, one
+    multi-row upsert per table for the rest and one IN query to read back their ids.
+
+    Every batch runs inside a savepoint and is committed on its own. When a batch
+    fails it is retried row by row, so only the offending rows are rejected; they
+    keep -1 ids and are listed in `report`, as are rows without an arxiv_id or
+    author and rows whose ids could not be read back. Keys are matched with
+    `collation_key`, as MariaDB compares them. With `outbox`, each loaded article
+    is also queued in `article_outbox` within the same savepoint.
+    """
+    report = report if report is not None else SQLLoadReport()
+    df = df.copy()
+    article_out = np.full(len(df), -1, dtype=np.int64)
+    author_out = np.full(len(df), -1, dtype=np.int64)
+    has_key = (df["arxiv_id"].notna() & df["author_full_name"].notna()).to_numpy()
+
+    for position in np.flatnonzero(~has_key):
+        report.rejected.append(
+            {
+                "arxiv_id": missing_to_none(df["arxiv_id"].iloc[position]),
+                "error": "missing arxiv_id or author_full_name",
+            }
+        )
+
+    for start in range(0, len(df), batch_size):
+        positions = start + np.flatnonzero(has_key[start : start + batch_size])
+        if not len(positions):
+            continue
+        keyed = df.iloc[positions]
+        first_rejected = len(report.rejected)
+        try:
+            article_ids = _load_batch(session, keyed, outbox)
+        except SQLAlchemyError:
+            report.retried_batches += 1
+            article_ids = {}
+            for position in positions:
+                row = df.iloc[[position]]
+                try:
+                    article_ids.update(_load_batch(session, row, outbox))
+                except SQLAlchemyError as e:
+                    report.rejected.append(
+                        {
+                            "arxiv_id": row["arxiv_id"].iloc[0],
+                            "error": str(getattr(e, "orig", None) or e),
+                        }
+                    )
+        session.commit()
+        report.committed_batches += 1
+
+        rejected = {r["arxiv_id"] for r in report.rejected[first_rejected:]}
+        for position, arxiv_id in zip(positions, keyed["arxiv_id"]):
+            key = collation_key(arxiv_id)
+            if key in article_ids:
+                article_out[position], author_out[position] = article_ids[key]
+                report.loaded += 1
+            elif arxiv_id not in rejected:
+                report.rejected.append(
+                    {"arxiv_id": arxiv_id, "error": "article id was not read back"}
+                )
+
+    df["sql_article_id"] = article_out
+    df["sql_author_id"] = author_out
+    return df